@@ -26,10 +26,77 @@ OCR_CONFIDENCE_THRESHOLD = 0.6  # Minimum OCR confidence level
 # Model Settings
 DEFAULT_MODEL = "claude-3-5-sonnet-20241022"
 FALLBACK_MODEL = "claude-3-haiku-20240307"
+DEFAULT_PROFILE = "sonnet"      # Conversion profile used when none is given (see model_profiles)
+CASCADE_MIN_SOURCE_WORDS = 25   # Chunks with fewer text-layer words (scans) are not scored in cascade mode
 
 # Performance Settings
 MAX_TOKENS = 100000
 CHUNK_SIZE = 50000
+MAX_CONCURRENT_CHUNKS = 4        # Chunk requests sent to the API in parallel
+MARKDOWN_PART_SEPARATOR = "\n\n---\n\n"  # Placed between converted chunks
+STREAM_RESPONSES = True          # Stream Markdown into the output file as the model generates it
+MAX_CONTINUATIONS = 3            # Follow-up requests when a response stops at max_tokens
+TELEMETRY_ENABLED = True         # Write per-request timings/tokens next to the output (*.telemetry.jsonl)
+
+# Adaptive Chunking (pages_per_chunk="auto")
+CHUNK_MAX_PAGES = 20             # Hard cap on pages per request
+CHUNK_MAX_INPUT_BYTES = 8 * 1024 * 1024  # Estimated page bytes per request (before base64)
+CHUNK_MAX_OUTPUT_TOKENS = 6000   # Estimated Markdown tokens per request, below max_tokens=8192
+CHARS_PER_TOKEN = 4              # Rough text-to-token ratio for output estimates
+SCANNED_PAGE_OUTPUT_TOKENS = 800 # Assumed output for an image-only page with no text layer
+CHUNK_PRUNE_RESOURCES = True     # Copy only the fonts/images each chunk's pages actually use
+CHUNK_COMPRESS_STREAMS = True    # Flate-compress page content streams in chunks
+SPLIT_BACKEND = "auto"           # "pymupdf", "pypdf2", or "auto" (PyMuPDF when installed)
+
+# Cached Document Mode (whole PDF sent once as a cached prompt prefix, chunks request page ranges)
+CACHED_DOCUMENT_MAX_PAGES = 100  # API limit on pages in one PDF document block
+CACHED_DOCUMENT_MAX_BYTES = 24 * 1024 * 1024  # Raw PDF bytes; base64 must stay under the 32 MB request limit
+
+# HTTP Connection Pool (shared Anthropic client)
+HTTP_MAX_CONNECTIONS = 20
+HTTP_KEEPALIVE_CONNECTIONS = 10
+HTTP_KEEPALIVE_EXPIRY = 60.0     # Seconds an idle connection is kept open
+API_TIMEOUT = 600.0              # Seconds per API request
+
+# Rate Limits and Retries (set to your organisation's API limits)
+REQUESTS_PER_MINUTE = 50
+TOKENS_PER_MINUTE = 40000        # Input tokens per minute
+PDF_PAGE_INPUT_TOKENS = 2000     # Rough input tokens per PDF page (text + page image)
+API_MAX_RETRIES = 5              # Retries per request for 429/529/5xx/connection errors
+API_RETRY_BASE_DELAY = 1.0       # Seconds; doubles each retry, with full jitter
+API_RETRY_MAX_DELAY = 60.0
+CHUNK_MAX_REQUEUES = 2           # Times a chunk goes back in the queue after its retries run out
+
+# Response Cache (chunk conversions reused across runs)
+RESPONSE_CACHE_ENABLED = True
+RESPONSE_CACHE_DIR = ".cache/responses"
+RESPONSE_CACHE_MAX_BYTES = 512 * 1024 * 1024
+RESPONSE_CACHE_COMPRESS = True
+
+# Page Fingerprint Index (pages repeated across documents are converted/OCR'd once)
+PAGE_INDEX_ENABLED = False       # Opt-in: also changes chunking - pages seen before are sent as single-page requests
+PAGE_INDEX_DIR = ".cache/pages"
+
+# Batch Conversion (directory / glob input)
+BATCH_MAX_PROCESSES = 2          # Documents converted in parallel; rate limits are split between them
+BATCH_MANIFEST_NAME = "conversion_manifest.sqlite3"  # Written in the output directory
+
+# Conversion Service (resident HTTP job queue)
+SERVICE_HOST = "127.0.0.1"       # Local only - the service reads any PDF path it is given
+SERVICE_PORT = 8750
+SERVICE_WORKERS = 2              # Documents converted at once; chunks within each still run concurrently
+SERVICE_DIR = ".cache/service"   # Uploaded PDFs, outputs and the job database
+SERVICE_MAX_UPLOAD_BYTES = 256 * 1024 * 1024
+
+# Watch Folder (incremental ingestion)
+WATCH_OUTBOX_NAME = "outbox"     # Created next to the inbox unless --outbox is given
+WATCH_STATE_DIR = ".watch"       # Inside the outbox: manifest and outputs still being written
+WATCH_POLL_SECONDS = 10          # Rescan interval when watchdog (inotify) is not installed
+WATCH_SETTLE_SECONDS = 5         # A PDF must stop changing for this long before it is converted
+WATCH_WORKERS = 2                # Documents converted at once
+
+# Convert-and-Validate Pipeline (OCR runs alongside the API conversion)
+PIPELINE_OCR_PAGES = 5           # Pages OCR'd as the validation reference, from the start of the document
 
 # Debug Settings
 DEBUG_MODE = False
@@ -0,0 +1,4 @@
+@echo off
+rem Usage: benchmark_throughput.bat document.pdf --concurrency=1,2,4,8 --pages=2,5,10 --latency=1.5 --error-rate=0.02
+rem Runs against a local mock API server - no API key or network needed (except with --record)
+cd "%~dp0.." && C:\Users\drewa\AppData\Local\Programs\Python\Python312\python.exe -m src.converters.throughput_benchmark %*
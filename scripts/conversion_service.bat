@@ -0,0 +1,4 @@
+@echo off
+rem Usage: conversion_service.bat --port=8750 --workers=2
+rem Submit PDFs with POST /jobs, poll GET /jobs/<id>, fetch GET /jobs/<id>/result
+cd "%~dp0.." && C:\Users\drewa\AppData\Local\Programs\Python\Python312\python.exe -m src.converters.conversion_service %*
@@ -0,0 +1,10 @@
+@echo off
+rem Usage: convert_and_validate.bat document.pdf auto 4 --profile=sonnet --ocr-pages=5
+rem Replaces convert_pdf_sonnet.bat followed by run_full_validation.bat: OCR runs while the conversion does
+if "%ANTHROPIC_API_KEY%"=="" (
+    echo Error: ANTHROPIC_API_KEY environment variable not set
+    echo Please set your API key: set ANTHROPIC_API_KEY=your_key_here
+    pause
+    exit /b 1
+)
+cd "%~dp0.." && C:\Users\drewa\AppData\Local\Programs\Python\Python312\python.exe -m src.validators.convert_and_validate %*
@@ -0,0 +1,2 @@
+@echo off
+cd "%~dp0.." && C:\Users\drewa\AppData\Local\Programs\Python\Python312\python.exe -m src.converters.pdf_to_markdown_local %*
\ No newline at end of file
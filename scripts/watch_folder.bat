@@ -0,0 +1,4 @@
+@echo off
+rem Usage: watch_folder.bat C:\docs\inbox --outbox=C:\docs\outbox --profile=sonnet --workers=2
+rem Converts PDFs as they arrive; a restart picks up anything new, changed or unfinished
+cd "%~dp0.." && C:\Users\drewa\AppData\Local\Programs\Python\Python312\python.exe -m src.converters.watch_folder %*
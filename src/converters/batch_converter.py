@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Batch Converter
+Purpose: Convert a whole directory (or glob) of PDFs with a bounded pool of worker processes
+Strategy: SQLite manifest keyed by source hash + profile, so documents already converted are skipped
+          and interrupted ones resume from their journals on the next run
+"""
+
+import glob
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from config.settings import (
+    BATCH_MANIFEST_NAME,
+    BATCH_MAX_PROCESSES,
+    DEFAULT_PROFILE,
+    MAX_CONCURRENT_CHUNKS,
+    PAGE_INDEX_ENABLED,
+    REQUESTS_PER_MINUTE,
+    RESPONSE_CACHE_ENABLED,
+    TELEMETRY_ENABLED,
+    TOKENS_PER_MINUTE,
+)
+from .conversion_engine import iter_markdown_parts, output_tag
+from .conversion_journal import ConversionJournal, file_sha256
+from .model_profiles import get_profile
+from .pdf_chunking import parse_pages_per_chunk
+from .streaming_pipeline import write_markdown_parts
+from .telemetry import TelemetryRecorder
+
+class BatchManifest:
+    """One row per (source hash, output tag) with the outcome of its latest conversion"""
+
+    def __init__(self, manifest_path: str):
+        self.manifest_path = Path(manifest_path)
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS documents ("
+                " source_sha256 TEXT NOT NULL,"
+                " output_tag TEXT NOT NULL,"
+                " source_path TEXT NOT NULL,"
+                " output_path TEXT,"
+                " status TEXT NOT NULL,"
+                " started_at TEXT NOT NULL,"
+                " duration_seconds REAL,"
+                " characters INTEGER,"
+                " error TEXT,"
+                " PRIMARY KEY (source_sha256, output_tag))"
+            )
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.manifest_path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA busy_timeout=30000")
+        return conn
+
+    def converted_output(self, source_sha256: str, tag: str) -> Optional[str]:
+        """Output path of a finished conversion of this exact source, if its Markdown still exists"""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT output_path FROM documents WHERE source_sha256 = ? AND output_tag = ? AND status = 'converted'",
+                (source_sha256, tag)
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None or not row[0] or not Path(row[0]).exists():
+            return None
+        return row[0]
+
+    def record(self, result: Dict):
+        """Store the outcome of one document conversion, replacing any earlier attempt"""
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO documents (source_sha256, output_tag, source_path, output_path, status,"
+                " started_at, duration_seconds, characters, error) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (result['source_sha256'], result['output_tag'], result['source_path'], result['output_path'],
+                 result['status'], result['started_at'], result['duration_seconds'], result['characters'],
+                 result['error'])
+            )
+        finally:
+            conn.close()
+
+def collect_pdfs(target: str) -> List[Path]:
+    """PDFs under a directory (recursively), matching a glob pattern, or a single file"""
+    path = Path(target)
+    if path.is_dir():
+        pdfs = [p for p in path.rglob('*') if p.is_file() and p.suffix.lower() == '.pdf']
+    elif path.is_file():
+        pdfs = [path]
+    else:
+        pdfs = [Path(p) for p in glob.glob(target, recursive=True) if p.lower().endswith('.pdf')]
+    return sorted(pdfs)
+
+# Per-process state, created once by _init_worker
+_worker_session = None
+_worker_cache = None
+_worker_page_index = None
+
+def _init_worker(api_key: str, processes: int):
+    """Give each worker process its own pooled session with a share of the account rate limits"""
+    global _worker_session, _worker_cache, _worker_page_index
+    from .converter_session import ConverterSession
+    from .page_fingerprints import PageFingerprintIndex
+    from .request_scheduler import RequestScheduler
+    from .response_cache import ResponseCache
+
+    scheduler = RequestScheduler(REQUESTS_PER_MINUTE / processes, TOKENS_PER_MINUTE / processes)
+    _worker_session = ConverterSession(api_key, scheduler=scheduler)
+    _worker_cache = ResponseCache() if RESPONSE_CACHE_ENABLED else None
+    _worker_page_index = PageFingerprintIndex() if PAGE_INDEX_ENABLED else None
+
+def _convert_document(job: Dict) -> Dict:
+    """Convert one PDF inside a worker process; never raises, the outcome goes in the result"""
+    started = time.time()
+    result = dict(job, status='failed', characters=None, error=None,
+                  started_at=datetime.now().isoformat(timespec='seconds'))
+    try:
+        # A journal left by an interrupted or partly failed run means only the missing chunks are sent
+        journal = ConversionJournal.for_pdf(job['source_path'], job['output_tag'])
+        resume = journal.journal_path.exists()
+
+        Path(job['output_path']).parent.mkdir(parents=True, exist_ok=True)
+        telemetry = (TelemetryRecorder(Path(job['output_path']).with_suffix('.telemetry.jsonl'))
+                     if TELEMETRY_ENABLED else None)
+        markdown_parts = iter_markdown_parts(job['source_path'], job['api_key'], job['pages_per_chunk'],
+                                             job['chunk_workers'], session=_worker_session, cache=_worker_cache,
+                                             resume=resume, hybrid=job['hybrid'], profile=job['profile'],
+                                             cascade=job['cascade'], page_index=_worker_page_index,
+                                             telemetry=telemetry)
+        result['characters'] = write_markdown_parts(markdown_parts, job['output_path'])
+        # The engine keeps the journal only when some chunks failed
+        result['status'] = 'partial' if journal.journal_path.exists() else 'converted'
+    except Exception as e:
+        result['error'] = str(e)
+    result['duration_seconds'] = round(time.time() - started, 2)
+    del result['api_key']
+    return result
+
+def run_batch(target: str, api_key: Optional[str] = None, profile: str = DEFAULT_PROFILE,
+              processes: int = BATCH_MAX_PROCESSES, chunk_workers: int = MAX_CONCURRENT_CHUNKS,
+              pages_per_chunk: Optional[Union[int, str]] = None, output_dir: Optional[str] = None,
+              manifest_path: Optional[str] = None, force: bool = False,
+              hybrid: bool = False, cascade: bool = False) -> Dict[str, int]:
+    """
+    Convert every PDF matched by target, skipping sources already converted with this profile.
+
+    Args:
+        target: Directory (searched recursively), glob pattern or single PDF
+        api_key: Anthropic API key (optional, can use environment variable)
+        profile: Conversion profile name (see model_profiles)
+        processes: Documents converted in parallel, each in its own process
+        chunk_workers: Concurrent chunk requests inside each document
+        pages_per_chunk: Pages per chunk or "auto" (defaults to the profile's chunk size)
+        output_dir: Where Markdown is written, mirroring the input tree (default: next to each PDF)
+        manifest_path: SQLite manifest (default: BATCH_MANIFEST_NAME in output_dir or the input directory)
+        force: Convert even when the manifest says the source is already done
+        hybrid: Render text-layer pages locally (see conversion_engine)
+        cascade: Escalate low-fidelity chunks to the profile's escalation profile
+
+    Returns:
+        Count of documents per outcome for this run: converted, partial, failed, skipped
+    """
+
+    # Get API key from parameter or environment variable
+    if api_key is None:
+        api_key = os.environ.get('ANTHROPIC_API_KEY')
+        if not api_key:
+            raise ValueError(
+                "No API key provided. Either pass it as a parameter or set the ANTHROPIC_API_KEY environment variable."
+            )
+
+    tag = output_tag(get_profile(profile), cascade)
+    pdfs = collect_pdfs(target)
+    if not pdfs:
+        raise FileNotFoundError(f"No PDF files found for: {target}")
+
+    base_dir = Path(target) if Path(target).is_dir() else Path(os.path.commonpath([str(p.parent) for p in pdfs]))
+    if manifest_path is None:
+        manifest_path = Path(output_dir or base_dir) / BATCH_MANIFEST_NAME
+    manifest = BatchManifest(manifest_path)
+    print(f"Found {len(pdfs)} PDF files - manifest: {manifest_path}")
+
+    counts = {'converted': 0, 'partial': 0, 'failed': 0, 'skipped': 0}
+    jobs = []
+    seen_hashes = set()
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    for pdf_path in pdfs:
+        source_sha256 = file_sha256(pdf_path)
+        if source_sha256 in seen_hashes or (not force and manifest.converted_output(source_sha256, tag)):
+            counts['skipped'] += 1
+            continue
+        seen_hashes.add(source_sha256)
+
+        out_parent = Path(output_dir) / pdf_path.parent.relative_to(base_dir) if output_dir else pdf_path.parent
+        jobs.append({
+            'source_path': str(pdf_path),
+            'source_sha256': source_sha256,
+            'output_tag': tag,
+            'output_path': str(out_parent / f"{pdf_path.stem}_{tag}_{timestamp}.md"),
+            'api_key': api_key,
+            'profile': profile,
+            'pages_per_chunk': pages_per_chunk,
+            'chunk_workers': chunk_workers,
+            'hybrid': hybrid,
+            'cascade': cascade,
+        })
+
+    print(f"Skipping {counts['skipped']} already converted or duplicate files, converting {len(jobs)} with {processes} processes...")
+    if not jobs:
+        return counts
+
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                             initargs=(api_key, processes)) as executor:
+        futures = [executor.submit(_convert_document, job) for job in jobs]
+        for done, future in enumerate(as_completed(futures), 1):
+            result = future.result()
+            manifest.record(result)
+            counts[result['status']] += 1
+            name = Path(result['source_path']).name
+            if result['status'] == 'converted':
+                print(f"[OK] ({done}/{len(jobs)}) {name} -> {result['output_path']} in {result['duration_seconds']}s")
+            elif result['status'] == 'partial':
+                print(f"[WARNING] ({done}/{len(jobs)}) {name} converted with failed chunks - rerun to retry them")
+            else:
+                print(f"[ERROR] ({done}/{len(jobs)}) {name}: {result['error']}")
+
+    return counts
+
+def main():
+    """
+    Main function to handle command-line usage.
+
+    Usage: <directory|glob> [processes] [--profile=NAME] [--output-dir=PATH] [--pages-per-chunk=N|auto]
+           [--force] [--hybrid] [--cascade]
+    """
+
+    # --flags can appear anywhere; the remaining arguments are positional
+    flags = [arg for arg in sys.argv[1:] if arg.startswith('--')]
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    options = dict(flag[2:].split('=', 1) for flag in flags if '=' in flag)
+    switches = {flag for flag in flags if '=' not in flag}
+    if '--help' in switches:
+        print("Usage: <directory|glob> [processes] [--profile=NAME] [--output-dir=PATH] [--pages-per-chunk=N|auto]"
+              " [--force] [--hybrid] [--cascade]")
+        return
+
+    print("PDF to Markdown Batch Converter using Anthropic API")
+    print("-" * 50)
+
+    if len(args) > 0:
+        target = args[0].strip()
+    else:
+        target = input("Enter a directory or glob of PDF files: ").strip()
+
+    processes = BATCH_MAX_PROCESSES
+    if len(args) > 1:
+        try:
+            processes = max(1, int(args[1]))
+        except ValueError:
+            print(f"Invalid process count, using default of {BATCH_MAX_PROCESSES}")
+
+    pages_per_chunk = None
+    if 'pages-per-chunk' in options:
+        try:
+            pages_per_chunk = parse_pages_per_chunk(options['pages-per-chunk'])
+        except ValueError:
+            print("Invalid pages per chunk, using the profile default")
+
+    # Check for API key in environment or prompt for it
+    api_key = os.environ.get('ANTHROPIC_API_KEY')
+    if not api_key:
+        print("\nNo ANTHROPIC_API_KEY found in environment variables.")
+        api_key = input("Enter your Anthropic API key: ").strip()
+
+    try:
+        started = time.time()
+        counts = run_batch(target, api_key, profile=options.get('profile', DEFAULT_PROFILE),
+                           processes=processes, pages_per_chunk=pages_per_chunk,
+                           output_dir=options.get('output-dir'), force='--force' in switches,
+                           hybrid='--hybrid' in switches, cascade='--cascade' in switches)
+
+        print(f"\n[OK] Batch finished in {time.time() - started:.1f}s")
+        print(f"[OK] Converted: {counts['converted']}, partial: {counts['partial']}, "
+              f"failed: {counts['failed']}, skipped: {counts['skipped']}")
+        if counts['failed'] or counts['partial']:
+            sys.exit(1)
+
+    except FileNotFoundError as e:
+        print(f"\n[ERROR] {e}")
+        sys.exit(1)
+    except ValueError as e:
+        print(f"\n[ERROR] {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
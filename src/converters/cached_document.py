@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Cached Document
+Purpose: Send a whole PDF once as a cached prompt prefix and convert it by page range
+Strategy: The document block (base64-encoded once) carries cache_control, so the first request writes
+          the prompt cache and every later page-range request reads it instead of re-processing the PDF
+"""
+
+import base64
+import threading
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+from config.settings import (
+    CACHED_DOCUMENT_MAX_BYTES,
+    CACHED_DOCUMENT_MAX_PAGES,
+    CHARS_PER_TOKEN,
+    DEFAULT_PROFILE,
+    PDF_PAGE_INPUT_TOKENS,
+)
+from ..utils.pdf_document import PdfArg, PDFDocument, document_path, use_document
+from .converter_session import ConverterSession, resolve_session
+from .message_streaming import TextCallback, request_markdown
+from .model_profiles import ConversionProfile, get_profile
+from .response_cache import ResponseCache
+
+# Sent with the document inside the cached prefix, so it must not mention any page range
+RANGE_PREAMBLE = "This is the complete document. Each request below names a page range: convert only the pages in that range and ignore the rest of the document."
+
+class CachedDocument:
+    """A whole PDF prepared once for page-range requests against a cached prefix"""
+
+    def __init__(self, pdf: PdfArg):
+        # A shared PDFDocument brings its mapped bytes, hash and page-text cache along
+        self.document = pdf if isinstance(pdf, PDFDocument) else PDFDocument(pdf)
+        self.pdf_path = self.document.path
+        self.pdf_data = self.document.data
+        self.pdf_base64 = base64.b64encode(self.pdf_data).decode('utf-8')
+        self.sha256 = self.document.sha256
+        self.total_pages = self.document.page_count
+
+        # The first request per model writes the prompt cache; requests that start before it
+        # finishes would each write it too, so they wait for it
+        self._prefix_lock = threading.Lock()
+        self.cached_models = set()
+
+    @staticmethod
+    def fits(pdf: PdfArg) -> Tuple[bool, str]:
+        """Whether the document can go in a single request; returns (fits, reason if not)"""
+        size = document_path(pdf).stat().st_size
+        if size > CACHED_DOCUMENT_MAX_BYTES:
+            return False, f"{size:,} bytes is over the {CACHED_DOCUMENT_MAX_BYTES:,}-byte limit"
+        with use_document(pdf) as document:
+            total_pages = document.page_count
+        if total_pages > CACHED_DOCUMENT_MAX_PAGES:
+            return False, f"{total_pages} pages is over the {CACHED_DOCUMENT_MAX_PAGES}-page limit"
+        return True, ""
+
+    def page_text(self, start_page: int, end_page: int) -> str:
+        """Text layer of pages start_page-end_page (1-based, inclusive)"""
+        return self.document.text(start_page - 1, end_page)
+
+    def content_blocks(self, prompt: str) -> list:
+        """Message content: the cached prefix (document + preamble) followed by the page-range prompt"""
+        return [
+            {
+                "type": "document",
+                "source": {
+                    "type": "base64",
+                    "media_type": "application/pdf",
+                    "data": self.pdf_base64
+                }
+            },
+            {
+                "type": "text",
+                "text": RANGE_PREAMBLE,
+                "cache_control": {"type": "ephemeral"}
+            },
+            {
+                "type": "text",
+                "text": prompt
+            }
+        ]
+
+def convert_page_range_to_markdown(document: CachedDocument, api_key: str, chunk_info: dict,
+                                   session: Optional[ConverterSession] = None,
+                                   cache: Optional[ResponseCache] = None,
+                                   profile: Union[str, ConversionProfile] = DEFAULT_PROFILE,
+                                   on_text: Optional[TextCallback] = None,
+                                   on_restart: Optional[TextCallback] = None,
+                                   metrics: Optional[dict] = None) -> str:
+    """Convert one page range of a cached document with the profile's model and prompt."""
+    metrics = metrics if metrics is not None else {}
+
+    profile = get_profile(profile)
+    model = profile.model
+    prompt = profile.build_prompt(chunk_info)
+
+    # Keyed on the whole document plus the range prompt, so it never collides with split-chunk entries
+    if cache is not None:
+        cached_markdown = cache.get(document.pdf_data, model, prompt)
+        if cached_markdown is not None:
+            metrics['response_cache_hit'] = True
+            return cached_markdown
+
+    session = resolve_session(api_key, session)
+    request = {
+        "model": model,
+        "max_tokens": profile.max_tokens,
+        "messages": [{"role": "user", "content": document.content_blocks(prompt)}]
+    }
+    prompt_tokens = len(prompt) // CHARS_PER_TOKEN
+    metrics['bytes_uploaded'] = len(document.pdf_data)
+    metrics['base64_bytes'] = len(document.pdf_base64)
+
+    markdown_text = None
+    if model not in document.cached_models:
+        with document._prefix_lock:
+            if model not in document.cached_models:
+                markdown_text = request_markdown(session, request,
+                                                 document.total_pages * PDF_PAGE_INPUT_TOKENS + prompt_tokens,
+                                                 on_text, on_restart, metrics=metrics)
+                document.cached_models.add(model)
+    if markdown_text is None:
+        # The document itself is read from the prompt cache
+        markdown_text = request_markdown(session, request, prompt_tokens, on_text, on_restart, metrics=metrics)
+
+    if cache is not None:
+        cache.put(document.pdf_data, model, prompt, markdown_text)
+
+    return markdown_text
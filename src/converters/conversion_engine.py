@@ -0,0 +1,536 @@
+#!/usr/bin/env python3
+"""
+Conversion Engine
+Purpose: Single PDF-to-Markdown pipeline shared by every model profile
+Strategy: Profile (model, prompt, max_tokens, chunk policy) is a parameter; chunking, concurrency,
+          caching, journaling and retries live here once
+"""
+
+import os
+import sys
+import time
+import base64
+import threading
+from pathlib import Path
+from typing import Iterator, Optional, Union
+from datetime import datetime
+
+from config.settings import (
+    CASCADE_MIN_SOURCE_WORDS,
+    CHARS_PER_TOKEN,
+    CHUNK_MAX_REQUEUES,
+    DEFAULT_PROFILE,
+    MARKDOWN_PART_SEPARATOR,
+    MAX_CONCURRENT_CHUNKS,
+    PAGE_INDEX_ENABLED,
+    PDF_PAGE_INPUT_TOKENS,
+    RESPONSE_CACHE_ENABLED,
+    TELEMETRY_ENABLED,
+    WORD_FIDELITY_THRESHOLD,
+)
+from .cached_document import CachedDocument, convert_page_range_to_markdown
+from .conversion_journal import ConversionJournal
+from .converter_session import ConverterSession, resolve_session
+from .message_streaming import TextCallback, request_markdown
+from .model_profiles import ConversionProfile, get_profile
+from .page_fingerprints import PageFingerprintIndex, pdf_page_signatures
+from .pdf_chunking import ADAPTIVE_CHUNKING, iter_pdf_chunks, parse_pages_per_chunk, sub_chunk
+from .request_scheduler import OutputLimitError, is_bisectable, is_retryable
+from .response_cache import ResponseCache
+from .streaming_pipeline import LiveMarkdownParts, LiveParts, RequeueRequest, map_in_order, write_markdown_parts
+from .telemetry import TelemetryRecorder
+from ..utils.pdf_document import PdfArg, PDFDocument
+from ..validators.word_fidelity_validator import score_text_fidelity
+
+ProfileArg = Union[str, ConversionProfile]
+
+def convert_pdf_chunk_to_markdown(pdf_data: bytes, api_key: str, chunk_info: dict,
+                                  session: Optional[ConverterSession] = None,
+                                  cache: Optional[ResponseCache] = None,
+                                  profile: ProfileArg = DEFAULT_PROFILE,
+                                  on_text: Optional[TextCallback] = None,
+                                  on_restart: Optional[TextCallback] = None,
+                                  metrics: Optional[dict] = None) -> str:
+    """
+    Convert a PDF chunk to Markdown with the profile's model and prompt.
+
+    on_text/on_restart follow the response as it streams in, and metrics collects the
+    request's telemetry (see message_streaming.request_markdown).
+    """
+    metrics = metrics if metrics is not None else {}
+
+    profile = get_profile(profile)
+    model = profile.model
+    prompt = profile.build_prompt(chunk_info)
+
+    # Same chunk bytes, model and prompt means the same answer - skip the API call
+    if cache is not None:
+        cached_markdown = cache.get(pdf_data, model, prompt)
+        if cached_markdown is not None:
+            metrics['response_cache_hit'] = True
+            return cached_markdown
+
+    # Encode PDF to base64
+    pdf_base64 = base64.b64encode(pdf_data).decode('utf-8')
+    metrics['bytes_uploaded'] = len(pdf_data)
+    metrics['base64_bytes'] = len(pdf_base64)
+
+    # Create the message for Claude
+    request = {
+        "model": model,
+        "max_tokens": profile.max_tokens,
+        "messages": [
+            {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "document",
+                        "source": {
+                            "type": "base64",
+                            "media_type": "application/pdf",
+                            "data": pdf_base64
+                        }
+                    },
+                    {
+                        "type": "text",
+                        "text": prompt
+                    }
+                ]
+            }
+        ]
+    }
+
+    # Pace the request against the shared rate limits; transient failures are retried inside,
+    # and a response cut off at max_tokens is continued rather than silently truncated
+    page_count = chunk_info['end_page'] - chunk_info['start_page'] + 1
+    estimated_tokens = page_count * PDF_PAGE_INPUT_TOKENS + len(prompt) // CHARS_PER_TOKEN
+    # Reuse the pooled client instead of opening a new connection per chunk
+    session = resolve_session(api_key, session)
+    markdown_text = request_markdown(session, request, estimated_tokens, on_text, on_restart, metrics=metrics)
+
+    if cache is not None:
+        cache.put(pdf_data, model, prompt, markdown_text)
+
+    return markdown_text
+
+def output_tag(profile: ConversionProfile, cascade: bool = False) -> str:
+    """Tag used in output and journal file names, so cascade runs never mix with single-model runs"""
+    return f"{profile.file_tag}_cascade" if cascade else profile.file_tag
+
+def iter_markdown_parts(pdf_path: PdfArg, api_key: Optional[str] = None,
+                        pages_per_chunk: Optional[Union[int, str]] = None,
+                        max_workers: int = MAX_CONCURRENT_CHUNKS,
+                        session: Optional[ConverterSession] = None,
+                        cache: Optional[ResponseCache] = None,
+                        resume: bool = False,
+                        hybrid: bool = False,
+                        profile: ProfileArg = DEFAULT_PROFILE,
+                        cascade: bool = False,
+                        page_index: Optional[PageFingerprintIndex] = None,
+                        cached_document: bool = False,
+                        telemetry: Optional[TelemetryRecorder] = None) -> Iterator[str]:
+    """
+    Convert a PDF chunk by chunk, yielding each part's Markdown in page order as soon as it is ready.
+
+    Chunks are built lazily and at most a couple of chunks per worker are in flight,
+    so memory stays bounded regardless of document size. Takes the same arguments
+    as convert_pdf_to_markdown.
+    """
+
+    profile = get_profile(profile)
+    if pages_per_chunk is None:
+        pages_per_chunk = profile.pages_per_chunk
+
+    escalation = None
+    if cascade:
+        if not profile.escalation_profile:
+            raise ValueError(f"Profile '{profile.name}' has no escalation profile, so it cannot run in cascade mode")
+        escalation = get_profile(profile.escalation_profile)
+
+    # Get API key from parameter or environment variable
+    if api_key is None:
+        api_key = os.environ.get('ANTHROPIC_API_KEY')
+        if not api_key:
+            raise ValueError(
+                "No API key provided. Either pass it as a parameter or set the ANTHROPIC_API_KEY environment variable."
+            )
+
+    # Parse the PDF once; splitting, page fingerprints, local rendering and cascade scoring all share it
+    owns_pdf = not isinstance(pdf_path, PDFDocument)
+    pdf = PDFDocument(pdf_path) if owns_pdf else pdf_path
+    pdf_path = pdf.path
+
+    # No session is resolved here: the shared client is only created by the first chunk that calls the API,
+    # so runs served entirely by local rendering, the page index or the response cache never build one
+    if pages_per_chunk == ADAPTIVE_CHUNKING:
+        print("Splitting PDF into chunks sized by estimated request budget...")
+    else:
+        print(f"Splitting PDF into chunks of {pages_per_chunk} pages...")
+
+    # Born-digital pages convert locally in milliseconds; only scans and complex layouts need the model
+    local_pages = {}
+    if hybrid:
+        from .local_markdown_renderer import render_text_layer_pages
+        local_pages = render_text_layer_pages(pdf)
+        print(f"Hybrid mode: {len(local_pages)} text-layer pages rendered locally")
+
+    # Every finished chunk goes to a sidecar journal so a crash doesn't lose completed work
+    tag = output_tag(profile, cascade)
+    journal = ConversionJournal.for_pdf(pdf_path, tag, pdf.sha256)
+
+    # Cover pages, boilerplate and appendices repeat across documents - convert each of them once
+    signatures = []
+    isolated_pages = set()
+    if page_index is not None:
+        signatures = pdf_page_signatures(pdf)
+        fingerprints = [fingerprint for fingerprint, _ in signatures]
+        stored = page_index.reusable_markdown(signatures, tag)
+        repeated = page_index.register_document(fingerprints, pdf.sha256, str(pdf_path))
+        reused = 0
+        for page_num, fingerprint in enumerate(fingerprints):
+            if page_num in local_pages:
+                continue
+            if page_num in stored:
+                local_pages[page_num] = stored[page_num]
+                reused += 1
+            elif fingerprint in repeated:
+                isolated_pages.add(page_num)
+        print(f"Page index: {reused} pages reused from earlier documents, {len(isolated_pages)} repeated pages sent on their own")
+
+    # Mid-sized documents can go up once as a cached prefix; chunks then only name their page range
+    document = None
+    if cached_document:
+        fits, reason = CachedDocument.fits(pdf)
+        if fits:
+            document = CachedDocument(pdf)
+            print(f"Cached document mode: {document.total_pages} pages sent once as a cached prefix, chunks request page ranges")
+        else:
+            print(f"[WARNING] Cached document mode unavailable ({reason}) - splitting the PDF instead")
+    chunks = iter_pdf_chunks(pdf, pages_per_chunk, local_pages, isolated_pages, build_data=document is None)
+
+    completed = journal.resume() if resume else {}
+    completed_lock = threading.Lock()  # Chunk workers add bisected halves while others scan for them
+    if resume:
+        print(f"Resuming: {len(completed)} chunks already converted in {journal.journal_path.name}")
+    else:
+        journal.start()
+    failed_ranges = set()
+    failed_pages = {}   # Page number -> error, for pages that still failed once bisected down to a single page
+    truncated_pages = set()  # Single pages kept with partial Markdown after every continuation hit max_tokens
+    escalated_ranges = set()
+
+    # Parts stream into the output file while they are generated, when the writer follows them
+    live = LiveParts()
+
+    def chunk_markdown(i: int, chunk: dict, chunk_profile: ConversionProfile, prefix: str = "") -> str:
+        # prefix is Markdown already streamed into this part (earlier halves of a bisected chunk)
+        part = live.get(i)
+        on_restart = lambda text: part.restart(prefix + text)
+        metrics = {}
+        try:
+            if document is not None:
+                markdown_text = convert_page_range_to_markdown(document, api_key, chunk, session, cache, chunk_profile,
+                                                               part.write, on_restart, metrics)
+            else:
+                markdown_text = convert_pdf_chunk_to_markdown(chunk['data'], api_key, chunk, session, cache,
+                                                              chunk_profile, part.write, on_restart, metrics)
+        except Exception as e:
+            if telemetry is not None:
+                telemetry.record_request(i, chunk, chunk_profile, metrics, "error", str(e))
+            raise
+        if telemetry is not None:
+            telemetry.record_request(i, chunk, chunk_profile, metrics)
+        return markdown_text
+
+    def source_text(chunk: dict) -> str:
+        # From the shared document's page-text cache, not a re-parse of the chunk bytes
+        return pdf.text(chunk['start_page'] - 1, chunk['end_page'])
+
+    def escalate_if_weak(i: int, chunk: dict, markdown_text: str, prefix: str = "") -> str:
+        # The cheap model's output is kept unless its words visibly drift from the page text layer
+        score = score_text_fidelity(source_text(chunk), markdown_text, CASCADE_MIN_SOURCE_WORDS)
+        if score is None:
+            print(f"  [INFO] Chunk {i} has no usable text layer to score - keeping {profile.name} output")
+            return markdown_text
+        if score >= WORD_FIDELITY_THRESHOLD:
+            print(f"  [OK] Chunk {i} word fidelity {score:.1f}%")
+            return markdown_text
+
+        print(f"  [CASCADE] Chunk {i} word fidelity {score:.1f}% is below {WORD_FIDELITY_THRESHOLD}% - re-sending to {escalation.name}")
+        try:
+            markdown_text = chunk_markdown(i, chunk, escalation, prefix)
+        except Exception as e:
+            print(f"  [WARNING] {escalation.name} failed on chunk {i}, keeping {profile.name} output: {e}")
+            return markdown_text
+        escalated_ranges.add((chunk['start_page'], chunk['end_page']))
+        return markdown_text
+
+    def convert_range(i: int, chunk: dict, prefix: str = "", bisected: bool = False) -> str:
+        """Convert one page range, splitting it in two on failures a smaller range can avoid, down to single pages"""
+        start_page, end_page = chunk['start_page'], chunk['end_page']
+        page_range = (start_page, end_page)
+        if page_range in completed:
+            return completed[page_range]
+
+        # Parts of this range finished earlier (before a requeue, or in an interrupted run) - go straight to the halves
+        with completed_lock:
+            done_ranges = list(completed)
+        halves_done = any(start_page <= done[0] and done[1] <= end_page and done != page_range for done in done_ranges)
+        if not halves_done:
+            try:
+                markdown_text = chunk_markdown(i, chunk, profile, prefix)
+                if escalation is not None:
+                    markdown_text = escalate_if_weak(i, chunk, markdown_text, prefix)
+                journal.record(chunk, markdown_text)
+                if bisected:
+                    with completed_lock:
+                        completed[page_range] = markdown_text
+                return markdown_text
+            except Exception as e:
+                if isinstance(e, OutputLimitError) and start_page == end_page:
+                    # A single page can't be split further - its truncated Markdown beats a placeholder
+                    print(f"  [WARNING] Page {start_page} is still truncated after every continuation - keeping partial output")
+                    journal.record(chunk, e.text)
+                    truncated_pages.add(start_page)
+                    return e.text
+                if start_page == end_page or not is_bisectable(e):
+                    if not bisected or is_retryable(e):
+                        raise  # Whole chunk (or throttling): handled by convert_chunk, which may requeue it
+                    label = f"page {start_page}" if start_page == end_page else f"pages {start_page}-{end_page}"
+                    print(f"  [ERROR] Chunk {i}: {label} could not be converted: {e}")
+                    journal.record(chunk, None, ok=False, error=str(e))
+                    for page_num in range(start_page, end_page + 1):
+                        failed_pages[page_num] = str(e)
+                    failed_ranges.add(page_range)
+                    return f"\n\n---\n\n**[Error converting {label}: {e}]**\n\n---\n\n"
+                print(f"  [BISECT] Pages {start_page}-{end_page} failed ({type(e).__name__}: {e}) - retrying them in two halves")
+
+        middle = start_page + (end_page - start_page) // 2
+        live.get(i).restart(prefix)
+        left_text = convert_range(i, sub_chunk(chunk, start_page, middle), prefix, True)
+        right_text = convert_range(i, sub_chunk(chunk, middle + 1, end_page), prefix + left_text + "\n\n", True)
+        return left_text + "\n\n" + right_text
+
+    def convert_chunk(i: int, chunk: dict) -> str:
+        if 'markdown' in chunk:
+            print(f"  [LOCAL] Chunk {i} (pages {chunk['start_page']}-{chunk['end_page']}) needs no API call")
+            if telemetry is not None:
+                telemetry.record_chunk(i, chunk, "local")
+            return chunk['markdown']
+
+        page_range = (chunk['start_page'], chunk['end_page'])
+        if page_range in completed:
+            print(f"Skipping chunk {i} (pages {chunk['start_page']}-{chunk['end_page']} of {chunk['total_pages']}) - already converted")
+            if telemetry is not None:
+                telemetry.record_chunk(i, chunk, "resumed")
+            return completed[page_range]
+
+        print(f"Converting chunk {i} (pages {chunk['start_page']}-{chunk['end_page']} of {chunk['total_pages']})...")
+        started = time.monotonic()
+        try:
+            markdown_text = convert_range(i, chunk)
+            # Only complete Markdown goes in the index - later documents would reuse it without an API call
+            page_num = chunk['start_page']
+            if (chunk['end_page'] == page_num and page_num - 1 in isolated_pages
+                    and page_num not in truncated_pages and page_num not in failed_pages):
+                fingerprint, content_hash = signatures[page_num - 1]
+                page_index.put_markdown(fingerprint, tag, markdown_text, content_hash)
+            failed_ranges.discard(page_range)
+            bad_pages = [page for page in range(chunk['start_page'], chunk['end_page'] + 1) if page in failed_pages]
+            if bad_pages:
+                print(f"  [WARNING] Chunk {i} converted except page(s) {', '.join(map(str, bad_pages))}")
+            else:
+                print(f"  [OK] Chunk {i} converted successfully")
+            if telemetry is not None:
+                telemetry.record_chunk(i, chunk, "partial" if bad_pages else "converted", time.monotonic() - started)
+            return markdown_text
+        except Exception as e:
+            print(f"  [ERROR] Failed to convert chunk {i}: {e}")
+            journal.record(chunk, None, ok=False, error=str(e))
+            failed_ranges.add(page_range)
+            if telemetry is not None:
+                telemetry.record_chunk(i, chunk, "failed", time.monotonic() - started)
+            placeholder = f"\n\n---\n\n**[Error converting pages {chunk['start_page']}-{chunk['end_page']}]**\n\n---\n\n"
+            if is_retryable(e):
+                # Still throttled after every retry - try again once the rest of the queue has gone through
+                raise RequeueRequest(placeholder, str(e))
+            return placeholder
+
+    def generate_parts() -> Iterator[str]:
+        try:
+            # Chunks are independent requests, so run them concurrently; results still come out in page order
+            if max_workers > 1:
+                print(f"Converting with {max_workers} concurrent workers...")
+            yield from map_in_order(convert_chunk, chunks, max_workers, max_requeues=CHUNK_MAX_REQUEUES)
+
+            if escalation is not None:
+                print(f"Cascade: {len(escalated_ranges)} chunks escalated from {profile.name} to {escalation.name}")
+
+            if failed_pages:
+                # Bisection narrowed these failures down to the exact pages
+                print(f"[WARNING] {len(failed_pages)} pages could not be converted:")
+                for page_num in sorted(failed_pages):
+                    print(f"  Page {page_num}: {failed_pages[page_num]}")
+            if telemetry is not None:
+                telemetry.finish()
+
+            if failed_ranges:
+                print(f"[WARNING] {len(failed_ranges)} chunks or page ranges failed - run again with --resume to retry only those")
+            else:
+                journal.discard()
+        finally:
+            if owns_pdf:
+                pdf.close()
+
+    return LiveMarkdownParts(generate_parts(), live)
+
+def convert_pdf_to_markdown(pdf_path: PdfArg, api_key: Optional[str] = None,
+                            pages_per_chunk: Optional[Union[int, str]] = None,
+                            max_workers: int = MAX_CONCURRENT_CHUNKS,
+                            session: Optional[ConverterSession] = None,
+                            cache: Optional[ResponseCache] = None,
+                            resume: bool = False,
+                            hybrid: bool = False,
+                            profile: ProfileArg = DEFAULT_PROFILE,
+                            cascade: bool = False,
+                            page_index: Optional[PageFingerprintIndex] = None,
+                            cached_document: bool = False,
+                            telemetry: Optional[TelemetryRecorder] = None) -> str:
+    """
+    Convert a large PDF document to Markdown by processing it in chunks.
+
+    Args:
+        pdf_path: Path to the PDF file, or a PDFDocument shared with other stages (left open)
+        api_key: Anthropic API key (optional, can use environment variable)
+        pages_per_chunk: Number of pages to process at once, or "auto" to pack pages by estimated size
+                         (defaults to the profile's chunk size)
+        max_workers: Number of chunks to convert concurrently (1 = sequential)
+        session: Converter session to reuse (defaults to the shared session for api_key)
+        cache: Response cache consulted before each API call (None disables caching)
+        resume: Reuse chunks finished by an interrupted run and retry only the failed ones
+        hybrid: Render pages with a usable text layer locally and send only the rest to the API
+        profile: Profile name from model_profiles (e.g. "sonnet", "haiku") or a ConversionProfile
+        cascade: Score each chunk's word fidelity against its text layer and re-send chunks below
+                 WORD_FIDELITY_THRESHOLD to the profile's escalation profile (e.g. haiku -> sonnet)
+        page_index: Page fingerprint index; pages converted in earlier documents are reused
+                    and pages seen before are sent alone so their Markdown can be stored
+        cached_document: Send the whole PDF once as a cached prompt prefix and request each chunk
+                         as a page range of it, instead of splitting the PDF (falls back to
+                         splitting when the document is over the CACHED_DOCUMENT_* limits)
+        telemetry: Recorder for per-request timings, tokens and cost; its summary is printed at the end
+
+    Returns:
+        Markdown formatted text from the PDF
+    """
+    return MARKDOWN_PART_SEPARATOR.join(iter_markdown_parts(pdf_path, api_key, pages_per_chunk, max_workers,
+                                                            session, cache, resume, hybrid, profile, cascade,
+                                                            page_index, cached_document, telemetry))
+
+def main(default_profile: str = DEFAULT_PROFILE):
+    """
+    Main function to handle command-line usage.
+
+    Usage: <pdf_path> [pages_per_chunk|auto] [max_workers] [--profile=NAME] [--resume] [--hybrid] [--cascade]
+           [--cached-document]
+    """
+
+    # --flags can appear anywhere; the remaining arguments are positional
+    flags = {arg for arg in sys.argv[1:] if arg.startswith('--')}
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    if '--help' in flags:
+        print("Usage: <pdf_path> [pages_per_chunk|auto] [max_workers] [--profile=NAME] [--resume] [--hybrid]"
+              " [--cascade] [--cached-document]")
+        return
+    resume = '--resume' in flags
+    hybrid = '--hybrid' in flags
+    cascade = '--cascade' in flags
+    cached_document = '--cached-document' in flags
+
+    profile_name = default_profile
+    for flag in flags:
+        if flag.startswith('--profile='):
+            profile_name = flag.split('=', 1)[1]
+    try:
+        profile = get_profile(profile_name)
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+
+    print(profile.title)
+    print("-" * 50)
+    if profile.banner_notes:
+        for note in profile.banner_notes:
+            print(note)
+        print("-" * 50)
+
+    # Check if PDF path was provided as command-line argument
+    if len(args) > 0:
+        pdf_path = args[0].strip()
+        print(f"Using PDF file: {pdf_path}")
+    else:
+        # Get PDF path from user
+        pdf_path = input("Enter the path to your PDF file: ").strip()
+
+    # Optional: pages per chunk
+    pages_per_chunk = profile.pages_per_chunk
+    if len(args) > 1:
+        try:
+            pages_per_chunk = parse_pages_per_chunk(args[1])
+            print(f"Using {pages_per_chunk} pages per chunk")
+        except ValueError:
+            print(f"Invalid pages per chunk, using default of {profile.pages_per_chunk}")
+
+    # Optional: concurrent chunk workers
+    max_workers = MAX_CONCURRENT_CHUNKS
+    if len(args) > 2:
+        try:
+            max_workers = int(args[2])
+            print(f"Using {max_workers} concurrent workers")
+        except ValueError:
+            print(f"Invalid worker count, using default of {MAX_CONCURRENT_CHUNKS}")
+
+    # Check for API key in environment or prompt for it
+    api_key = os.environ.get('ANTHROPIC_API_KEY')
+    if not api_key:
+        print("\nNo ANTHROPIC_API_KEY found in environment variables.")
+        api_key = input("Enter your Anthropic API key: ").strip()
+
+    try:
+        cache = ResponseCache() if RESPONSE_CACHE_ENABLED else None
+        page_index = PageFingerprintIndex() if PAGE_INDEX_ENABLED else None
+
+        # Name the output up front so parts can be streamed into it as they finish
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        base_name = Path(pdf_path).stem
+        output_filename = f"{base_name}_{output_tag(profile, cascade)}_{timestamp}.md"
+        output_path = Path(pdf_path).parent / output_filename
+        telemetry = TelemetryRecorder(output_path.with_suffix('.telemetry.jsonl')) if TELEMETRY_ENABLED else None
+
+        print("\nConverting PDF to Markdown...")
+        markdown_parts = iter_markdown_parts(pdf_path, api_key, pages_per_chunk, max_workers,
+                                             cache=cache, resume=resume, hybrid=hybrid, profile=profile,
+                                             cascade=cascade, page_index=page_index,
+                                             cached_document=cached_document, telemetry=telemetry)
+        total_length = write_markdown_parts(markdown_parts, output_path)
+
+        print(f"\n[OK] Conversion successful!")
+        print(f"[OK] Markdown saved to: {output_path}")
+        print(f"[OK] Total length: {total_length} characters")
+        if cache is not None:
+            stats = cache.stats()
+            print(f"[OK] Response cache: {stats['hits']} hits, {stats['misses']} misses")
+        for note in profile.summary_notes:
+            print(note)
+
+    except FileNotFoundError as e:
+        print(f"\n[ERROR] {e}")
+        sys.exit(1)
+    except ValueError as e:
+        print(f"\n[ERROR] {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n[ERROR] An error occurred: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
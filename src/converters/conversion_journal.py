@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Conversion Journal
+Purpose: Persist each finished chunk so an interrupted conversion can resume
+Strategy: Append-only JSON Lines sidecar next to the PDF, one record per completed chunk
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+def file_sha256(path: str) -> str:
+    """SHA-256 of a file's contents, read in 1 MB blocks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+class ConversionJournal:
+    """Sidecar file recording each chunk's page range, status and markdown as it finishes"""
+
+    def __init__(self, journal_path: str, source_path: str, source_hash: Optional[str] = None):
+        self.journal_path = Path(journal_path)
+        self.source_path = Path(source_path)
+        self._lock = threading.Lock()
+        self._source_hash = source_hash  # Callers that already hashed the PDF pass it to skip re-reading the file
+
+    @classmethod
+    def for_pdf(cls, pdf_path: str, suffix: str, source_hash: Optional[str] = None) -> "ConversionJournal":
+        """Journal for a PDF/converter pair, e.g. report.pdf -> report_sonnet.journal.jsonl"""
+        pdf_path = Path(pdf_path)
+        return cls(pdf_path.with_name(f"{pdf_path.stem}_{suffix}.journal.jsonl"), pdf_path, source_hash)
+
+    def source_hash(self) -> str:
+        """SHA-256 of the source PDF, so a journal is never replayed against a changed file"""
+        if self._source_hash is None:
+            self._source_hash = file_sha256(self.source_path)
+        return self._source_hash
+
+    def start(self):
+        """Begin a fresh journal, discarding any previous run"""
+        with self._lock:
+            with open(self.journal_path, 'w', encoding='utf-8') as f:
+                f.write(json.dumps({'type': 'header', 'source_sha256': self.source_hash()}) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def load_completed(self) -> Dict[Tuple[int, int], str]:
+        """Return {(start_page, end_page): markdown} for every chunk that finished successfully"""
+        if not self.journal_path.exists():
+            return {}
+
+        completed = {}
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f):
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash mid-write can leave a torn last line; everything before it is intact
+                    break
+
+                if line_number == 0:
+                    if record.get('type') != 'header' or record.get('source_sha256') != self.source_hash():
+                        print(f"[WARNING] Journal {self.journal_path.name} does not match the PDF, starting over")
+                        return {}
+                    continue
+
+                key = (record['start_page'], record['end_page'])
+                if record['status'] == 'ok':
+                    completed[key] = record['markdown']
+                else:
+                    completed.pop(key, None)
+
+        return completed
+
+    def resume(self) -> Dict[Tuple[int, int], str]:
+        """Load completed chunks and keep appending to the same journal"""
+        completed = self.load_completed()
+        if not completed:
+            self.start()
+        return completed
+
+    def record(self, chunk: dict, markdown_text: str, ok: bool = True, error: Optional[str] = None):
+        """Append one finished chunk (or failed page range, with its error) and flush it to disk before returning"""
+        record = {
+            'type': 'chunk',
+            'start_page': chunk['start_page'],
+            'end_page': chunk['end_page'],
+            'total_pages': chunk['total_pages'],
+            'status': 'ok' if ok else 'error',
+            'markdown': markdown_text if ok else None,
+        }
+        if error:
+            record['error'] = error
+        with self._lock:
+            with open(self.journal_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def discard(self):
+        """Delete the journal once the whole document converted cleanly"""
+        with self._lock:
+            if self.journal_path.exists():
+                self.journal_path.unlink()
@@ -0,0 +1,482 @@
+#!/usr/bin/env python3
+"""
+Conversion Service
+Purpose: Keep one warm process converting PDFs instead of paying startup, imports and client setup per file
+Strategy: Local HTTP API in front of a job queue; a fixed pool of worker threads shares one pooled session
+          (and its rate limits), the response cache and the page index. Jobs live in SQLite so a restart
+          re-queues unfinished work, which resumes from its journal
+"""
+
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from config.settings import (
+    DEFAULT_PROFILE,
+    MAX_CONCURRENT_CHUNKS,
+    PAGE_INDEX_ENABLED,
+    RESPONSE_CACHE_ENABLED,
+    SERVICE_DIR,
+    SERVICE_HOST,
+    SERVICE_MAX_UPLOAD_BYTES,
+    SERVICE_PORT,
+    SERVICE_WORKERS,
+    TELEMETRY_ENABLED,
+)
+from .conversion_engine import iter_markdown_parts, output_tag
+from .conversion_journal import ConversionJournal
+from .converter_session import ConverterSession, get_session
+from .model_profiles import ConversionProfile, get_profile
+from .page_fingerprints import PageFingerprintIndex
+from .pdf_chunking import parse_pages_per_chunk
+from .response_cache import ResponseCache
+from .streaming_pipeline import write_markdown_parts
+from .telemetry import TelemetryRecorder
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+CONVERTED = "converted"
+PARTIAL = "partial"      # Some chunks failed; resubmitting resumes from the journal
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+JOB_FIELDS = ('id', 'status', 'source_path', 'source_name', 'profile', 'pages_per_chunk', 'options', 'output_path',
+              'error', 'characters', 'created_at', 'started_at', 'finished_at')
+
+class JobStore:
+    """SQLite table of jobs, so the queue survives a restart"""
+
+    def __init__(self, db_path: str):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " id TEXT PRIMARY KEY,"
+                " status TEXT NOT NULL,"
+                " source_path TEXT NOT NULL,"
+                " source_name TEXT NOT NULL,"
+                " profile TEXT NOT NULL,"
+                " pages_per_chunk TEXT,"
+                " options TEXT NOT NULL,"
+                " output_path TEXT,"
+                " error TEXT,"
+                " characters INTEGER,"
+                " created_at TEXT NOT NULL,"
+                " started_at TEXT,"
+                " finished_at TEXT)"
+            )
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA busy_timeout=30000")
+        return conn
+
+    def _row(self, row) -> Optional[Dict]:
+        if row is None:
+            return None
+        job = dict(zip(JOB_FIELDS, row))
+        job['options'] = json.loads(job['options'])
+        return job
+
+    def add(self, job: Dict):
+        conn = self._connect()
+        try:
+            conn.execute(f"INSERT INTO jobs ({', '.join(JOB_FIELDS)}) VALUES ({', '.join('?' * len(JOB_FIELDS))})",
+                         tuple(json.dumps(job[f]) if f == 'options' else job.get(f) for f in JOB_FIELDS))
+        finally:
+            conn.close()
+
+    def update(self, job_id: str, **fields):
+        conn = self._connect()
+        try:
+            assignments = ", ".join(f"{name} = ?" for name in fields)
+            conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+        finally:
+            conn.close()
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        conn = self._connect()
+        try:
+            return self._row(conn.execute(f"SELECT {', '.join(JOB_FIELDS)} FROM jobs WHERE id = ?",
+                                          (job_id,)).fetchone())
+        finally:
+            conn.close()
+
+    def list(self, limit: int = 100, status: Optional[str] = None) -> List[Dict]:
+        conn = self._connect()
+        try:
+            query = f"SELECT {', '.join(JOB_FIELDS)} FROM jobs"
+            params = ()
+            if status:
+                query += " WHERE status = ?"
+                params = (status,)
+            rows = conn.execute(query + " ORDER BY created_at DESC LIMIT ?", (*params, limit)).fetchall()
+        finally:
+            conn.close()
+        return [self._row(row) for row in rows]
+
+    def unfinished(self) -> List[Dict]:
+        """Jobs still queued or cut off mid-run by a restart, oldest first"""
+        conn = self._connect()
+        try:
+            rows = conn.execute(f"SELECT {', '.join(JOB_FIELDS)} FROM jobs WHERE status IN (?, ?)"
+                                " ORDER BY created_at", (QUEUED, RUNNING)).fetchall()
+        finally:
+            conn.close()
+        return [self._row(row) for row in rows]
+
+class ConversionService:
+    """Job queue plus worker threads sharing one session, response cache and page index"""
+
+    def __init__(self, api_key: str, workers: int = SERVICE_WORKERS, service_dir: str = SERVICE_DIR,
+                 session: Optional[ConverterSession] = None, cache: Optional[ResponseCache] = None,
+                 page_index: Optional[PageFingerprintIndex] = None, chunk_workers: int = MAX_CONCURRENT_CHUNKS):
+        self.api_key = api_key
+        self.workers = max(1, workers)
+        self.chunk_workers = chunk_workers
+        self.service_dir = Path(service_dir)
+        self.upload_dir = self.service_dir / "uploads"
+        self.output_dir = self.service_dir / "outputs"
+        self.upload_dir.mkdir(parents=True, exist_ok=True)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        self.session = session if session is not None else get_session(api_key)
+        self.cache = cache
+        self.page_index = page_index
+        self.store = JobStore(self.service_dir / "jobs.sqlite3")
+
+        self._queue = queue.Queue()
+        self._stopping = threading.Event()  # Set by stop(): workers take no further jobs from the queue
+        self._telemetry: Dict[str, TelemetryRecorder] = {}  # Live progress of running jobs
+        # Jobs for the same PDF and output tag share one journal file, so they run one at a time
+        self._journal_locks: Dict[str, threading.Lock] = {}
+        self._journal_locks_guard = threading.Lock()
+        self._threads = []
+
+    def start(self) -> 'ConversionService':
+        # Work left by a previous process (or a previous start) goes back in the queue; running jobs
+        # resume from their journals. The job table is the source of truth, so the queue starts empty
+        self._stopping.clear()
+        self._queue = queue.Queue()
+        for job in self.store.unfinished():
+            self.store.update(job['id'], status=QUEUED)
+            self._queue.put(job['id'])
+        for number in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"conversion-worker-{number + 1}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self, wait: bool = True):
+        """Let running jobs finish, then stop the workers (queued jobs stay queued for the next start)"""
+        self._stopping.set()
+        for _ in self._threads:
+            self._queue.put(None)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+        self._threads = []
+
+    def submit(self, source_path: str, options: Optional[Dict] = None, source_name: Optional[str] = None) -> Dict:
+        """Queue a PDF already on disk; options: profile, pages_per_chunk, hybrid, cascade, cached_document"""
+        options = dict(options or {})
+        source_path = Path(source_path)
+        if not source_path.is_file():
+            raise FileNotFoundError(f"PDF file not found: {source_path}")
+        profile = get_profile(options.pop('profile', None) or DEFAULT_PROFILE)  # ValueError for unknown profiles
+        pages_per_chunk = options.pop('pages_per_chunk', None)
+        if pages_per_chunk is not None:
+            pages_per_chunk = str(parse_pages_per_chunk(str(pages_per_chunk)))
+        unknown = set(options) - {'hybrid', 'cascade', 'cached_document'}
+        if unknown:
+            raise ValueError(f"Unknown job options: {', '.join(sorted(unknown))}")
+
+        job = {
+            'id': uuid.uuid4().hex[:12],
+            'status': QUEUED,
+            'source_path': str(source_path.resolve()),
+            'source_name': source_name or source_path.name,
+            'profile': profile.name,
+            'pages_per_chunk': pages_per_chunk,
+            'options': {name: bool(value) for name, value in options.items()},
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        self.store.add(job)
+        self._queue.put(job['id'])
+        return self.status(job['id'])
+
+    def submit_upload(self, pdf_data: bytes, name: str, options: Optional[Dict] = None) -> Dict:
+        """Queue PDF bytes sent over HTTP; they are kept under the service directory"""
+        if not pdf_data.startswith(b"%PDF"):
+            raise ValueError("Upload is not a PDF")
+        safe_name = Path(name or "upload.pdf").name
+        upload_path = self.upload_dir / f"{uuid.uuid4().hex[:12]}_{safe_name}"
+        upload_path.write_bytes(pdf_data)
+        return self.submit(str(upload_path), options, safe_name)
+
+    def cancel(self, job_id: str) -> Optional[Dict]:
+        """Cancel a job that has not started; running and finished jobs are left alone"""
+        job = self.store.get(job_id)
+        if job is not None and job['status'] == QUEUED:
+            self.store.update(job_id, status=CANCELLED, finished_at=datetime.now().isoformat(timespec='seconds'))
+            # Out of the queue too, so it no longer counts towards the queue_position of the jobs behind it
+            with self._queue.mutex:
+                if job_id in self._queue.queue:
+                    self._queue.queue.remove(job_id)
+        return self.status(job_id)
+
+    def status(self, job_id: str) -> Optional[Dict]:
+        job = self.store.get(job_id)
+        if job is None:
+            return None
+        telemetry = self._telemetry.get(job_id)
+        if telemetry is not None:
+            summary = telemetry.summary()
+            job['progress'] = {'pages_done': summary['pages'], 'requests': summary['requests'],
+                               'elapsed_s': summary['elapsed_s']}
+        job['queue_position'] = None
+        if job['status'] == QUEUED:
+            job['queue_position'] = list(self._queue.queue).index(job_id) + 1 if job_id in self._queue.queue else None
+        return job
+
+    def _work(self):
+        while True:
+            job_id = self._queue.get()
+            if job_id is None or self._stopping.is_set():
+                return  # A job taken here is still QUEUED in the job table, so the next start() queues it again
+            job = self.store.get(job_id)
+            if job is None or job['status'] != QUEUED:
+                continue  # Cancelled while waiting
+            self._run(job)
+
+    def _journal_lock(self, journal: ConversionJournal) -> threading.Lock:
+        with self._journal_locks_guard:
+            return self._journal_locks.setdefault(str(journal.journal_path), threading.Lock())
+
+    def _run(self, job: Dict):
+        profile = get_profile(job['profile'])
+        tag = output_tag(profile, job['options'].get('cascade', False))
+        journal = ConversionJournal.for_pdf(job['source_path'], tag)
+        # A second job for the same PDF waits here, still queued, and then resumes from (or discards) the
+        # journal the first one left instead of writing to it at the same time
+        with self._journal_lock(journal):
+            job = self.store.get(job['id'])
+            if job['status'] != QUEUED:
+                return  # Cancelled while waiting for the other job
+            self._convert(job, profile, tag, journal)
+
+    def _convert(self, job: Dict, profile: ConversionProfile, tag: str, journal: ConversionJournal):
+        options = job['options']
+        output_path = Path(job['output_path']) if job['output_path'] else \
+            self.output_dir / f"{Path(job['source_name']).stem}_{tag}_{job['id']}.md"
+        self.store.update(job['id'], status=RUNNING, output_path=str(output_path), error=None,
+                          started_at=datetime.now().isoformat(timespec='seconds'))
+        print(f"[INFO] Job {job['id']}: converting {job['source_name']} with {profile.name}")
+
+        # Always recorded in memory for the progress shown by GET /jobs/<id>
+        telemetry = TelemetryRecorder(output_path.with_suffix('.telemetry.jsonl') if TELEMETRY_ENABLED else None)
+        self._telemetry[job['id']] = telemetry
+        pages_per_chunk = parse_pages_per_chunk(job['pages_per_chunk']) if job['pages_per_chunk'] else None
+        try:
+            markdown_parts = iter_markdown_parts(job['source_path'], self.api_key, pages_per_chunk, self.chunk_workers,
+                                                 session=self.session, cache=self.cache,
+                                                 resume=journal.journal_path.exists(),
+                                                 hybrid=options.get('hybrid', False), profile=profile,
+                                                 cascade=options.get('cascade', False), page_index=self.page_index,
+                                                 cached_document=options.get('cached_document', False),
+                                                 telemetry=telemetry)
+            characters = write_markdown_parts(markdown_parts, str(output_path))
+            # The engine keeps the journal only when some chunks failed
+            status = PARTIAL if journal.journal_path.exists() else CONVERTED
+            self.store.update(job['id'], status=status, characters=characters,
+                              finished_at=datetime.now().isoformat(timespec='seconds'))
+            print(f"[OK] Job {job['id']}: {status}, {characters} characters")
+        except Exception as e:
+            self.store.update(job['id'], status=FAILED, error=str(e),
+                              finished_at=datetime.now().isoformat(timespec='seconds'))
+            print(f"[ERROR] Job {job['id']} failed: {e}")
+        finally:
+            self._telemetry.pop(job['id'], None)
+
+def _handler_class(service: ConversionService):
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass  # Job progress is printed by the workers
+
+        def _send_json(self, status: int, payload):
+            data = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _error(self, status: int, message: str):
+            self._send_json(status, {"error": message})
+
+        def _job_route(self):
+            """('<id>', 'result'|None) for /jobs/<id>[/result], else None"""
+            parts = [part for part in urlparse(self.path).path.split("/") if part]
+            if len(parts) >= 2 and parts[0] == "jobs":
+                return parts[1], (parts[2] if len(parts) > 2 else None)
+            return None
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == "/health":
+                self._send_json(200, {"status": "ok", "workers": service.workers,
+                                      "queued": service._queue.qsize()})
+                return
+            if url.path.rstrip("/") == "/jobs":
+                query = parse_qs(url.query)
+                try:
+                    limit = int(query.get('limit', ['100'])[0])
+                except ValueError:
+                    limit = 0
+                if limit < 1:
+                    self._error(400, "limit must be a positive whole number")
+                    return
+                self._send_json(200, service.store.list(limit, query.get('status', [None])[0]))
+                return
+
+            route = self._job_route()
+            job = service.status(route[0]) if route else None
+            if job is None:
+                self._error(404, "No such job")
+                return
+            if route[1] is None:
+                self._send_json(200, job)
+                return
+            if route[1] != "result":
+                self._error(404, "Unknown job resource")
+                return
+            if job['status'] not in (CONVERTED, PARTIAL):
+                self._error(409, f"Job is {job['status']}")
+                return
+            data = Path(job['output_path']).read_bytes()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/markdown; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self):
+            url = urlparse(self.path)
+            if url.path.rstrip("/") != "/jobs":
+                self._error(404, "POST /jobs to submit a PDF")
+                return
+            length = int(self.headers.get("Content-Length", 0))
+            if length > SERVICE_MAX_UPLOAD_BYTES:
+                self._error(413, f"Upload is over {SERVICE_MAX_UPLOAD_BYTES:,} bytes")
+                return
+            body = self.rfile.read(length)
+
+            try:
+                if self.headers.get("Content-Type", "").startswith("application/json"):
+                    # {"path": "C:/docs/report.pdf", "profile": "haiku", ...} for a file the service can read
+                    request = json.loads(body or b"{}")
+                    path = request.pop('path', None)
+                    if not path:
+                        raise ValueError("JSON jobs need a 'path'")
+                    job = service.submit(path, request)
+                else:
+                    # Raw PDF bytes; options go in the query string (?name=report.pdf&profile=haiku&cascade=1)
+                    query = {name: values[0] for name, values in parse_qs(url.query).items()}
+                    name = query.pop('name', 'upload.pdf')
+                    for flag in ('hybrid', 'cascade', 'cached_document'):
+                        if flag in query:
+                            query[flag] = query[flag].lower() in ('1', 'true', 'yes')
+                    job = service.submit_upload(body, name, query)
+            except (ValueError, FileNotFoundError) as e:
+                self._error(400, str(e))
+                return
+            self._send_json(202, job)
+
+        def do_DELETE(self):
+            route = self._job_route()
+            job = service.cancel(route[0]) if route and route[1] is None else None
+            if job is None:
+                self._error(404, "No such job")
+                return
+            self._send_json(200, job)
+
+    return Handler
+
+def create_server(service: ConversionService, host: str = SERVICE_HOST, port: int = SERVICE_PORT) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), _handler_class(service))
+    server.daemon_threads = True
+    return server
+
+def main():
+    """
+    Run the conversion service until interrupted.
+
+    Usage: [--port=8750] [--host=127.0.0.1] [--workers=2] [--service-dir=PATH]
+
+    POST /jobs                 raw PDF body (?name=&profile=&pages_per_chunk=&hybrid=&cascade=&cached_document=)
+                               or JSON {"path": ..., "profile": ...}
+    GET  /jobs[?status=]       recent jobs
+    GET  /jobs/<id>            status and progress
+    GET  /jobs/<id>/result     Markdown once converted
+    DELETE /jobs/<id>          cancel a queued job
+    """
+    options = dict(arg[2:].split('=', 1) for arg in sys.argv[1:] if arg.startswith('--') and '=' in arg)
+
+    print("PDF to Markdown Conversion Service")
+    print("-" * 50)
+
+    # Check for API key in environment or prompt for it
+    api_key = os.environ.get('ANTHROPIC_API_KEY')
+    if not api_key:
+        print("\nNo ANTHROPIC_API_KEY found in environment variables.")
+        api_key = input("Enter your Anthropic API key: ").strip()
+
+    try:
+        workers = int(options.get('workers', SERVICE_WORKERS))
+        port = int(options.get('port', SERVICE_PORT))
+    except ValueError as e:
+        print(f"[ERROR] Invalid option: {e}")
+        sys.exit(1)
+
+    service = ConversionService(api_key, workers=workers, service_dir=options.get('service-dir', SERVICE_DIR),
+                                cache=ResponseCache() if RESPONSE_CACHE_ENABLED else None,
+                                page_index=PageFingerprintIndex() if PAGE_INDEX_ENABLED else None)
+    try:
+        server = create_server(service, options.get('host', SERVICE_HOST), port)
+    except OSError as e:
+        print(f"[ERROR] Cannot listen on port {port}: {e}")
+        sys.exit(1)
+
+    service.start()
+    host, port = server.server_address[:2]
+    print(f"[OK] Listening on http://{host}:{port} with {service.workers} workers")
+    print(f"[INFO] Jobs and outputs in {service.service_dir}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n[INFO] Shutting down - waiting for running jobs to finish")
+    finally:
+        server.server_close()
+        service.stop()
+
+if __name__ == "__main__":
+    main()
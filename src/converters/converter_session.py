@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Converter Session
+Purpose: Own a single pooled Anthropic client shared by every converter
+Strategy: Keep HTTP connections alive across chunks and across documents in one process
+"""
+
+import threading
+from typing import Optional
+
+from config.settings import (
+    API_TIMEOUT,
+    HTTP_KEEPALIVE_CONNECTIONS,
+    HTTP_KEEPALIVE_EXPIRY,
+    HTTP_MAX_CONNECTIONS,
+)
+from .request_scheduler import RequestScheduler
+
+class ConverterSession:
+    """One Anthropic client with a tuned connection pool and rate-limit scheduler, reused for every request"""
+
+    def __init__(self, api_key: str, max_connections: int = HTTP_MAX_CONNECTIONS,
+                 max_keepalive_connections: int = HTTP_KEEPALIVE_CONNECTIONS,
+                 keepalive_expiry: float = HTTP_KEEPALIVE_EXPIRY, timeout: float = API_TIMEOUT,
+                 scheduler: Optional[RequestScheduler] = None, client=None,
+                 base_url: Optional[str] = None):
+        self.api_key = api_key
+        self.scheduler = scheduler if scheduler is not None else RequestScheduler()
+        if client is not None:
+            # Any object with the Messages API surface, e.g. the local stand-in backend used by tests
+            self._http_client = None
+            self.client = client
+            return
+        # Imported here: the SDK takes over a second to import and is not needed for local or cached runs
+        import anthropic
+
+        # The SDK's own Limits type, from whichever HTTP library it was built on - httpx is not a direct dependency
+        limits_type = type(anthropic.DEFAULT_CONNECTION_LIMITS)
+        self._http_client = anthropic.DefaultHttpxClient(
+            limits=limits_type(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            timeout=timeout,
+        )
+        # Retries are handled by the scheduler so they respect the shared rate limits
+        # base_url points the client elsewhere, e.g. at the local mock server used for benchmarks
+        self.client = anthropic.Anthropic(api_key=api_key, http_client=self._http_client, max_retries=0,
+                                          base_url=base_url)
+
+    def close(self):
+        """Close the client and release pooled connections"""
+        self.client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+# Process-wide sessions, one per API key
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+def get_session(api_key: str) -> ConverterSession:
+    """Return the shared session for an API key, creating it on first use"""
+    with _sessions_lock:
+        session = _sessions.get(api_key)
+        if session is None:
+            session = ConverterSession(api_key)
+            _sessions[api_key] = session
+        return session
+
+def close_sessions():
+    """Close every shared session (call once when the process is done converting)"""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+def resolve_session(api_key: str, session: Optional[ConverterSession] = None) -> ConverterSession:
+    """Use the caller's session if given, otherwise the shared one for this key"""
+    return session if session is not None else get_session(api_key)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Local Backend
+Purpose: Stand-in for the Anthropic Messages API so the conversion pipeline can be exercised offline
+Strategy: Answer messages.create/stream from the PDF's own text layer, for the page range the prompt names;
+          account prompt caching the way the API does (cache_control prefixes written once, then read)
+          and honour max_tokens and assistant prefills so continuations can be exercised
+"""
+
+import base64
+import hashlib
+import io
+import json
+import re
+import threading
+from types import SimpleNamespace
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from config.settings import CHARS_PER_TOKEN, PDF_PAGE_INPUT_TOKENS
+
+PAGE_RANGE_PATTERN = re.compile(r'pages (\d+)-(\d+)')
+
+def _block_tokens(block: dict, page_count: int) -> int:
+    if block.get("type") == "document":
+        return page_count * PDF_PAGE_INPUT_TOKENS
+    return len(block.get("text", "")) // CHARS_PER_TOKEN
+
+class LocalMessages:
+    """messages.create with the same arguments and response shape as the real client"""
+
+    def __init__(self, backend: 'LocalMessagesClient'):
+        self._backend = backend
+
+    def create(self, model: str, max_tokens: int, messages: List[dict], **kwargs):
+        return self._backend.respond(model, max_tokens, messages)
+
+    def stream(self, model: str, max_tokens: int, messages: List[dict], **kwargs) -> 'LocalStream':
+        return LocalStream(self._backend.respond(model, max_tokens, messages))
+
+class LocalStream:
+    """Context manager shaped like the SDK's MessageStream"""
+
+    PIECE_CHARS = 40
+
+    def __init__(self, message):
+        self._message = message
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    @property
+    def text_stream(self) -> Iterator[str]:
+        text = self._message.content[0].text
+        for start in range(0, len(text), self.PIECE_CHARS):
+            yield text[start:start + self.PIECE_CHARS]
+
+    def get_final_message(self):
+        return self._message
+
+class LocalMessagesClient:
+    """Offline client: Markdown comes from the text layer, usage reports prompt-cache writes and reads"""
+
+    def __init__(self, max_output_chars: Optional[int] = None):
+        self.messages = LocalMessages(self)
+        self.max_output_chars = max_output_chars  # Override max_tokens to force max_tokens stops
+        self.requests: List[Dict] = []    # One record per call, for tests to inspect
+        self._cached_prefixes = set()
+        self._lock = threading.Lock()
+
+    def _split_prefix(self, model: str, content: List[dict]) -> Tuple[Optional[str], List[dict], List[dict]]:
+        """Key of the cache_control prefix (if any), the prefix blocks and the remaining blocks"""
+        marked = [i for i, block in enumerate(content) if "cache_control" in block]
+        if not marked:
+            return None, [], content
+        prefix = content[:marked[-1] + 1]
+        key = hashlib.sha256(json.dumps([model, prefix], sort_keys=True).encode('utf-8')).hexdigest()
+        return key, prefix, content[marked[-1] + 1:]
+
+    def respond(self, model: str, max_tokens: int, messages: List[dict]):
+        content = messages[0]["content"]
+        prefill = messages[-1]["content"] if messages[-1]["role"] == "assistant" else ""
+        document = next(block for block in content if block.get("type") == "document")
+        import PyPDF2
+        pdf_reader = PyPDF2.PdfReader(io.BytesIO(base64.b64decode(document["source"]["data"])))
+        total_pages = len(pdf_reader.pages)
+
+        # A whole-document request names its range in the prompt; a split chunk is converted in full
+        prompt = content[-1].get("text", "")
+        start_page, end_page = 1, total_pages
+        match = PAGE_RANGE_PATTERN.search(prompt)
+        if match and any("cache_control" in block for block in content):
+            start_page, end_page = int(match.group(1)), int(match.group(2))
+
+        parts = []
+        for page_num in range(start_page - 1, min(end_page, total_pages)):
+            text = (pdf_reader.pages[page_num].extract_text() or "").strip()
+            parts.append(f"## Page {page_num + 1}\n\n{text}")
+        full_text = "\n\n".join(parts)
+
+        # Continue after the prefill, stopping at the output limit like the API does
+        remaining = full_text[len(prefill):] if full_text.startswith(prefill) else full_text
+        limit = self.max_output_chars or max_tokens * CHARS_PER_TOKEN
+        markdown_text = remaining[:limit]
+        stop_reason = "max_tokens" if len(remaining) > limit else "end_turn"
+
+        key, prefix, rest = self._split_prefix(model, content)
+        with self._lock:
+            cache_hit = key is not None and key in self._cached_prefixes
+            if key is not None:
+                self._cached_prefixes.add(key)
+        prefix_tokens = sum(_block_tokens(block, total_pages) for block in prefix)
+        usage = SimpleNamespace(
+            input_tokens=sum(_block_tokens(block, total_pages) for block in rest) + len(prefill) // CHARS_PER_TOKEN,
+            output_tokens=len(markdown_text) // CHARS_PER_TOKEN,
+            cache_creation_input_tokens=0 if cache_hit else prefix_tokens,
+            cache_read_input_tokens=prefix_tokens if cache_hit else 0,
+        )
+        with self._lock:
+            self.requests.append({'model': model, 'start_page': start_page, 'end_page': end_page,
+                                  'cache_hit': cache_hit, 'continuation': bool(prefill),
+                                  'stop_reason': stop_reason, 'usage': usage})
+        return SimpleNamespace(content=[SimpleNamespace(type="text", text=markdown_text)],
+                               stop_reason=stop_reason, usage=usage, model=model)
+
+    def close(self):
+        pass
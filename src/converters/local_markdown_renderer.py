@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Local Markdown Renderer
+Purpose: Turn pages that already have a usable text layer into Markdown without an API call
+Strategy: Classify each page with PyMuPDF, then rebuild structure from the page layout -
+          font-size clusters for headings, indentation and bullet glyphs for lists,
+          block geometry for reading order
+"""
+
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import fitz  # PyMuPDF
+
+from ..utils.pdf_document import MUPDF_LOCK, PdfArg, use_document
+
+# Page routes
+TEXT_PAGE = "text"
+IMAGE_PAGE = "image"
+COMPLEX_PAGE = "complex"
+
+MIN_TEXT_CHARS = 100           # Same cut-off the structure analyzer uses for TEXT-BASED pages
+MAX_IMAGE_COVERAGE = 0.3       # Pages mostly covered by images are treated as scans
+MAX_VECTOR_DRAWINGS = 40       # Lots of ruling lines/shapes usually means tables or charts
+
+HEADING_MIN_RATIO = 1.15       # Text this much larger than the body is a heading candidate
+SIZE_CLUSTER_TOLERANCE = 0.6   # Font sizes closer than this (pt) are the same style
+MAX_HEADING_LEVELS = 3         # Largest clusters become #, ##, ###; any smaller heading is ####
+LIST_INDENT_STEP = 18.0        # Points of indentation per nested list level
+
+BULLET_PATTERN = re.compile(r'^\s*([•◦▪●‣⁃–—\-\*·])\s+')
+NUMBERED_PATTERN = re.compile(r'^\s*(\d{1,3}|[a-zA-Z])[\.\)]\s+')
+
+@dataclass
+class DocumentStyle:
+    """Font statistics shared by every page of a document"""
+    body_size: float = 11.0
+    heading_sizes: List[float] = field(default_factory=list)  # Cluster sizes, largest first
+
+def classify_page(page: fitz.Page) -> str:
+    """Decide whether a page can be rendered locally (text) or needs the model (image/complex)"""
+    text_length = len(page.get_text().strip())
+    if text_length < MIN_TEXT_CHARS:
+        return IMAGE_PAGE
+
+    page_area = abs(page.rect) or 1
+    image_area = 0
+    for image in page.get_image_info():
+        image_area += abs(fitz.Rect(image['bbox']) & page.rect)
+    if image_area / page_area > MAX_IMAGE_COVERAGE:
+        return IMAGE_PAGE
+
+    if len(page.get_drawings()) > MAX_VECTOR_DRAWINGS:
+        return COMPLEX_PAGE
+
+    return TEXT_PAGE
+
+def _line_text(line: Dict) -> str:
+    return "".join(span['text'] for span in line['spans']).strip()
+
+def _line_size(line: Dict) -> float:
+    """Font size of the line, weighted by how many characters each span contributes"""
+    sizes = Counter()
+    for span in line['spans']:
+        sizes[round(span['size'], 1)] += len(span['text'].strip())
+    return sizes.most_common(1)[0][0] if sizes else 0.0
+
+def _is_list_item(text: str) -> bool:
+    text = text.lstrip()
+    return text.startswith("- ") or bool(NUMBERED_PATTERN.match(text))
+
+def _line_is_bold(line: Dict) -> bool:
+    spans = [span for span in line['spans'] if span['text'].strip()]
+    return bool(spans) and all(span['flags'] & fitz.TEXT_FONT_BOLD for span in spans)
+
+def _size_histogram(pages: List[fitz.Page]) -> Counter:
+    sizes = Counter()
+    for page in pages:
+        for block in page.get_text("dict")['blocks']:
+            for line in block.get('lines', []):
+                for span in line['spans']:
+                    sizes[round(span['size'], 1)] += len(span['text'].strip())
+    return sizes
+
+def body_font_size(pages: List[fitz.Page]) -> float:
+    """Most common font size by character count - the size of ordinary paragraph text"""
+    sizes = _size_histogram(pages)
+    return sizes.most_common(1)[0][0] if sizes else 11.0
+
+def analyze_document_style(pages: List[fitz.Page]) -> DocumentStyle:
+    """Find the body size and cluster the larger font sizes into heading levels"""
+    sizes = _size_histogram(pages)
+    if not sizes:
+        return DocumentStyle()
+
+    body_size = sizes.most_common(1)[0][0]
+    candidates = sorted((size for size in sizes if size >= body_size * HEADING_MIN_RATIO), reverse=True)
+
+    # Neighbouring sizes (e.g. 17.9 and 18.0 from different fonts) collapse into one level
+    clusters = []
+    for size in candidates:
+        if clusters and clusters[-1] - size <= SIZE_CLUSTER_TOLERANCE:
+            continue
+        clusters.append(size)
+
+    return DocumentStyle(body_size=body_size, heading_sizes=clusters)
+
+def heading_prefix(size: float, style: DocumentStyle) -> str:
+    """Map a font size to a Markdown heading marker using the document's size clusters"""
+    if size < style.body_size * HEADING_MIN_RATIO:
+        return ""
+    for level, cluster_size in enumerate(style.heading_sizes[:MAX_HEADING_LEVELS], 1):
+        if size >= cluster_size - SIZE_CLUSTER_TOLERANCE:
+            return "#" * level + " "
+    return "#" * (MAX_HEADING_LEVELS + 1) + " "
+
+def reading_order(blocks: List[Dict], page_width: float) -> List[Dict]:
+    """
+    Order text blocks the way a person reads the page.
+
+    Blocks spanning the middle of the page (titles, full-width paragraphs) split
+    the page into bands; inside a band the left column is read before the right.
+    """
+    middle = page_width / 2
+    tolerance = page_width * 0.02
+
+    def column(block: Dict) -> int:
+        x0, _, x1, _ = block['bbox']
+        if x1 <= middle + tolerance:
+            return 0
+        if x0 >= middle - tolerance:
+            return 1
+        return -1  # Spans both columns
+
+    ordered = []
+    band = []
+    for block in sorted(blocks, key=lambda b: (b['bbox'][1], b['bbox'][0])):
+        if column(block) == -1:
+            ordered.extend(sorted(band, key=lambda b: (column(b), b['bbox'][1])))
+            band = []
+            ordered.append(block)
+        else:
+            band.append(block)
+    ordered.extend(sorted(band, key=lambda b: (column(b), b['bbox'][1])))
+    return ordered
+
+def _left_margins(blocks: List[Dict], page_width: float) -> Tuple[float, float]:
+    """Leftmost x of body text in each column, used as the zero point for list indentation"""
+    middle = page_width / 2
+    margins = [page_width, page_width]
+    for block in blocks:
+        for line in block.get('lines', []):
+            x0 = line['bbox'][0]
+            col = 0 if x0 < middle else 1
+            margins[col] = min(margins[col], x0)
+    if margins[1] == page_width:
+        margins[1] = margins[0]
+    return margins[0], margins[1]
+
+def render_page_markdown(page: fitz.Page, style: Optional[DocumentStyle] = None) -> str:
+    """Render one text-layer page as Markdown"""
+    if style is None:
+        style = analyze_document_style([page])
+
+    page_width = page.rect.width
+    blocks = [block for block in page.get_text("dict")['blocks'] if block.get('lines')]
+    left_margins = _left_margins(blocks, page_width)
+
+    # (text, is_list_item) in reading order
+    paragraphs = []
+    for block in reading_order(blocks, page_width):
+        lines = [line for line in block['lines'] if _line_text(line)]
+        if not lines:
+            continue
+
+        paragraph = []
+        for line in lines:
+            text = _line_text(line)
+            prefix = heading_prefix(_line_size(line), style)
+            if not prefix and _line_is_bold(line) and len(text) < 80 and len(lines) == 1:
+                prefix = "#" * (MAX_HEADING_LEVELS + 1) + " "
+
+            if prefix:
+                if paragraph:
+                    paragraphs.append((" ".join(paragraph), _is_list_item(paragraph[0])))
+                    paragraph = []
+                paragraphs.append((prefix + text, False))
+                continue
+
+            bullet = BULLET_PATTERN.match(text)
+            numbered = NUMBERED_PATTERN.match(text)
+            if bullet or numbered:
+                if paragraph:
+                    paragraphs.append((" ".join(paragraph), _is_list_item(paragraph[0])))
+                    paragraph = []
+                x0 = line['bbox'][0]
+                margin = left_margins[0 if x0 < page_width / 2 else 1]
+                indent = "  " * max(0, int(round((x0 - margin) / LIST_INDENT_STEP)))
+                paragraph.append(indent + (BULLET_PATTERN.sub("- ", text) if bullet else text))
+                continue
+
+            # Re-join words hyphenated across line breaks
+            if paragraph and paragraph[-1].endswith("-") and text[:1].islower():
+                paragraph[-1] = paragraph[-1][:-1] + text
+            else:
+                paragraph.append(text)
+
+        if paragraph:
+            paragraphs.append((" ".join(paragraph), _is_list_item(paragraph[0])))
+
+    # Consecutive list items stay together; everything else is its own paragraph
+    markdown_lines = []
+    previous_is_item = False
+    for text, is_item in paragraphs:
+        if markdown_lines and not (is_item and previous_is_item):
+            markdown_lines.append("")
+        markdown_lines.append(text)
+        previous_is_item = is_item
+
+    return "\n".join(markdown_lines).strip()
+
+def render_text_layer_pages(pdf: PdfArg) -> Dict[int, str]:
+    """
+    Classify every page and render the text-layer ones locally.
+
+    Takes a path or a shared PDFDocument (whose parse is reused and left open).
+    Returns {0-based page number: markdown} for pages that need no API call;
+    image-based and complex pages are left out for the model.
+    """
+    local_pages = {}
+    with use_document(pdf) as document, MUPDF_LOCK:
+        doc = document.fitz
+        text_pages = [page for page in doc if classify_page(page) == TEXT_PAGE]
+        style = analyze_document_style(text_pages)
+        for page in text_pages:
+            local_pages[page.number] = render_page_markdown(page, style)
+    return local_pages
+
+def iter_rendered_pages(pdf_path: str) -> Iterator[Tuple[int, str]]:
+    """Render every page locally, yielding (1-based page number, markdown) in order"""
+    with fitz.open(pdf_path) as doc:
+        style = analyze_document_style(list(doc))
+        for page in doc:
+            markdown_text = render_page_markdown(page, style)
+            if not markdown_text:
+                markdown_text = f"**[No text layer on page {page.number + 1}]**"
+            yield page.number + 1, markdown_text
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Message Streaming
+Purpose: Get a chunk's complete Markdown from the Messages API, passing text on as it is generated
+Strategy: Stream each response (messages.stream); when it stops at max_tokens, send a continuation
+          request with the text so far as the assistant prefill, until the model finishes
+"""
+
+import time
+from typing import Callable, Dict, Iterable, Iterator, Optional
+
+from config.settings import CHARS_PER_TOKEN, MAX_CONTINUATIONS, STREAM_RESPONSES
+from .converter_session import ConverterSession
+from .request_scheduler import OutputLimitError
+
+TextCallback = Callable[[str], None]
+
+def _drop_overlap(suffix: str, pieces: Iterable[str]) -> Iterator[str]:
+    """
+    Continuation text minus its leading characters that repeat suffix, the whitespace stripped from the prefill.
+
+    The model usually restarts with the whitespace it was cut off in; when it does not, the kept suffix
+    still separates the two parts. Works piece by piece, so streamed and final text agree.
+    """
+    for piece in pieces:
+        if suffix:
+            matched = 0
+            while matched < min(len(suffix), len(piece)) and piece[matched] == suffix[matched]:
+                matched += 1
+            if matched == len(piece):
+                suffix = suffix[matched:]
+                continue
+            piece = piece[matched:]
+            suffix = ""
+        if piece:
+            yield piece
+
+def request_markdown(session: ConverterSession, request: dict, estimated_tokens: int,
+                     on_text: Optional[TextCallback] = None,
+                     on_restart: Optional[TextCallback] = None,
+                     stream: bool = STREAM_RESPONSES,
+                     max_continuations: int = MAX_CONTINUATIONS,
+                     metrics: Optional[Dict] = None) -> str:
+    """
+    Send a Messages API request through the session's scheduler and return the full response text.
+
+    request holds the messages.create arguments (model, max_tokens, messages, ...).
+    on_text receives each piece of text as it arrives. on_restart is called at the start
+    of every attempt with the text that is still valid (empty unless continuing), so a
+    listener can drop whatever a failed or retried attempt had already produced.
+    metrics, if given, collects latency, time to first token, token usage, retries,
+    continuations and the final stop_reason across all requests made.
+
+    Raises OutputLimitError (carrying the text so far) if the response is still cut off
+    after max_continuations follow-ups.
+    """
+    client = session.client
+    metrics = metrics if metrics is not None else {}
+    text = ""
+
+    for continuation in range(max_continuations + 1):
+        messages = list(request['messages'])
+        prefill = text
+        suffix = ""
+        if text:
+            # The API rejects an assistant prefill that ends in whitespace, so that whitespace is kept here
+            # instead of sent - dropping it would merge paragraphs or table rows at the join
+            sent = text.rstrip()
+            suffix = text[len(sent):]
+            messages.append({"role": "assistant", "content": sent})
+        timing = {}
+
+        def send_request():
+            timing['started'] = time.monotonic()
+            timing.pop('first_text', None)
+            if on_restart is not None:
+                on_restart(prefill)
+            if not stream:
+                message = client.messages.create(**dict(request, messages=messages))
+                timing['first_text'] = time.monotonic()
+                if on_text is not None:
+                    on_text("".join(_drop_overlap(suffix, [block.text for block in message.content
+                                                           if block.type == "text"])))
+                return message
+            with client.messages.stream(**dict(request, messages=messages)) as response:
+                for piece in _drop_overlap(suffix, response.text_stream):
+                    timing.setdefault('first_text', time.monotonic())
+                    if on_text is not None:
+                        on_text(piece)
+                return response.get_final_message()
+
+        attempt_tokens = estimated_tokens + len(prefill) // CHARS_PER_TOKEN
+        message = session.scheduler.call(send_request, attempt_tokens, stats=metrics)
+        finished = time.monotonic()
+
+        # Cache reads don't count against the input-token limit; cache writes do
+        usage = message.usage
+        cache_creation_tokens = getattr(usage, 'cache_creation_input_tokens', 0) or 0
+        cache_read_tokens = getattr(usage, 'cache_read_input_tokens', 0) or 0
+        session.scheduler.record_usage(attempt_tokens, usage.input_tokens + cache_creation_tokens)
+
+        metrics['api_latency'] = metrics.get('api_latency', 0.0) + finished - timing['started']
+        if continuation == 0:
+            metrics['ttft'] = timing.get('first_text', finished) - timing['started']
+        for key, value in (('input_tokens', usage.input_tokens), ('output_tokens', usage.output_tokens),
+                           ('cache_creation_input_tokens', cache_creation_tokens),
+                           ('cache_read_input_tokens', cache_read_tokens)):
+            metrics[key] = metrics.get(key, 0) + value
+        metrics['continuations'] = continuation
+        metrics['stop_reason'] = message.stop_reason
+
+        text = prefill + "".join(_drop_overlap(suffix, [block.text for block in message.content
+                                                        if block.type == "text"]))
+        if message.stop_reason != "max_tokens":
+            return text
+        if continuation < max_continuations:
+            print(f"  [CONTINUE] Response stopped at max_tokens - requesting continuation {continuation + 1}/{max_continuations}")
+
+    raise OutputLimitError(text, f"response still stopped at max_tokens after {max_continuations} continuations")
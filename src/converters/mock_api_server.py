@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Mock API Server
+Purpose: Local stand-in for the Anthropic Messages API endpoint, for repeatable offline benchmarks
+Strategy: http.server answers POST /v1/messages (plain JSON or SSE stream) from a cassette of recorded
+          responses, falling back to the local backend's text-layer Markdown; latency, 5xx errors and
+          429s are injected from seeded random distributions. Record mode forwards to the real API and
+          appends every response to the cassette
+"""
+
+import hashlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from config.settings import CHARS_PER_TOKEN
+from .local_backend import LocalMessagesClient
+
+STREAM_PIECE_CHARS = 40  # Text per content_block_delta event
+
+@dataclass
+class MockBehaviour:
+    """How the mock server misbehaves; all sleeps are divided by time_scale"""
+    first_token_median: float = 1.5   # Seconds to first token (log-normal median)
+    first_token_sigma: float = 0.4    # Log-normal spread of time to first token
+    tokens_per_second: float = 60.0   # Output generation speed
+    error_rate: float = 0.0           # Fraction of requests answered 529 overloaded / 500
+    rate_limit_rate: float = 0.0      # Fraction of requests answered 429 with retry-after
+    retry_after: float = 1.0          # Seconds sent in the 429 retry-after header
+    time_scale: float = 1.0           # >1 runs the simulated latencies faster
+    seed: Optional[int] = None
+
+def cassette_key(body: Dict) -> str:
+    """Request identity for replay: model, max_tokens and messages, with documents reduced to their hash"""
+    def strip(block):
+        if isinstance(block, dict) and block.get("type") == "document":
+            data = block.get("source", {}).get("data", "")
+            return {"type": "document", "sha256": hashlib.sha256(data.encode('utf-8')).hexdigest()}
+        return block
+
+    messages = []
+    for message in body.get("messages", []):
+        content = message["content"]
+        if isinstance(content, list):
+            content = [strip(block) for block in content]
+        messages.append({"role": message["role"], "content": content})
+    identity = {"model": body.get("model"), "max_tokens": body.get("max_tokens"), "messages": messages}
+    return hashlib.sha256(json.dumps(identity, sort_keys=True).encode('utf-8')).hexdigest()
+
+class Cassette:
+    """Recorded responses by request key, stored as JSONL; repeated keys replay their responses in turn"""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._responses: Dict[str, List[Dict]] = {}
+        self._next: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._responses.setdefault(entry['key'], []).append(entry['response'])
+
+    def __len__(self) -> int:
+        return sum(len(responses) for responses in self._responses.values())
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            responses = self._responses.get(key)
+            if not responses:
+                return None
+            index = self._next.get(key, 0)
+            self._next[key] = index + 1
+            return responses[index % len(responses)]
+
+    def add(self, key: str, response: Dict):
+        with self._lock:
+            self._responses.setdefault(key, []).append(response)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({'key': key, 'response': response}) + "\n")
+
+def _message_json(message, model: str) -> Dict:
+    """Messages API response body for a local backend message"""
+    usage = message.usage
+    return {
+        "id": f"msg_mock_{uuid.uuid4().hex[:24]}",
+        "type": "message",
+        "role": "assistant",
+        "model": model,
+        "content": [{"type": "text", "text": block.text} for block in message.content],
+        "stop_reason": message.stop_reason,
+        "stop_sequence": None,
+        "usage": {
+            "input_tokens": usage.input_tokens,
+            "output_tokens": usage.output_tokens,
+            "cache_creation_input_tokens": usage.cache_creation_input_tokens,
+            "cache_read_input_tokens": usage.cache_read_input_tokens,
+        },
+    }
+
+class MockAPIServer:
+    """Threaded local Messages API; use as a context manager or call start()/stop()"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, behaviour: Optional[MockBehaviour] = None,
+                 cassette: Optional[str] = None, record: bool = False):
+        self.behaviour = behaviour or MockBehaviour()
+        self.cassette = Cassette(cassette) if cassette else None
+        self.record = record
+        if record and self.cassette is None:
+            raise ValueError("Record mode needs a cassette path")
+        self.stats = {'requests': 0, 'replayed': 0, 'synthesised': 0, 'recorded': 0, 'errors': 0, 'rate_limited': 0}
+
+        self._random = random.Random(self.behaviour.seed)
+        self._lock = threading.Lock()
+        self._backend = LocalMessagesClient()
+        self._upstream = None
+        self._thread = None
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'MockAPIServer':
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _roll(self) -> float:
+        with self._lock:
+            return self._random.random()
+
+    def _first_token_delay(self) -> float:
+        behaviour = self.behaviour
+        with self._lock:
+            delay = behaviour.first_token_median * self._random.lognormvariate(0, behaviour.first_token_sigma)
+        return delay / behaviour.time_scale
+
+    def _token_delay(self, text: str) -> float:
+        tokens = max(1, len(text) // CHARS_PER_TOKEN)
+        return tokens / self.behaviour.tokens_per_second / self.behaviour.time_scale
+
+    def respond(self, body: Dict) -> Dict:
+        """Response body for a request: recorded, replayed or synthesised from the text layer"""
+        key = cassette_key(body)
+        if self.record:
+            if self._upstream is None:
+                import anthropic
+                self._upstream = anthropic.Anthropic()
+            request = {name: value for name, value in body.items() if name != "stream"}
+            response = self._upstream.messages.create(**request).model_dump(mode="json")
+            self.cassette.add(key, response)
+            self._count('recorded')
+            return response
+
+        if self.cassette is not None:
+            response = self.cassette.get(key)
+            if response is not None:
+                self._count('replayed')
+                return response
+
+        self._count('synthesised')
+        message = self._backend.respond(body["model"], body["max_tokens"], body["messages"])
+        return _message_json(message, body["model"])
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-alive, like the real endpoint
+
+            def log_message(self, format, *args):
+                pass  # Benchmarks would drown in access logs
+
+            def _send_json(self, status: int, payload: Dict, headers: Optional[Dict] = None):
+                data = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _send_event(self, event: str, payload: Dict):
+                data = f"event: {event}\ndata: {json.dumps(payload)}\n\n".encode('utf-8')
+                self.wfile.write(f"{len(data):x}\r\n".encode('ascii') + data + b"\r\n")
+                self.wfile.flush()
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                if self.path.split("?")[0] != "/v1/messages":
+                    self._send_json(404, {"type": "error", "error": {"type": "not_found_error", "message": self.path}})
+                    return
+                server._count('requests')
+
+                # Failures come before any latency, like a busy gateway turning requests away
+                behaviour = server.behaviour
+                roll = server._roll()
+                if roll < behaviour.rate_limit_rate:
+                    server._count('rate_limited')
+                    self._send_json(429, {"type": "error", "error": {"type": "rate_limit_error", "message": "Mock rate limit"}},
+                                    {"retry-after": f"{behaviour.retry_after / behaviour.time_scale:g}"})
+                    return
+                if roll < behaviour.rate_limit_rate + behaviour.error_rate:
+                    server._count('errors')
+                    if server._roll() < 0.5:
+                        self._send_json(529, {"type": "error", "error": {"type": "overloaded_error", "message": "Overloaded"}})
+                    else:
+                        self._send_json(500, {"type": "error", "error": {"type": "api_error", "message": "Internal server error"}})
+                    return
+
+                try:
+                    response = server.respond(body)
+                except Exception as e:
+                    self._send_json(500, {"type": "error", "error": {"type": "api_error", "message": str(e)}})
+                    return
+
+                time.sleep(server._first_token_delay())
+                text = "".join(block.get("text", "") for block in response["content"])
+                if not body.get("stream"):
+                    time.sleep(server._token_delay(text))
+                    self._send_json(200, response)
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+
+                usage = response["usage"]
+                start_message = dict(response, content=[], stop_reason=None,
+                                     usage=dict(usage, output_tokens=1))
+                self._send_event("message_start", {"type": "message_start", "message": start_message})
+                self._send_event("content_block_start", {"type": "content_block_start", "index": 0,
+                                                         "content_block": {"type": "text", "text": ""}})
+                for start in range(0, len(text), STREAM_PIECE_CHARS):
+                    piece = text[start:start + STREAM_PIECE_CHARS]
+                    if start:
+                        time.sleep(server._token_delay(piece))
+                    self._send_event("content_block_delta", {"type": "content_block_delta", "index": 0,
+                                                             "delta": {"type": "text_delta", "text": piece}})
+                self._send_event("content_block_stop", {"type": "content_block_stop", "index": 0})
+                self._send_event("message_delta", {"type": "message_delta",
+                                                   "delta": {"stop_reason": response["stop_reason"], "stop_sequence": None},
+                                                   "usage": {"output_tokens": usage["output_tokens"]}})
+                self._send_event("message_stop", {"type": "message_stop"})
+                self.wfile.write(b"0\r\n\r\n")
+                self.wfile.flush()
+
+        return Handler
+
+def parse_behaviour(options: Dict[str, str]) -> MockBehaviour:
+    """MockBehaviour from --key=value CLI options (latency, sigma, tps, error-rate, rate-limit-rate, ...)"""
+    behaviour = MockBehaviour()
+    fields = {
+        'latency': 'first_token_median',
+        'sigma': 'first_token_sigma',
+        'tps': 'tokens_per_second',
+        'error-rate': 'error_rate',
+        'rate-limit-rate': 'rate_limit_rate',
+        'retry-after': 'retry_after',
+        'time-scale': 'time_scale',
+    }
+    for option, field in fields.items():
+        if option in options:
+            setattr(behaviour, field, float(options[option]))
+    if 'seed' in options:
+        behaviour.seed = int(options['seed'])
+    return behaviour
+
+def parse_options(argv: List[str]) -> Dict[str, str]:
+    """--key=value arguments as a dict (bare --flags map to "")"""
+    options = {}
+    for arg in argv:
+        if arg.startswith('--'):
+            name, _, value = arg[2:].partition('=')
+            options[name] = value
+    return options
+
+def main():
+    """
+    Run the mock server until interrupted.
+
+    Usage: [--port=8765] [--cassette=FILE] [--record] [--latency=1.5] [--sigma=0.4] [--tps=60]
+           [--error-rate=0.0] [--rate-limit-rate=0.0] [--retry-after=1] [--time-scale=1] [--seed=N]
+
+    Point a converter at it with ANTHROPIC_BASE_URL=http://127.0.0.1:<port>.
+    """
+    options = parse_options(sys.argv[1:])
+    record = 'record' in options
+    if record and not os.environ.get('ANTHROPIC_API_KEY'):
+        print("[ERROR] Record mode forwards requests to the real API and needs ANTHROPIC_API_KEY")
+        sys.exit(1)
+
+    try:
+        server = MockAPIServer(port=int(options.get('port', 8765)), behaviour=parse_behaviour(options),
+                               cassette=options.get('cassette') or None, record=record)
+    except (ValueError, OSError) as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+
+    print("MOCK ANTHROPIC MESSAGES API")
+    print("-" * 50)
+    print(f"Listening on {server.base_url}/v1/messages")
+    if server.cassette is not None:
+        mode = "recording to" if record else "replaying"
+        print(f"Cassette: {mode} {server.cassette.path} ({len(server.cassette)} responses)")
+    print(f"[INFO] Set ANTHROPIC_BASE_URL={server.base_url} to send a converter here")
+
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._server.server_close()
+        print(f"\n[OK] Served {server.stats['requests']} requests: {server.stats}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Model Profiles
+Purpose: Describe each conversion model once - model id, prompt, output budget and chunk policy
+Strategy: Named registry of frozen profiles that the conversion engine looks up by name
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple, Union
+
+# Prompt caching prices relative to the base input price (5-minute cache)
+CACHE_WRITE_PRICE_FACTOR = 1.25
+CACHE_READ_PRICE_FACTOR = 0.1
+
+@dataclass(frozen=True)
+class ConversionProfile:
+    """Everything that differs between one model's conversion and another's"""
+    name: str
+    model: str
+    prompt_template: str                  # Formatted with start_page, end_page, total_pages
+    max_tokens: int = 8192
+    pages_per_chunk: Union[int, str] = 5  # Or "auto" for budget-based chunks
+    output_suffix: str = ""               # Output/journal file tag; defaults to the profile name
+    title: str = "PDF to Markdown Converter using Anthropic API"
+    banner_notes: Tuple[str, ...] = ()    # Extra lines printed under the CLI title
+    summary_notes: Tuple[str, ...] = ()   # Extra lines printed after a successful run
+    escalation_profile: Optional[str] = None  # Cascade mode re-sends low-fidelity chunks to this profile
+    input_price: float = 0.0              # USD per million input tokens (for cost estimates)
+    output_price: float = 0.0             # USD per million output tokens
+
+    @property
+    def file_tag(self) -> str:
+        return self.output_suffix or self.name
+
+    def estimate_cost(self, input_tokens: int, output_tokens: int,
+                      cache_creation_tokens: int = 0, cache_read_tokens: int = 0) -> float:
+        """Estimated USD for one request's usage; prompt-cache writes and reads are priced off the input rate"""
+        input_cost = (input_tokens + cache_creation_tokens * CACHE_WRITE_PRICE_FACTOR
+                      + cache_read_tokens * CACHE_READ_PRICE_FACTOR) * self.input_price
+        return (input_cost + output_tokens * self.output_price) / 1_000_000
+
+    def build_prompt(self, chunk_info: dict) -> str:
+        return self.prompt_template.format(start_page=chunk_info['start_page'],
+                                           end_page=chunk_info['end_page'],
+                                           total_pages=chunk_info['total_pages'])
+
+SONNET_PROMPT = "Convert this PDF excerpt (pages {start_page}-{end_page} of {total_pages}) to clean, well-formatted Markdown. Preserve the document structure including headings, lists, tables, and any important formatting. Make sure the output is properly formatted Markdown that can be rendered correctly. Do not add any introductory text about this being a partial document."
+
+HAIKU_PROMPT = "Convert this PDF excerpt (pages {start_page}-{end_page} of {total_pages}) to complete, well-formatted Markdown. \n\nIMPORTANT: Extract ALL text content from every page - do not skip any paragraphs, sentences, or sections. Include every piece of body text, headings, subheadings, quotes, lists, and captions. \n\nYou may streamline the formatting by:\n- Simplifying complex layouts to clean Markdown\n- Removing excessive whitespace or decorative elements\n- Using standard Markdown headers (# ## ###) consistently\n\nBut you MUST preserve:\n- Every word of actual content\n- All headings and subheadings\n- All body paragraphs and text blocks\n- All quotes, lists, and important text\n- Document structure and flow\n\nDo not summarize, condense, or skip any text content. The goal is complete content extraction with clean formatting. Do not add any introductory text about this being a partial document."
+
+PROFILES: Dict[str, ConversionProfile] = {}
+
+def register_profile(profile: ConversionProfile) -> ConversionProfile:
+    """Add (or replace) a profile so the engine and CLI can use it by name"""
+    PROFILES[profile.name] = profile
+    return profile
+
+def get_profile(profile: Union[str, ConversionProfile]) -> ConversionProfile:
+    """Look up a profile by name; profile objects are passed through unchanged"""
+    if isinstance(profile, ConversionProfile):
+        return profile
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown profile '{profile}'. Available profiles: {', '.join(sorted(PROFILES))}")
+    return PROFILES[profile]
+
+register_profile(ConversionProfile(
+    name="sonnet",
+    model="claude-sonnet-4-20250514",
+    prompt_template=SONNET_PROMPT,
+    title="PDF to Markdown Converter (Sonnet) using Anthropic API",
+    input_price=3.0,
+    output_price=15.0,
+))
+
+register_profile(ConversionProfile(
+    name="haiku",
+    model="claude-3-5-haiku-latest",  # Using latest Haiku model
+    prompt_template=HAIKU_PROMPT,
+    title="PDF to Markdown Converter (Haiku - Fast Mode) using Anthropic API",
+    banner_notes=("[INFO] Using Claude 3.5 Haiku for faster, more economical conversion",),
+    summary_notes=("[INFO] Used Haiku model for ~10x faster and cheaper conversion",),
+    escalation_profile="sonnet",
+    input_price=0.8,
+    output_price=4.0,
+))
+
+# Original Sonnet converter settings: same model and prompt, larger chunks
+register_profile(ConversionProfile(
+    name="sonnet_old",
+    model="claude-sonnet-4-20250514",
+    prompt_template=SONNET_PROMPT,
+    pages_per_chunk=10,
+    output_suffix="sonnet",
+    title="PDF to Markdown Converter (Sonnet) using Anthropic API",
+    input_price=3.0,
+    output_price=15.0,
+))
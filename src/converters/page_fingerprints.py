@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Page Fingerprints
+Purpose: Recognise pages already converted or OCR'd in earlier documents (covers, boilerplate, appendices)
+Strategy: Hash each page's content stream plus its resources, hashing each shared resource object once per
+          document; scanned pages get a perceptual hash of the rendered page. A SQLite index maps fingerprints to
+          stored Markdown and OCR text, which a perceptual match only reuses when the exact content hash agrees
+"""
+
+import hashlib
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from config.settings import PAGE_INDEX_DIR
+from ..utils.pdf_document import MUPDF_LOCK, PdfArg, use_document
+from .pdf_chunking import page_content_bytes
+
+# Keys that point back up the page tree; following them would hash the whole document
+_SKIPPED_KEYS = {'/Parent', '/P', '/StructParents', '/StructParent'}
+_MAX_DEPTH = 12
+
+# Digests of indirect objects, keyed by (object number, depth) - valid for one document only
+DigestMemo = Dict[Tuple[int, int], bytes]
+
+def _hash_object(obj, digest, visiting: Set[int], depth: int = 0, memo: Optional[DigestMemo] = None) -> bool:
+    """
+    Feed a PDF object into the digest: dict keys sorted, streams by decoded data, references resolved.
+
+    A referenced object goes in as its own digest, which memo keeps so fonts and images shared by many
+    pages are decoded and hashed once. Returns False when a reference cycle was cut short: that digest
+    depends on where hashing started, so it is not memoized.
+    """
+    if depth > _MAX_DEPTH:
+        return True
+    import PyPDF2  # Already loaded by whoever read the page; kept out of module import for CLI startup
+    if isinstance(obj, PyPDF2.generic.IndirectObject):
+        if obj.idnum in visiting:
+            digest.update(b'<cycle>')
+            return False
+        memo_key = (obj.idnum, depth)
+        object_digest = memo.get(memo_key) if memo is not None else None
+        complete = True
+        if object_digest is None:
+            object_hash = hashlib.sha256()
+            visiting.add(obj.idnum)
+            complete = _hash_object(obj.get_object(), object_hash, visiting, depth + 1, memo)
+            visiting.discard(obj.idnum)
+            object_digest = object_hash.digest()
+            if complete and memo is not None:
+                memo[memo_key] = object_digest
+        digest.update(b'<ref>' + object_digest)
+        return complete
+    complete = True
+    if isinstance(obj, PyPDF2.generic.StreamObject):
+        digest.update(b'<stream>')
+        try:
+            digest.update(obj.get_data())
+        except Exception:
+            digest.update(obj._data or b'')  # Filter PyPDF2 cannot decode; the raw bytes identify it just as well
+    if isinstance(obj, dict):
+        digest.update(b'<<')
+        for key in sorted(obj.keys()):
+            if key in _SKIPPED_KEYS:
+                continue
+            digest.update(str(key).encode('utf-8'))
+            complete &= _hash_object(obj[key] if not isinstance(obj, PyPDF2.generic.DictionaryObject)
+                                     else obj.raw_get(key), digest, visiting, depth + 1, memo)
+        digest.update(b'>>')
+    elif isinstance(obj, list):
+        digest.update(b'[')
+        for item in obj:
+            complete &= _hash_object(item, digest, visiting, depth + 1, memo)
+        digest.update(b']')
+    elif not isinstance(obj, PyPDF2.generic.StreamObject):
+        digest.update(repr(obj).encode('utf-8'))
+    return complete
+
+def content_fingerprint(page, memo: Optional[DigestMemo] = None) -> str:
+    """
+    Exact fingerprint of a page's content stream and everything its resources reference.
+
+    Pass the same memo for every page of one document so shared resources are hashed once.
+    """
+    digest = hashlib.sha256(page_content_bytes(page))
+    if '/Resources' in page:
+        _hash_object(page.raw_get('/Resources'), digest, set(), 0, memo)
+    return "sha256:" + digest.hexdigest()
+
+def is_perceptual(fingerprint: str) -> bool:
+    """Perceptual fingerprints can collide for near-identical scans, so their matches need confirming"""
+    return fingerprint.startswith("dhash:")
+
+def _is_scanned(page, text: Optional[str] = None) -> bool:
+    """No text layer but at least one image: a scan, where re-scans differ byte-wise but not visually"""
+    resources = page['/Resources'] if '/Resources' in page else {}
+    xobjects = resources['/XObject'] if '/XObject' in resources else {}
+    has_image = any(xobjects[name].get_object().get('/Subtype') == '/Image' for name in xobjects)
+    if text is None:
+        text = page.extract_text() or ""
+    return has_image and not text.strip()
+
+def perceptual_fingerprint(fitz_page, hash_width: int = 33, hash_height: int = 32) -> str:
+    """
+    Difference hash (dHash) of the rendered page: brighter-than-right-neighbour bits on a grid.
+
+    The usual 9x8 grid is too coarse for pages of text (any two body-text pages look alike),
+    so a 33x32 grid (1024 bits) is used and only exact matches count.
+    """
+    import fitz  # PyMuPDF, only needed for scanned pages
+
+    scale = (hash_width * 8) / fitz_page.rect.width
+    pix = fitz_page.get_pixmap(matrix=fitz.Matrix(scale, scale), colorspace=fitz.csGRAY, alpha=False)
+
+    def bounds(index: int, count: int, size: int):
+        start = index * size // count
+        return start, min(size, max(start + 1, (index + 1) * size // count))
+
+    # Average-pool the small render down to the hash grid
+    samples = pix.samples
+    cells = []
+    for row in range(hash_height):
+        y0, y1 = bounds(row, hash_height, pix.height)
+        for col in range(hash_width):
+            x0, x1 = bounds(col, hash_width, pix.width)
+            total = sum(sum(samples[y * pix.stride + x0:y * pix.stride + x1]) for y in range(y0, y1))
+            cells.append(total / max(1, (y1 - y0) * (x1 - x0)))
+
+    bits = 0
+    for row in range(hash_height):
+        for col in range(hash_width - 1):
+            left = cells[row * hash_width + col]
+            right = cells[row * hash_width + col + 1]
+            bits = (bits << 1) | (1 if left > right else 0)
+    return f"dhash:{bits:0{(hash_width - 1) * hash_height // 4}x}"
+
+def pdf_page_signatures(pdf: PdfArg) -> List[Tuple[str, str]]:
+    """
+    (fingerprint, content hash) of every page of a PDF (path or shared PDFDocument), in page order.
+
+    The two are the same except on scans, whose fingerprint is perceptual; the content hash is what
+    confirms a perceptual match before stored Markdown or OCR text is reused.
+    """
+    signatures = []
+    memo: DigestMemo = {}  # Lives as long as this pass over the document
+    with use_document(pdf) as document:
+        for page_num, page in enumerate(document.reader.pages):
+            fingerprint = None
+            # The text check goes through the document, so validation reuses the extracted text
+            text = document.page_text(page_num)
+            with document.reader_lock:
+                scanned = _is_scanned(page, text)
+            if scanned:
+                try:
+                    with MUPDF_LOCK:
+                        fingerprint = perceptual_fingerprint(document.fitz[page_num])
+                except ImportError:
+                    pass  # Without PyMuPDF scans fall back to the exact hash
+            with document.reader_lock:
+                content_hash = content_fingerprint(page, memo)
+            signatures.append((fingerprint or content_hash, content_hash))
+    return signatures
+
+def pdf_page_fingerprints(pdf: PdfArg) -> List[str]:
+    """Fingerprint every page of a PDF (path or shared PDFDocument), in page order"""
+    return [fingerprint for fingerprint, _ in pdf_page_signatures(pdf)]
+
+def _confirmed(fingerprint: str, stored_hash: Optional[str], content_hash: Optional[str]) -> bool:
+    return not is_perceptual(fingerprint) or (stored_hash is not None and stored_hash == content_hash)
+
+class PageFingerprintIndex:
+    """Fingerprints seen across documents, with the Markdown (per output tag) and OCR text stored for them"""
+
+    DB_NAME = "pages.sqlite3"
+
+    def __init__(self, index_dir: str = PAGE_INDEX_DIR):
+        self.index_dir = Path(index_dir)
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.index_dir / self.DB_NAME
+
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS page_sources ("
+                " fingerprint TEXT NOT NULL,"
+                " source_sha256 TEXT NOT NULL,"
+                " source_path TEXT,"
+                " PRIMARY KEY (fingerprint, source_sha256))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS page_markdown ("
+                " fingerprint TEXT NOT NULL,"
+                " output_tag TEXT NOT NULL,"
+                " markdown TEXT NOT NULL,"
+                " content_sha256 TEXT,"
+                " PRIMARY KEY (fingerprint, output_tag))"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS page_ocr (fingerprint TEXT PRIMARY KEY, text TEXT NOT NULL,"
+                         " content_sha256 TEXT)")
+            # Indexes written before matches were confirmed lack the column; their perceptual rows never confirm
+            for table in ('page_markdown', 'page_ocr'):
+                columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+                if 'content_sha256' not in columns:
+                    conn.execute(f"ALTER TABLE {table} ADD COLUMN content_sha256 TEXT")
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        # A short-lived connection per call keeps this usable from worker threads and processes
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA busy_timeout=30000")
+        return conn
+
+    def _select_many(self, query: str, fingerprints: List[str], *params) -> Dict[str, object]:
+        results = {}
+        unique = sorted(set(fingerprints))
+        conn = self._connect()
+        try:
+            # Stay under SQLite's bound-parameter limit on long documents
+            for start in range(0, len(unique), 500):
+                batch = unique[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                for row in conn.execute(query.format(placeholders=placeholders), (*params, *batch)):
+                    results[row[0]] = row[1] if len(row) == 2 else row[1:]
+        finally:
+            conn.close()
+        return results
+
+    def register_document(self, fingerprints: List[str], source_sha256: str, source_path: str = "") -> Set[str]:
+        """
+        Record which pages this document contains; returns the fingerprints that also occur in
+        another document, or more than once in this one. Re-registering the same file changes nothing.
+        """
+        seen_elsewhere = self._select_many("SELECT DISTINCT fingerprint, 1 FROM page_sources"
+                                           " WHERE source_sha256 != ? AND fingerprint IN ({placeholders})",
+                                           fingerprints, source_sha256)
+        counts = {}
+        for fingerprint in fingerprints:
+            counts[fingerprint] = counts.get(fingerprint, 0) + 1
+
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT OR IGNORE INTO page_sources (fingerprint, source_sha256, source_path) VALUES (?, ?, ?)",
+                [(fingerprint, source_sha256, source_path) for fingerprint in counts]
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+        return {fingerprint for fingerprint, count in counts.items() if count > 1 or fingerprint in seen_elsewhere}
+
+    def get_markdown(self, fingerprints: List[str], output_tag: str) -> Dict[str, str]:
+        """Stored Markdown for whichever of these fingerprints have it"""
+        return self._select_many("SELECT fingerprint, markdown FROM page_markdown"
+                                 " WHERE output_tag = ? AND fingerprint IN ({placeholders})",
+                                 fingerprints, output_tag)
+
+    def reusable_markdown(self, signatures: List[Tuple[str, str]], output_tag: str) -> Dict[int, str]:
+        """
+        Stored Markdown by 0-based page number, for the pages of pdf_page_signatures() that can reuse it.
+        A perceptual match only counts when the stored page had the same content hash.
+        """
+        stored = self._select_many("SELECT fingerprint, markdown, content_sha256 FROM page_markdown"
+                                   " WHERE output_tag = ? AND fingerprint IN ({placeholders})",
+                                   [fingerprint for fingerprint, _ in signatures], output_tag)
+        reusable = {}
+        for page_num, (fingerprint, content_hash) in enumerate(signatures):
+            if fingerprint in stored:
+                markdown_text, stored_hash = stored[fingerprint]
+                if _confirmed(fingerprint, stored_hash, content_hash):
+                    reusable[page_num] = markdown_text
+        return reusable
+
+    def put_markdown(self, fingerprint: str, output_tag: str, markdown_text: str,
+                     content_sha256: Optional[str] = None):
+        conn = self._connect()
+        try:
+            conn.execute("INSERT OR REPLACE INTO page_markdown (fingerprint, output_tag, markdown, content_sha256)"
+                         " VALUES (?, ?, ?, ?)", (fingerprint, output_tag, markdown_text, content_sha256))
+        finally:
+            conn.close()
+
+    def get_ocr_text(self, fingerprint: str, content_sha256: Optional[str] = None) -> Optional[str]:
+        """Stored OCR text; a perceptual fingerprint also needs the page's content hash to match"""
+        row = self._select_many("SELECT fingerprint, text, content_sha256 FROM page_ocr"
+                                " WHERE fingerprint IN ({placeholders})", [fingerprint]).get(fingerprint)
+        if row is None or not _confirmed(fingerprint, row[1], content_sha256):
+            return None
+        return row[0]
+
+    def put_ocr_text(self, fingerprint: str, text: str, content_sha256: Optional[str] = None):
+        conn = self._connect()
+        try:
+            conn.execute("INSERT OR REPLACE INTO page_ocr (fingerprint, text, content_sha256) VALUES (?, ?, ?)",
+                         (fingerprint, text, content_sha256))
+        finally:
+            conn.close()
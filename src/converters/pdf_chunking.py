@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+PDF Chunking
+Purpose: Split a PDF into page-range chunks for the converters
+Strategy: Build each chunk lazily from one open reader so only in-flight chunks are held in memory;
+          optionally pack pages into chunks by estimated request size instead of a fixed page count
+"""
+
+import hashlib
+import io
+import os
+import re
+import sys
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Set, Tuple, Union
+
+from config.settings import (
+    CHARS_PER_TOKEN,
+    CHUNK_MAX_INPUT_BYTES,
+    CHUNK_MAX_OUTPUT_TOKENS,
+    CHUNK_MAX_PAGES,
+    CHUNK_COMPRESS_STREAMS,
+    CHUNK_PRUNE_RESOURCES,
+    SCANNED_PAGE_OUTPUT_TOKENS,
+)
+
+if TYPE_CHECKING:
+    # PyPDF2 itself is imported where pages are read, keeping it out of CLI startup
+    import PyPDF2
+    from PyPDF2.generic import DictionaryObject, IndirectObject
+    from ..utils.pdf_document import PDFDocument
+    from .split_backends import SplitDocument
+
+# Pass as pages_per_chunk to size chunks by budget instead of page count
+ADAPTIVE_CHUNKING = "auto"
+
+# Kinds of page run
+LOCAL_RUN = "local"        # Markdown already available, no API call
+ISOLATED_RUN = "isolated"  # Always a chunk of its own (e.g. so its Markdown can be stored per page)
+API_RUN = "api"            # Ordinary pages, split by pages_per_chunk
+
+# Resource categories whose entries are only reachable by name from the content stream
+PRUNABLE_RESOURCES = ('/Font', '/XObject', '/ExtGState', '/ColorSpace', '/Pattern', '/Shading', '/Properties')
+NAME_TOKEN = re.compile(rb'/([^\s/\[\]()<>{}%]+)')
+NAME_ESCAPE = re.compile(r'#([0-9a-fA-F]{2})')
+
+def page_content_bytes(page) -> bytes:
+    """Decoded content stream of a page, joining multi-stream contents"""
+    contents = page.get_contents()
+    if contents is None:
+        return b''
+    from PyPDF2.generic import ArrayObject
+    if isinstance(contents, ArrayObject):
+        return b'\n'.join(stream.get_object().get_data() for stream in contents)
+    return contents.get_data()
+
+def page_cost(content_bytes: int, image_count: int, image_bytes: int, text_chars: int) -> Dict:
+    """Request cost of a page from its measurements, whichever library took them"""
+    # Markdown is roughly the text layer plus formatting; scans have no text layer to measure
+    if text_chars > 0:
+        output_tokens = int(text_chars / CHARS_PER_TOKEN * 1.2)
+    elif image_count > 0:
+        output_tokens = SCANNED_PAGE_OUTPUT_TOKENS
+    else:
+        output_tokens = 50
+
+    return {
+        'input_bytes': content_bytes + image_bytes,
+        'image_count': image_count,
+        'text_chars': text_chars,
+        'output_tokens': output_tokens,
+    }
+
+def estimate_page_cost(page) -> Dict:
+    """Estimate what one PyPDF2 page adds to a request: upload bytes, images, text layer and output tokens"""
+    content_bytes = len(page_content_bytes(page))
+
+    image_count = 0
+    image_bytes = 0
+    resources = page['/Resources'] if '/Resources' in page else {}
+    xobjects = resources['/XObject'] if '/XObject' in resources else {}
+    for name in xobjects:
+        xobject = xobjects[name]
+        if '/Subtype' in xobject and xobject['/Subtype'] == '/Image':
+            image_count += 1
+            image_bytes += int(xobject['/Length']) if '/Length' in xobject else 0
+
+    try:
+        text_chars = len((page.extract_text() or "").strip())
+    except Exception:
+        text_chars = 0
+
+    return page_cost(content_bytes, image_count, image_bytes, text_chars)
+
+def plan_chunks(page_costs: List[Dict], max_input_bytes: int = CHUNK_MAX_INPUT_BYTES,
+                max_output_tokens: int = CHUNK_MAX_OUTPUT_TOKENS,
+                max_pages: int = CHUNK_MAX_PAGES) -> List[Tuple[int, int]]:
+    """
+    Greedily pack consecutive pages into chunks that stay within every budget.
+
+    Returns 0-based (start, end) page ranges with end exclusive. A single page
+    that exceeds a budget on its own still gets a chunk of its own.
+    """
+    ranges = []
+    start = 0
+    input_bytes = 0
+    output_tokens = 0
+
+    for page_num, cost in enumerate(page_costs):
+        pages_in_chunk = page_num - start
+        if pages_in_chunk > 0 and (
+            pages_in_chunk >= max_pages
+            or input_bytes + cost['input_bytes'] > max_input_bytes
+            or output_tokens + cost['output_tokens'] > max_output_tokens
+        ):
+            ranges.append((start, page_num))
+            start = page_num
+            input_bytes = 0
+            output_tokens = 0
+
+        input_bytes += cost['input_bytes']
+        output_tokens += cost['output_tokens']
+
+    if start < len(page_costs):
+        ranges.append((start, len(page_costs)))
+
+    return ranges
+
+def _content_names(page) -> Set[str]:
+    """Every /Name token in the page's content stream - a superset of the resources it draws with"""
+    names = set()
+    for token in NAME_TOKEN.findall(page_content_bytes(page)):
+        names.add('/' + NAME_ESCAPE.sub(lambda m: chr(int(m.group(1), 16)), token.decode('latin-1')))
+    return names
+
+def _shared_image(value, image_copies: Dict[str, 'IndirectObject']):
+    """Return the first byte-identical copy of an image seen in this chunk, so it is embedded once"""
+    from PyPDF2.generic import IndirectObject
+    if not isinstance(value, IndirectObject):
+        return value
+    image = value.get_object()
+    if '/Subtype' not in image or image['/Subtype'] != '/Image':
+        return value
+    digest = hashlib.sha256(image._data or b'')
+    for key in sorted(image.keys()):
+        if key != '/Length':
+            digest.update(f"{key}={image.raw_get(key)!r};".encode('utf-8'))
+    return image_copies.setdefault(digest.hexdigest(), value)
+
+def pruned_resources(page, image_copies: Optional[Dict[str, 'IndirectObject']] = None) -> 'DictionaryObject':
+    """
+    The page's resources cut down to the names its content stream uses.
+
+    Many producers give every page one shared resource dictionary listing every font and
+    image in the document; copied as-is, each chunk would carry all of them.
+    """
+    from PyPDF2.generic import DictionaryObject, NameObject
+    image_copies = image_copies if image_copies is not None else {}
+    resources = page['/Resources'] if '/Resources' in page else DictionaryObject()
+    used = _content_names(page)
+
+    # Form XObjects without their own resources draw with the page's - leave those pages untouched
+    xobjects = resources['/XObject'] if '/XObject' in resources else {}
+    for name in used:
+        if name in xobjects and xobjects[name].get('/Subtype') == '/Form' and '/Resources' not in xobjects[name]:
+            return resources
+
+    pruned = DictionaryObject()
+    for category, entries in resources.items():
+        if category not in PRUNABLE_RESOURCES:
+            pruned[NameObject(category)] = entries
+            continue
+        entries = entries.get_object()
+        kept = DictionaryObject()
+        for name in entries:
+            if name in used:
+                value = entries.raw_get(name)
+                kept[NameObject(name)] = _shared_image(value, image_copies) if category == '/XObject' else value
+        pruned[NameObject(category)] = kept
+    return pruned
+
+def _compact_contents(page, pdf_writer: 'PyPDF2.PdfWriter'):
+    """Page content as one Flate stream when that is smaller than the stored streams, else a plain copy"""
+    from PyPDF2.generic import ArrayObject, DecodedStreamObject
+    original = page.raw_get('/Contents')
+    streams = original.get_object()
+    streams = streams if isinstance(streams, ArrayObject) else [original]
+    stored_bytes = sum(len(stream.get_object()._data or b'') for stream in streams)
+
+    if any('/Filter' not in stream.get_object() for stream in streams):
+        try:
+            merged = DecodedStreamObject()
+            merged.set_data(page_content_bytes(page))
+            compressed = merged.flate_encode()
+            if len(compressed._data) < stored_bytes:
+                return pdf_writer._add_object(compressed)
+        except Exception:
+            pass  # Streams PyPDF2 cannot decode are kept as they were
+    return original.clone(pdf_writer)
+
+def build_chunk_bytes(pdf_reader: 'PyPDF2.PdfReader', start_page: int, end_page: int,
+                      prune: bool = CHUNK_PRUNE_RESOURCES, compress: bool = CHUNK_COMPRESS_STREAMS) -> bytes:
+    """Write pages [start_page, end_page) of the reader into a standalone PDF (the PyPDF2 split backend)"""
+    import PyPDF2
+    from PyPDF2.generic import NameObject
+    pdf_writer = PyPDF2.PdfWriter()
+    image_copies = {}
+    for page_num in range(start_page, end_page):
+        page = pdf_reader.pages[page_num]
+
+        # Resources and contents are attached separately so objects the chunk doesn't need
+        # (unused fonts/images, superseded content streams) are never copied into the writer
+        excluded_keys = []
+        if prune:
+            excluded_keys.append('/Resources')
+        if compress and '/Contents' in page:
+            excluded_keys.append('/Contents')
+        writer_page = pdf_writer.add_page(page, excluded_keys=excluded_keys)
+
+        if prune:
+            writer_page[NameObject('/Resources')] = pruned_resources(page, image_copies).clone(pdf_writer)
+        if compress and '/Contents' in page:
+            writer_page[NameObject('/Contents')] = _compact_contents(page, pdf_writer)
+
+    # Write to bytes
+    output_stream = io.BytesIO()
+    pdf_writer.write(output_stream)
+    return output_stream.getvalue()
+
+def _plan_page_ranges(document: 'SplitDocument', first_page: int, last_page: int,
+                      pages_per_chunk: Union[int, str]) -> List[Tuple[int, int]]:
+    """Page ranges covering pages [first_page, last_page), by fixed count or by budget"""
+    if pages_per_chunk == ADAPTIVE_CHUNKING:
+        page_costs = [document.page_cost(page_num) for page_num in range(first_page, last_page)]
+        return [(first_page + start, first_page + end) for start, end in plan_chunks(page_costs)]
+    return [(start, min(start + pages_per_chunk, last_page))
+            for start in range(first_page, last_page, pages_per_chunk)]
+
+def _page_runs(total_pages: int, local_pages: Dict[int, str],
+               isolated_pages: Optional[Set[int]] = None) -> List[Tuple[int, int, str]]:
+    """Group pages into consecutive (start, end, kind) runs; isolated pages are never grouped"""
+    isolated_pages = isolated_pages or set()
+    runs = []
+    for page_num in range(total_pages):
+        if page_num in local_pages:
+            kind = LOCAL_RUN
+        elif page_num in isolated_pages:
+            kind = ISOLATED_RUN
+        else:
+            kind = API_RUN
+        if runs and runs[-1][2] == kind and kind != ISOLATED_RUN:
+            runs[-1] = (runs[-1][0], page_num + 1, kind)
+        else:
+            runs.append((page_num, page_num + 1, kind))
+    return runs
+
+def iter_pdf_chunks(pdf_path: Union[str, "PDFDocument"], pages_per_chunk: Union[int, str] = 5,
+                    local_pages: Optional[Dict[int, str]] = None,
+                    isolated_pages: Optional[Set[int]] = None,
+                    prune: bool = CHUNK_PRUNE_RESOURCES,
+                    compress: bool = CHUNK_COMPRESS_STREAMS,
+                    build_data: bool = True,
+                    backend: Optional[str] = None) -> Iterator[dict]:
+    """
+    Yield PDF chunks one at a time, building each chunk's bytes only when requested.
+
+    pages_per_chunk is either a fixed page count or ADAPTIVE_CHUNKING to size
+    each chunk from per-page estimates against the CHUNK_MAX_* budgets.
+
+    local_pages maps 0-based page numbers to Markdown that was already produced
+    without the API. Runs of those pages are yielded as chunks carrying
+    'markdown' instead of 'data', and only the remaining pages are split.
+
+    isolated_pages (0-based) are each sent as a single-page chunk.
+
+    prune drops fonts/images the chunk's pages never use; compress deflates
+    page content streams. The two are independent.
+
+    With build_data=False only the page ranges are planned; chunks carry no 'data'
+    (for callers that send the whole document and request ranges of it).
+
+    backend names the split backend (see split_backends); None uses SPLIT_BACKEND.
+    pdf_path may also be a shared PDFDocument, whose parse is reused and left open.
+    """
+    from .split_backends import open_split_document
+    local_pages = local_pages or {}
+
+    with open_split_document(pdf_path, backend) as document:
+        total_pages = document.total_pages
+
+        for run_start, run_end, kind in _page_runs(total_pages, local_pages, isolated_pages):
+            if kind == LOCAL_RUN:
+                yield {
+                    'markdown': "\n\n".join(local_pages[page_num] for page_num in range(run_start, run_end)),
+                    'start_page': run_start + 1,
+                    'end_page': run_end,
+                    'total_pages': total_pages
+                }
+                continue
+
+            page_ranges = _plan_page_ranges(document, run_start, run_end, pages_per_chunk)
+            if pages_per_chunk == ADAPTIVE_CHUNKING and kind == API_RUN:
+                print(f"Planned {len(page_ranges)} chunks for pages {run_start + 1}-{run_end} within request budgets")
+
+            for start_page, end_page in page_ranges:
+                if not build_data:
+                    yield {'start_page': start_page + 1, 'end_page': end_page, 'total_pages': total_pages}
+                    continue
+                yield {
+                    'data': document.chunk_bytes(start_page, end_page, prune, compress),
+                    'start_page': start_page + 1,
+                    'end_page': end_page,
+                    'total_pages': total_pages
+                }
+
+def sub_chunk(chunk: dict, start_page: int, end_page: int) -> dict:
+    """Pages start_page-end_page (1-based, inclusive, within the chunk) as a chunk of their own"""
+    if 'data' not in chunk:
+        return {'start_page': start_page, 'end_page': end_page, 'total_pages': chunk['total_pages']}
+    from .split_backends import open_split_document
+    offset = chunk['start_page']
+    with open_split_document(chunk['data']) as document:
+        data = document.chunk_bytes(start_page - offset, end_page - offset + 1,
+                                    CHUNK_PRUNE_RESOURCES, CHUNK_COMPRESS_STREAMS)
+    return {'data': data, 'start_page': start_page, 'end_page': end_page, 'total_pages': chunk['total_pages']}
+
+def split_pdf(pdf_path: str, pages_per_chunk: Union[int, str] = 5):
+    """Split a PDF into smaller chunks."""
+    return list(iter_pdf_chunks(pdf_path, pages_per_chunk))
+
+def extract_chunk_text(pdf_data: bytes) -> str:
+    """Text layer of every page in a chunk, used to score the model's Markdown against the source"""
+    import PyPDF2
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_data))
+    return "\n".join(page.extract_text() or "" for page in pdf_reader.pages)
+
+def parse_pages_per_chunk(value: str) -> Union[int, str]:
+    """Parse a CLI pages-per-chunk argument: a positive page count or 'auto'"""
+    value = value.strip().lower()
+    if value == ADAPTIVE_CHUNKING:
+        return ADAPTIVE_CHUNKING
+    pages_per_chunk = int(value)
+    if pages_per_chunk < 1:
+        raise ValueError(f"pages per chunk must be at least 1, got {pages_per_chunk}")
+    return pages_per_chunk
+
+def chunk_size_report(pdf_path: str, pages_per_chunk: Union[int, str] = 5) -> List[Dict]:
+    """Bytes of every chunk built with and without resource pruning, both with the configured stream compression"""
+    plain = iter_pdf_chunks(pdf_path, pages_per_chunk, prune=False, compress=CHUNK_COMPRESS_STREAMS)
+    pruned = iter_pdf_chunks(pdf_path, pages_per_chunk, prune=True, compress=CHUNK_COMPRESS_STREAMS)
+    return [{
+        'start_page': plain_chunk['start_page'],
+        'end_page': plain_chunk['end_page'],
+        'plain_bytes': len(plain_chunk['data']),
+        'pruned_bytes': len(pruned_chunk['data']),
+    } for plain_chunk, pruned_chunk in zip(plain, pruned)]
+
+def main():
+    """Print bytes-per-chunk against the source size, with and without resource pruning"""
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    if not args:
+        print("Usage: python -m src.converters.pdf_chunking <pdf_path> [pages_per_chunk|auto]")
+        sys.exit(1)
+
+    pdf_path = args[0]
+    pages_per_chunk = parse_pages_per_chunk(args[1]) if len(args) > 1 else 5
+    source_bytes = os.path.getsize(pdf_path)
+    report = chunk_size_report(pdf_path, pages_per_chunk)
+
+    print(f"CHUNK SIZE REPORT: {os.path.basename(pdf_path)} ({source_bytes:,} bytes)")
+    print("=" * 60)
+    print(f"{'Pages':<12}{'Plain bytes':>16}{'Pruned bytes':>16}{'Saved':>10}")
+    for row in report:
+        saved = 1 - row['pruned_bytes'] / row['plain_bytes'] if row['plain_bytes'] else 0
+        pages = f"{row['start_page']}-{row['end_page']}"
+        print(f"{pages:<12}{row['plain_bytes']:>16,}{row['pruned_bytes']:>16,}{saved:>10.1%}")
+
+    plain_total = sum(row['plain_bytes'] for row in report)
+    pruned_total = sum(row['pruned_bytes'] for row in report)
+    print("-" * 60)
+    print(f"{'Total':<12}{plain_total:>16,}{pruned_total:>16,}")
+    print(f"[OK] Uploaded bytes vs source: plain {plain_total / source_bytes:.2f}x, pruned {pruned_total / source_bytes:.2f}x")
+
+if __name__ == "__main__":
+    main()
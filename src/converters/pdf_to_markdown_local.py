@@ -0,0 +1,114 @@
+import sys
+from pathlib import Path
+from typing import Iterator, Union
+from datetime import datetime
+
+from config.settings import MARKDOWN_PART_SEPARATOR
+from .local_markdown_renderer import iter_rendered_pages
+from .pdf_chunking import ADAPTIVE_CHUNKING, iter_pdf_chunks, parse_pages_per_chunk
+from .streaming_pipeline import write_markdown_parts
+
+def iter_local_markdown_parts(pdf_path: str, pages_per_chunk: Union[int, str] = 5) -> Iterator[str]:
+    """
+    Convert a PDF to Markdown entirely offline, yielding one part per chunk of pages.
+
+    Pages are grouped the same way the API converters chunk them, so the output
+    lines up part-for-part with a Sonnet or Haiku conversion of the same file.
+    With ADAPTIVE_CHUNKING the parts follow the same budget-planned page ranges.
+    """
+
+    # Check if PDF exists
+    pdf_path = Path(pdf_path)
+    if not pdf_path.exists():
+        raise FileNotFoundError(f"PDF file not found: {pdf_path}")
+
+    chunk_ends = None
+    if pages_per_chunk == ADAPTIVE_CHUNKING:
+        chunk_ends = {chunk['end_page'] for chunk in iter_pdf_chunks(str(pdf_path), ADAPTIVE_CHUNKING,
+                                                                     build_data=False)}
+
+    def generate_parts() -> Iterator[str]:
+        chunk_pages = []
+        for page_number, markdown_text in iter_rendered_pages(str(pdf_path)):
+            chunk_pages.append(markdown_text)
+            if page_number in chunk_ends if chunk_ends is not None else len(chunk_pages) == pages_per_chunk:
+                print(f"  [OK] Rendered pages {page_number - len(chunk_pages) + 1}-{page_number}")
+                yield "\n\n".join(chunk_pages)
+                chunk_pages = []
+        if chunk_pages:
+            print(f"  [OK] Rendered last {len(chunk_pages)} pages")
+            yield "\n\n".join(chunk_pages)
+
+    return generate_parts()
+
+def convert_pdf_to_markdown_local(pdf_path: str, pages_per_chunk: Union[int, str] = 5) -> str:
+    """
+    Convert a PDF document to Markdown without any API calls.
+
+    Headings come from font-size clusters, lists from indentation and bullet
+    glyphs, and reading order from block geometry (see local_markdown_renderer).
+
+    Args:
+        pdf_path: Path to the PDF file
+        pages_per_chunk: Number of pages per output part, or ADAPTIVE_CHUNKING
+
+    Returns:
+        Markdown formatted text from the PDF
+    """
+    return MARKDOWN_PART_SEPARATOR.join(iter_local_markdown_parts(pdf_path, pages_per_chunk))
+
+def main():
+    """Main function to handle command-line usage."""
+
+    # --flags can appear anywhere; the remaining arguments are positional
+    flags = {arg for arg in sys.argv[1:] if arg.startswith('--')}
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    if '--help' in flags:
+        print("Usage: <pdf_path> [pages_per_chunk|auto]")
+        return
+
+    print("PDF to Markdown Converter (Local) - no API required")
+    print("-" * 50)
+
+    # Check if PDF path was provided as command-line argument
+    if len(args) > 0:
+        pdf_path = args[0].strip()
+        print(f"Using PDF file: {pdf_path}")
+    else:
+        # Get PDF path from user
+        pdf_path = input("Enter the path to your PDF file: ").strip()
+
+    # Optional: pages per chunk
+    pages_per_chunk = 5
+    if len(args) > 1:
+        try:
+            pages_per_chunk = parse_pages_per_chunk(args[1])
+            print(f"Using {pages_per_chunk} pages per chunk")
+        except ValueError:
+            print("Invalid pages per chunk, using default of 5")
+
+    try:
+        # Save the output with _local suffix and timestamp
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        base_name = Path(pdf_path).stem
+        output_filename = f"{base_name}_local_{timestamp}.md"
+        output_path = Path(pdf_path).parent / output_filename
+
+        print("\nConverting PDF to Markdown...")
+        markdown_parts = iter_local_markdown_parts(pdf_path, pages_per_chunk)
+        total_length = write_markdown_parts(markdown_parts, output_path)
+
+        print(f"\n[OK] Conversion successful!")
+        print(f"[OK] Markdown saved to: {output_path}")
+        print(f"[OK] Total length: {total_length} characters")
+        print(f"[INFO] Converted locally - pages without a text layer are marked, not OCR'd")
+
+    except FileNotFoundError as e:
+        print(f"\n[ERROR] {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n[ERROR] An error occurred: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
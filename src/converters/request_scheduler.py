@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Request Scheduler
+Purpose: Keep concurrent chunk requests inside the API rate limits and ride out transient failures
+Strategy: Token buckets for requests/minute and input tokens/minute, Retry-After aware jittered backoff
+"""
+
+import random
+import sys
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional, TypeVar
+
+from config.settings import (
+    API_MAX_RETRIES,
+    API_RETRY_BASE_DELAY,
+    API_RETRY_MAX_DELAY,
+    REQUESTS_PER_MINUTE,
+    TOKENS_PER_MINUTE,
+)
+
+T = TypeVar('T')
+
+class TokenBucket:
+    """Continuously refilling budget; acquire() blocks until enough capacity is available"""
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.available = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.available = min(self.capacity, self.available + (now - self.updated_at) * self.rate_per_second)
+        self.updated_at = now
+
+    def acquire(self, amount: float = 1.0):
+        """Take amount from the bucket, sleeping until it has refilled enough"""
+        # A single request bigger than the whole bucket waits for a full bucket instead of forever
+        amount = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                self._refill()
+                if self.available >= amount:
+                    self.available -= amount
+                    return
+                wait_seconds = (amount - self.available) / self.rate_per_second
+            time.sleep(wait_seconds)
+
+    def adjust(self, amount: float):
+        """Correct an earlier estimate once the real cost is known (positive debits, negative refunds)"""
+        with self._lock:
+            self._refill()
+            self.available = min(self.capacity, self.available - amount)
+
+def _anthropic():
+    """The SDK module if a client has loaded it; its errors cannot occur otherwise"""
+    return sys.modules.get('anthropic')
+
+def is_retryable(error: Exception) -> bool:
+    """Rate limits, overload (529), server errors and dropped connections are worth retrying"""
+    anthropic = _anthropic()
+    if anthropic is None:
+        return False
+    if isinstance(error, anthropic.APIConnectionError):  # Includes timeouts
+        return True
+    if isinstance(error, anthropic.APIStatusError):
+        return error.status_code in (408, 409, 429) or error.status_code >= 500
+    return False
+
+class OutputLimitError(Exception):
+    """A response was still stopping at max_tokens after every continuation"""
+
+    def __init__(self, text: str, reason: str = ""):
+        super().__init__(reason or "response still truncated at max_tokens")
+        self.text = text  # Everything generated before giving up
+
+def is_bisectable(error: Exception) -> bool:
+    """Failures a smaller page range can avoid: oversized requests, timeouts, output limits, rejected pages"""
+    if isinstance(error, OutputLimitError):
+        return True
+    anthropic = _anthropic()
+    if anthropic is None:
+        return False
+    if isinstance(error, anthropic.APITimeoutError):
+        return True
+    if isinstance(error, anthropic.APIStatusError):
+        return error.status_code in (400, 413, 422)
+    return False
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Delay the server asked for via retry-after-ms / retry-after headers (seconds or HTTP-date), if any"""
+    response = getattr(error, 'response', None)
+    if response is None:
+        return None
+    headers = response.headers
+    try:
+        if headers.get('retry-after-ms'):
+            return float(headers['retry-after-ms']) / 1000.0
+        if headers.get('retry-after'):
+            return float(headers['retry-after'])
+    except ValueError:
+        pass
+    try:
+        # HTTP-date form, e.g. "Wed, 21 Oct 2026 07:28:00 GMT"
+        retry_at = parsedate_to_datetime(headers['retry-after'])
+        return max(0.0, retry_at.timestamp() - time.time())
+    except (KeyError, TypeError, ValueError):
+        return None  # Unparseable; fall back to our own backoff
+
+class RequestScheduler:
+    """Shared gate every API request passes through, sized to the account's rate limits"""
+
+    def __init__(self, requests_per_minute: float = REQUESTS_PER_MINUTE,
+                 tokens_per_minute: float = TOKENS_PER_MINUTE, max_retries: int = API_MAX_RETRIES,
+                 base_delay: float = API_RETRY_BASE_DELAY, max_delay: float = API_RETRY_MAX_DELAY):
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._paused_until = 0.0
+        self._pause_lock = threading.Lock()
+
+    def _wait_if_paused(self):
+        while True:
+            with self._pause_lock:
+                remaining = self._paused_until - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(remaining)
+
+    def pause(self, seconds: float):
+        """Hold every worker (not just the one that got throttled) for the given time"""
+        with self._pause_lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff: random delay up to base * 2^attempt, capped"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def call(self, request: Callable[[], T], estimated_tokens: int = 0, stats: Optional[Dict] = None) -> T:
+        """
+        Run request() within the rate limits, retrying transient failures.
+
+        Returns whatever request() returns; re-raises the last error once
+        max_retries is used up or immediately for non-retryable errors.
+        If stats is given, time spent waiting on the rate limits is added to
+        stats['queue_wait'] and retries are counted in stats['retries'].
+        """
+        attempt = 0
+        while True:
+            waiting_since = time.monotonic()
+            self._wait_if_paused()
+            self.request_bucket.acquire(1)
+            self.token_bucket.acquire(estimated_tokens)
+            if stats is not None:
+                stats['queue_wait'] = stats.get('queue_wait', 0.0) + time.monotonic() - waiting_since
+            try:
+                return request()
+            except Exception as e:
+                if not is_retryable(e) or attempt >= self.max_retries:
+                    raise
+
+                delay = retry_after_seconds(e)
+                if delay is not None:
+                    self.pause(delay)
+                else:
+                    delay = self.backoff_delay(attempt)
+                attempt += 1
+                if stats is not None:
+                    stats['retries'] = stats.get('retries', 0) + 1
+                print(f"  [RETRY] {type(e).__name__} - retry {attempt}/{self.max_retries} in {delay:.1f}s")
+                time.sleep(delay)
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: int):
+        """Settle the token bucket against the usage the API actually reported"""
+        self.token_bucket.adjust(actual_tokens - estimated_tokens)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Response Cache
+Purpose: Reuse chunk conversions across runs instead of paying for the same API call twice
+Strategy: Content-addressed SQLite store keyed by chunk bytes + model + prompt, with LRU eviction
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Optional
+
+from config.settings import RESPONSE_CACHE_COMPRESS, RESPONSE_CACHE_DIR, RESPONSE_CACHE_MAX_BYTES
+
+class ResponseCache:
+    """Size-bounded on-disk cache of chunk markdown, safe to share between processes"""
+
+    DB_NAME = "responses.sqlite3"
+
+    def __init__(self, cache_dir: str = RESPONSE_CACHE_DIR, max_bytes: int = RESPONSE_CACHE_MAX_BYTES,
+                 compress: bool = RESPONSE_CACHE_COMPRESS):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.cache_dir / self.DB_NAME
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+        conn = self._connect()
+        try:
+            # WAL lets readers in other processes proceed while one process writes
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY,"
+                " value BLOB NOT NULL,"
+                " compressed INTEGER NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)")
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        # A short-lived connection per call keeps this usable from worker threads and processes
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA busy_timeout=30000")
+        return conn
+
+    @staticmethod
+    def make_key(pdf_data: bytes, model: str, prompt: str) -> str:
+        """Hash the chunk bytes, model name and prompt text into a cache key"""
+        digest = hashlib.sha256()
+        for part in (model.encode('utf-8'), prompt.encode('utf-8'), pdf_data):
+            digest.update(len(part).to_bytes(8, 'big'))
+            digest.update(part)
+        return digest.hexdigest()
+
+    def get(self, pdf_data: bytes, model: str, prompt: str) -> Optional[str]:
+        """Return cached markdown for this request, or None on a miss"""
+        key = self.make_key(pdf_data, model, prompt)
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT value, compressed FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+        finally:
+            conn.close()
+
+        with self._stats_lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        value, compressed = row
+        if compressed:
+            value = zlib.decompress(value)
+        return value.decode('utf-8')
+
+    def put(self, pdf_data: bytes, model: str, prompt: str, markdown_text: str):
+        """Store markdown for this request and evict least recently used entries over budget"""
+        key = self.make_key(pdf_data, model, prompt)
+        value = markdown_text.encode('utf-8')
+        if self.compress:
+            value = zlib.compress(value)
+
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, compressed, size, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, value, int(self.compress), len(value), time.time())
+            )
+            self._evict(conn)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Drop the least recently used entries until the store fits in max_bytes"""
+        total_size = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total_size <= self.max_bytes:
+            return
+
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY last_access").fetchall():
+            if total_size <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total_size -= size
+
+    def clear(self):
+        """Remove every cached entry"""
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM entries")
+        finally:
+            conn.close()
+
+    def stats(self) -> Dict:
+        """Hit/miss counts for this process plus the current size of the store"""
+        conn = self._connect()
+        try:
+            entries, total_bytes = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        finally:
+            conn.close()
+
+        with self._stats_lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits / lookups) if lookups else 0.0,
+                'entries': entries,
+                'total_bytes': total_bytes,
+                'max_bytes': self.max_bytes,
+            }
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Split Backends
+Purpose: Cut page-range chunks out of a PDF with whichever library does it fastest
+Strategy: One small interface (page count, per-page cost estimate, chunk bytes) implemented over PyPDF2
+          (pure Python, always available) and PyMuPDF (MuPDF's C parser, insert_pdf + tobytes with garbage
+          collection and deflate); chosen by SPLIT_BACKEND or by what is installed
+"""
+
+import importlib.util
+import io
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Union
+
+from config.settings import CHUNK_COMPRESS_STREAMS, CHUNK_PRUNE_RESOURCES, SPLIT_BACKEND
+from ..utils.pdf_document import MUPDF_LOCK, PDFDocument
+from .pdf_chunking import build_chunk_bytes, estimate_page_cost, iter_pdf_chunks, page_cost, parse_pages_per_chunk
+
+# A file path, the PDF's bytes, or a shared PDFDocument whose parsers are reused (and left open)
+PdfSource = Union[str, bytes, PDFDocument]
+
+class SplitDocument:
+    """An open PDF that chunks are cut from; page numbers are 0-based and end pages exclusive"""
+
+    name = ""
+    total_pages = 0
+
+    def page_cost(self, page_num: int) -> Dict:
+        """Estimated request cost of one page (see pdf_chunking.page_cost), for adaptive chunking"""
+        raise NotImplementedError
+
+    def chunk_bytes(self, start_page: int, end_page: int, prune: bool = CHUNK_PRUNE_RESOURCES,
+                    compress: bool = CHUNK_COMPRESS_STREAMS) -> bytes:
+        """Pages [start_page, end_page) as a standalone PDF"""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+class PyPDF2SplitDocument(SplitDocument):
+    """Pure-Python splitting; prunes each chunk's resources to what its pages draw with"""
+
+    name = "pypdf2"
+
+    def __init__(self, source: PdfSource):
+        self._file = None
+        if isinstance(source, PDFDocument):
+            self.reader = source.reader
+            self._lock = source.reader_lock  # Other stages read the same reader from worker threads
+        else:
+            import PyPDF2
+            self._file = io.BytesIO(source) if isinstance(source, bytes) else open(source, 'rb')
+            self.reader = PyPDF2.PdfReader(self._file)
+            self._lock = threading.Lock()
+        self.total_pages = len(self.reader.pages)
+
+    def page_cost(self, page_num: int) -> Dict:
+        with self._lock:
+            return estimate_page_cost(self.reader.pages[page_num])
+
+    def chunk_bytes(self, start_page: int, end_page: int, prune: bool = CHUNK_PRUNE_RESOURCES,
+                    compress: bool = CHUNK_COMPRESS_STREAMS) -> bytes:
+        with self._lock:
+            return build_chunk_bytes(self.reader, start_page, end_page, prune, compress)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+class PyMuPDFSplitDocument(SplitDocument):
+    """MuPDF splitting: copies pages with insert_pdf, then garbage-collects, de-duplicates and deflates"""
+
+    name = "pymupdf"
+
+    def __init__(self, source: PdfSource):
+        import fitz  # PyMuPDF
+        self._fitz = fitz
+        self._document = source if isinstance(source, PDFDocument) else None
+        self._owned = self._document is None
+        with MUPDF_LOCK:
+            if not self._owned:
+                self.doc = source.fitz
+            elif isinstance(source, bytes):
+                self.doc = fitz.open(stream=source, filetype="pdf")
+            else:
+                self.doc = fitz.open(source)
+            self.total_pages = self.doc.page_count
+
+    def page_cost(self, page_num: int) -> Dict:
+        with MUPDF_LOCK:
+            page = self.doc[page_num]
+            content_bytes = len(page.read_contents())
+            images = {image[0] for image in page.get_images(full=True)}
+            image_bytes = 0
+            for xref in images:
+                kind, value = self.doc.xref_get_key(xref, "Length")
+                image_bytes += int(value) if kind == "int" else 0
+            try:
+                # Through the shared document, the text is cached for validation and cascade scoring
+                text = self._document.page_text(page_num) if self._document is not None else page.get_text()
+                text_chars = len(text.strip())
+            except Exception:
+                text_chars = 0
+        return page_cost(content_bytes, len(images), image_bytes, text_chars)
+
+    def chunk_bytes(self, start_page: int, end_page: int, prune: bool = CHUNK_PRUNE_RESOURCES,
+                    compress: bool = CHUNK_COMPRESS_STREAMS) -> bytes:
+        with MUPDF_LOCK:
+            chunk = self._fitz.open()
+            try:
+                chunk.insert_pdf(self.doc, from_page=start_page, to_page=end_page - 1)
+                if prune:
+                    # Rewrites each page's resources to the ones its content stream uses
+                    for page in chunk:
+                        page.clean_contents(sanitize=True)
+                # garbage=3 also merges duplicate objects, so an image repeated across pages is embedded once;
+                # no_new_id keeps the bytes identical across runs, which the response cache and cassettes key on
+                return chunk.tobytes(garbage=3 if prune else 1, deflate=compress, no_new_id=True)
+            finally:
+                chunk.close()
+
+    def close(self):
+        if self._owned:
+            with MUPDF_LOCK:
+                self.doc.close()
+
+SPLIT_BACKENDS = {
+    PyMuPDFSplitDocument.name: (PyMuPDFSplitDocument, "fitz"),
+    PyPDF2SplitDocument.name: (PyPDF2SplitDocument, "PyPDF2"),
+}
+AUTO_BACKEND = "auto"
+
+def available_backends() -> List[str]:
+    """Installed backends, fastest first"""
+    return [name for name, (_, module) in SPLIT_BACKENDS.items() if importlib.util.find_spec(module) is not None]
+
+def resolve_backend(name: Optional[str] = None) -> str:
+    """Backend name to use for name (None means SPLIT_BACKEND; "auto" the fastest installed)"""
+    name = (name or SPLIT_BACKEND).lower()
+    if name == AUTO_BACKEND:
+        installed = available_backends()
+        if not installed:
+            raise ValueError("No PDF split backend installed - pip install PyMuPDF or PyPDF2")
+        return installed[0]
+    if name not in SPLIT_BACKENDS:
+        raise ValueError(f"Unknown split backend '{name}'. Available: {', '.join(SPLIT_BACKENDS)}, {AUTO_BACKEND}")
+    if name not in available_backends():
+        raise ValueError(f"Split backend '{name}' needs {SPLIT_BACKENDS[name][1]}, which is not installed")
+    return name
+
+def open_split_document(source: PdfSource, backend: Optional[str] = None) -> SplitDocument:
+    document_class, _ = SPLIT_BACKENDS[resolve_backend(backend)]
+    return document_class(source)
+
+def benchmark_split_backends(pdf_path: str, pages_per_chunk: Union[int, str] = 5,
+                             backends: Optional[Sequence[str]] = None) -> List[Dict]:
+    """Split the whole PDF once per backend: wall time, chunk count and bytes produced"""
+    results = []
+    for name in backends or available_backends():
+        name = resolve_backend(name)
+        open_split_document(pdf_path, name).close()  # Library import and first read are not part of the timing
+        started = time.perf_counter()
+        chunks = 0
+        total_bytes = 0
+        for chunk in iter_pdf_chunks(pdf_path, pages_per_chunk, backend=name):
+            chunks += 1
+            total_bytes += len(chunk['data'])
+        elapsed = time.perf_counter() - started
+        results.append({'backend': name, 'seconds': round(elapsed, 3), 'chunks': chunks, 'bytes': total_bytes})
+    return results
+
+def main():
+    """Compare split time and output size of every installed backend"""
+    options = dict(arg[2:].split('=', 1) for arg in sys.argv[1:] if arg.startswith('--') and '=' in arg)
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    if not args:
+        print("Usage: python -m src.converters.split_backends <pdf_path> [pages_per_chunk|auto] [--backends=pymupdf,pypdf2]")
+        sys.exit(1)
+
+    pdf_path = args[0]
+    if not os.path.exists(pdf_path):
+        print(f"[ERROR] PDF file not found: {pdf_path}")
+        sys.exit(1)
+
+    try:
+        pages_per_chunk = parse_pages_per_chunk(args[1]) if len(args) > 1 else 5
+        backends = options['backends'].split(',') if 'backends' in options else None
+        results = benchmark_split_backends(pdf_path, pages_per_chunk, backends)
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+
+    source_bytes = os.path.getsize(pdf_path)
+    print(f"SPLIT BACKEND BENCHMARK: {os.path.basename(pdf_path)} ({source_bytes:,} bytes, {pages_per_chunk} pages/chunk)")
+    print("=" * 60)
+    print(f"{'Backend':<12}{'Seconds':>10}{'Chunks':>8}{'Bytes':>16}{'vs source':>12}")
+    for r in results:
+        print(f"{r['backend']:<12}{r['seconds']:>10.3f}{r['chunks']:>8}{r['bytes']:>16,}{r['bytes'] / source_bytes:>11.2f}x")
+    print(f"[OK] Default backend: {resolve_backend()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Streaming Pipeline
+Purpose: Convert chunks concurrently while emitting results strictly in page order
+Strategy: Bounded window of in-flight futures; the head of the window is yielded as soon as it is done.
+          Parts can also be followed while they are still being generated, so the writer streams the
+          head part into the output file token by token
+"""
+
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple, TypeVar
+
+from config.settings import MARKDOWN_PART_SEPARATOR
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+class RequeueRequest(Exception):
+    """Raised by a pipeline function to send its item to the back of the queue for another try"""
+
+    def __init__(self, fallback, reason: str = ""):
+        super().__init__(reason)
+        self.fallback = fallback  # Result to use once the item has run out of requeues
+
+class _Slot:
+    """One input item's place in the output order, with the future currently working on it"""
+
+    def __init__(self, index: int, item, future: Future):
+        self.index = index
+        self.item = item
+        self.future = future
+        self.requeues = 0
+
+def map_in_order(func: Callable[[int, T], R], items: Iterable[T], max_workers: int,
+                 max_in_flight: int = 0, max_requeues: int = 0) -> Iterator[R]:
+    """
+    Run func(index, item) on a thread pool and yield results in input order.
+
+    Items are pulled from the iterable lazily, so at most max_in_flight items
+    (default: twice the worker count) are held in memory at any time.
+
+    If func raises RequeueRequest the item is resubmitted behind the work already
+    queued, up to max_requeues times; after that the exception's fallback is
+    yielded in its place.
+    """
+    max_workers = max(1, max_workers)
+    max_in_flight = max(max_workers, max_in_flight or max_workers * 2)
+
+    items = iter(enumerate(items, 1))
+    in_flight = deque()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+
+        def requeue_failed():
+            # Give every finished-but-requeued item a new future straight away
+            for slot in in_flight:
+                if slot.future.done() and isinstance(slot.future.exception(), RequeueRequest):
+                    if slot.requeues < max_requeues:
+                        slot.requeues += 1
+                        print(f"  [REQUEUE] Item {slot.index} back in the queue ({slot.requeues}/{max_requeues})")
+                        slot.future = executor.submit(func, slot.index, slot.item)
+
+        def next_result():
+            head = in_flight[0]
+            while True:
+                requeue_failed()
+                if head.future.done():
+                    break
+                pending = [slot.future for slot in in_flight if not slot.future.done()]
+                wait(pending, return_when=FIRST_COMPLETED)
+
+            in_flight.popleft()
+            error = head.future.exception()
+            if isinstance(error, RequeueRequest):
+                return error.fallback
+            return head.future.result()
+
+        for index, item in items:
+            in_flight.append(_Slot(index, item, executor.submit(func, index, item)))
+            if len(in_flight) >= max_in_flight:
+                yield next_result()
+
+        while in_flight:
+            yield next_result()
+
+# Events produced while following a live part
+PART_TEXT = "text"        # Another piece of text
+PART_RESTART = "restart"  # Everything so far is void; the text that follows replaces it
+PART_FINAL = "final"      # The part's finished text, which is authoritative
+
+class LivePart:
+    """Text of one part as it is generated; a retry restarts it"""
+
+    def __init__(self, condition: threading.Condition):
+        self._condition = condition
+        self.pieces = []
+        self.restarts = 0
+        self.final = None
+        self.finished = False
+
+    def write(self, text: str):
+        if not text:
+            return
+        with self._condition:
+            self.pieces.append(text)
+            self._condition.notify_all()
+
+    def restart(self, text: str = ""):
+        """Replace everything written so far with text (no-op if that is already what was written)"""
+        with self._condition:
+            if "".join(self.pieces) == text:
+                return
+            self.pieces = [text] if text else []
+            self.restarts += 1
+            self._condition.notify_all()
+
+class LiveParts:
+    """
+    Parts still being generated, by 1-based index, for a writer to follow.
+
+    Until a writer activates it, get() hands out throwaway parts so nothing is held.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._parts: Dict[int, LivePart] = {}
+        self.active = False
+        self.total: Optional[int] = None   # Set once the last part has been produced
+        self.error: Optional[BaseException] = None
+
+    def get(self, index: int) -> LivePart:
+        with self._condition:
+            if not self.active:
+                return LivePart(self._condition)
+            return self._parts.setdefault(index, LivePart(self._condition))
+
+    def finish(self, index: int, text: str):
+        part = self.get(index)
+        with self._condition:
+            part.final = text
+            part.finished = True
+            self._condition.notify_all()
+
+    def end(self, total: int, error: Optional[BaseException] = None):
+        with self._condition:
+            self.total = total
+            self.error = error
+            self._condition.notify_all()
+
+    def follow(self, index: int) -> Iterator[Tuple[str, str]]:
+        """Yield (event, text) for a part until its final text; yields nothing if there is no such part"""
+        part = self.get(index)
+        sent = 0
+        restarts = 0
+        while True:
+            with self._condition:
+                while not (part.finished or part.restarts != restarts or len(part.pieces) > sent
+                           or self.error is not None or (self.total is not None and index > self.total)):
+                    self._condition.wait()
+                if self.error is not None:
+                    raise self.error
+                if not part.finished and self.total is not None and index > self.total:
+                    self._parts.pop(index, None)
+                    return
+
+                events = []
+                if part.restarts != restarts:
+                    restarts, sent = part.restarts, 0
+                    events.append((PART_RESTART, ""))
+                new_pieces = part.pieces[sent:]
+                sent += len(new_pieces)
+                events.extend((PART_TEXT, piece) for piece in new_pieces)
+                if part.finished:
+                    events.append((PART_FINAL, part.final))
+                    self._parts.pop(index, None)
+
+            yield from events
+            if part.finished:
+                return
+
+class LiveMarkdownParts:
+    """Ordered parts (iterate for the finished strings) plus the live view of parts in progress"""
+
+    def __init__(self, parts: Iterator[str], live: LiveParts):
+        self._parts = parts
+        self.live = live
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        return next(self._parts)
+
+def _write_live_parts(parts: LiveMarkdownParts, output_path: str, separator: str) -> int:
+    live = parts.live
+    live.active = True
+
+    def produce():
+        # Drive the pipeline in the background; the finished parts arrive here in order
+        count = 0
+        try:
+            for count, text in enumerate(parts, 1):
+                live.finish(count, text)
+        except BaseException as e:
+            live.end(count, e)
+            return
+        live.end(count)
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+
+    total_length = 0
+    with open(output_path, 'wb') as f:
+        index = 1
+        while True:
+            part_start = f.tell()
+            streamed = []
+            final = None
+
+            def write(text: str):
+                if not streamed and index > 1:
+                    f.write(separator.encode('utf-8'))
+                streamed.append(text)
+                f.write(text.encode('utf-8'))
+                f.flush()
+
+            for event, text in live.follow(index):
+                if event == PART_RESTART:
+                    f.seek(part_start)
+                    f.truncate()
+                    streamed = []
+                elif event == PART_TEXT:
+                    write(text)
+                else:
+                    final = text
+            if final is None:
+                break
+
+            # The finished text wins over whatever was streamed (cache hits, fallbacks, continuations)
+            if "".join(streamed) != final or (index > 1 and not streamed):
+                f.seek(part_start)
+                f.truncate()
+                streamed = []
+                write(final)
+            total_length += len(final) + (len(separator) if index > 1 else 0)
+            index += 1
+
+    producer.join()
+    return total_length
+
+def write_markdown_parts(parts: Iterable[str], output_path: str,
+                         separator: str = MARKDOWN_PART_SEPARATOR) -> int:
+    """
+    Append each part to the output file as it arrives; returns characters written.
+
+    Parts from a pipeline that exposes its live parts (LiveMarkdownParts) are streamed
+    into the file while they are generated, and rewritten if a retry replaces them.
+    """
+    if isinstance(parts, LiveMarkdownParts):
+        return _write_live_parts(parts, output_path, separator)
+
+    total_length = 0
+    with open(output_path, 'w', encoding='utf-8') as f:
+        for i, part in enumerate(parts):
+            if i > 0:
+                f.write(separator)
+                total_length += len(separator)
+            f.write(part)
+            f.flush()
+            total_length += len(part)
+    return total_length
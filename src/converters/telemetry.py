@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Conversion Telemetry
+Purpose: Record what every chunk request cost - bytes, waits, latency, tokens, retries - for capacity planning
+Strategy: One JSON line per API request and per finished chunk, appended as they happen;
+          the run summary (latency percentiles, throughput, estimated cost) is computed from the same records
+"""
+
+import json
+import math
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .model_profiles import ConversionProfile
+
+# Metric keys filled in by the converters and the scheduler, with their JSONL field names
+REQUEST_FIELDS = {
+    'bytes_uploaded': 'bytes_uploaded',
+    'base64_bytes': 'base64_bytes',
+    'queue_wait': 'queue_wait_s',
+    'api_latency': 'api_latency_s',
+    'ttft': 'time_to_first_token_s',
+    'input_tokens': 'input_tokens',
+    'output_tokens': 'output_tokens',
+    'cache_creation_input_tokens': 'cache_creation_input_tokens',
+    'cache_read_input_tokens': 'cache_read_input_tokens',
+    'retries': 'retries',
+    'continuations': 'continuations',
+    'stop_reason': 'stop_reason',
+}
+
+def percentile(values: List[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile (fraction in 0-1); None for no values"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+class TelemetryRecorder:
+    """Per-request and per-chunk records for one conversion run, written to a JSONL file as they arrive"""
+
+    def __init__(self, jsonl_path: Optional[str] = None):
+        self.jsonl_path = Path(jsonl_path) if jsonl_path else None
+        self.requests: List[Dict] = []
+        self.chunks: List[Dict] = []
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+        if self.jsonl_path is not None:
+            self.jsonl_path.write_text("", encoding='utf-8')
+
+    def _write(self, record: Dict):
+        with self._lock:
+            if self.jsonl_path is not None:
+                with open(self.jsonl_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(record) + "\n")
+
+    def record_request(self, chunk_index: int, chunk: dict, profile: ConversionProfile, metrics: Dict,
+                       status: str = "ok", error: Optional[str] = None) -> Dict:
+        """One API request (or response cache hit) for a page range"""
+        record = {
+            'type': 'request',
+            'time': datetime.now().isoformat(timespec='milliseconds'),
+            'chunk': chunk_index,
+            'start_page': chunk['start_page'],
+            'end_page': chunk['end_page'],
+            'pages': chunk['end_page'] - chunk['start_page'] + 1,
+            'profile': profile.name,
+            'model': profile.model,
+            'status': status,
+            'response_cache_hit': bool(metrics.get('response_cache_hit')),
+            'prompt_cache_hit': bool(metrics.get('cache_read_input_tokens')),
+        }
+        for key, field in REQUEST_FIELDS.items():
+            value = metrics.get(key)
+            record[field] = round(value, 4) if isinstance(value, float) else value
+        record['cost_usd'] = round(profile.estimate_cost(metrics.get('input_tokens') or 0,
+                                                         metrics.get('output_tokens') or 0,
+                                                         metrics.get('cache_creation_input_tokens') or 0,
+                                                         metrics.get('cache_read_input_tokens') or 0), 6)
+        if error:
+            record['error'] = error
+        with self._lock:
+            self.requests.append(record)
+        self._write(record)
+        return record
+
+    def record_chunk(self, chunk_index: int, chunk: dict, status: str, seconds: float = 0.0) -> Dict:
+        """A chunk leaving the pipeline: converted, failed, rendered locally or taken from the journal"""
+        record = {
+            'type': 'chunk',
+            'time': datetime.now().isoformat(timespec='milliseconds'),
+            'chunk': chunk_index,
+            'start_page': chunk['start_page'],
+            'end_page': chunk['end_page'],
+            'pages': chunk['end_page'] - chunk['start_page'] + 1,
+            'status': status,
+            'seconds': round(seconds, 4),
+        }
+        with self._lock:
+            self.chunks.append(record)
+        self._write(record)
+        return record
+
+    def summary(self) -> Dict:
+        """Aggregate figures for the run so far"""
+        with self._lock:
+            requests = list(self.requests)
+            chunks = list(self.chunks)
+        elapsed = time.monotonic() - self.started
+
+        api_requests = [r for r in requests if r['api_latency_s'] is not None]
+        latencies = [r['api_latency_s'] for r in api_requests]
+        first_tokens = [r['time_to_first_token_s'] for r in api_requests if r['time_to_first_token_s'] is not None]
+        output_tokens = sum(r['output_tokens'] or 0 for r in api_requests)
+        api_seconds = sum(latencies)
+        pages = sum(c['pages'] for c in chunks if c['status'] != 'failed')
+
+        return {
+            'type': 'summary',
+            'elapsed_s': round(elapsed, 2),
+            'requests': len(api_requests),
+            'failed_requests': sum(1 for r in requests if r['status'] == 'error'),
+            'response_cache_hits': sum(1 for r in requests if r['response_cache_hit']),
+            'prompt_cache_hits': sum(1 for r in api_requests if r['prompt_cache_hit']),
+            'retries': sum(r['retries'] or 0 for r in requests),
+            'continuations': sum(r['continuations'] or 0 for r in requests),
+            'latency_p50_s': percentile(latencies, 0.50),
+            'latency_p95_s': percentile(latencies, 0.95),
+            'ttft_p50_s': percentile(first_tokens, 0.50),
+            'input_tokens': sum(r['input_tokens'] or 0 for r in api_requests),
+            'output_tokens': output_tokens,
+            'output_tokens_per_s': round(output_tokens / api_seconds, 1) if api_seconds else None,
+            'pages': pages,
+            'pages_per_minute': round(pages * 60 / elapsed, 1) if elapsed else None,
+            'bytes_uploaded': sum(r['bytes_uploaded'] or 0 for r in api_requests),
+            'cost_usd': round(sum(r['cost_usd'] for r in requests), 4),
+        }
+
+    def finish(self) -> Dict:
+        """Append the run summary to the JSONL file and print it"""
+        summary = self.summary()
+        self._write(summary)
+
+        def seconds(value):
+            return f"{value:.2f}s" if value is not None else "n/a"
+
+        print("\nRUN TELEMETRY")
+        print("-" * 50)
+        print(f"Requests: {summary['requests']} ({summary['failed_requests']} failed, {summary['retries']} retries, "
+              f"{summary['continuations']} continuations, {summary['response_cache_hits']} response cache hits)")
+        print(f"Latency: p50 {seconds(summary['latency_p50_s'])}, p95 {seconds(summary['latency_p95_s'])}, "
+              f"first token p50 {seconds(summary['ttft_p50_s'])}")
+        print(f"Tokens: {summary['input_tokens']:,} in, {summary['output_tokens']:,} out "
+              f"({summary['output_tokens_per_s'] or 'n/a'} output tokens/s)")
+        print(f"Throughput: {summary['pages']} pages in {summary['elapsed_s']:.1f}s "
+              f"({summary['pages_per_minute'] or 'n/a'} pages/min)")
+        print(f"Estimated cost: ${summary['cost_usd']:.4f}")
+        if self.jsonl_path is not None:
+            print(f"[OK] Telemetry saved to: {self.jsonl_path}")
+        return summary
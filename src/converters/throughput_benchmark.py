@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Throughput Benchmark
+Purpose: Measure end-to-end pages/minute of the conversion pipeline across concurrency levels and chunk sizes
+Strategy: Run the real engine (chunking, scheduler, streaming, retries) against the local mock API server,
+          replaying a cassette or synthesised responses with injected latency and errors, so numbers are
+          repeatable and cost nothing
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+from config.settings import DEFAULT_PROFILE, REQUESTS_PER_MINUTE, TOKENS_PER_MINUTE
+from .conversion_engine import convert_pdf_to_markdown
+from .converter_session import ConverterSession
+from .mock_api_server import MockAPIServer, MockBehaviour, parse_behaviour, parse_options
+from .pdf_chunking import parse_pages_per_chunk
+from .request_scheduler import RequestScheduler
+from .telemetry import TelemetryRecorder
+
+def run_benchmark(pdf_path: str, concurrency_levels: Sequence[int] = (1, 2, 4, 8),
+                  chunk_sizes: Sequence[Union[int, str]] = (5,), behaviour: Optional[MockBehaviour] = None,
+                  cassette: Optional[str] = None, record: bool = False, profile: str = DEFAULT_PROFILE,
+                  requests_per_minute: float = REQUESTS_PER_MINUTE,
+                  tokens_per_minute: float = TOKENS_PER_MINUTE,
+                  cached_document: bool = False) -> List[Dict]:
+    """
+    Convert pdf_path once per (concurrency, chunk size) combination against a mock server.
+
+    Returns one result per run: pages/minute, latency percentiles, retries and errors.
+    Rate limits default to the configured ones, so the scheduler is part of what is measured.
+    """
+    results = []
+    with MockAPIServer(behaviour=behaviour, cassette=cassette, record=record) as server:
+        for pages_per_chunk in chunk_sizes:
+            for workers in concurrency_levels:
+                # A fresh session per run: no warm connections or rate-limit debt carried between runs
+                scheduler = RequestScheduler(requests_per_minute, tokens_per_minute)
+                session = ConverterSession("mock-key", scheduler=scheduler, base_url=server.base_url)
+                telemetry = TelemetryRecorder()
+                errors_before = server.stats['errors'] + server.stats['rate_limited']
+
+                started = time.monotonic()
+                try:
+                    convert_pdf_to_markdown(pdf_path, "mock-key", pages_per_chunk, workers, session=session,
+                                            profile=profile, cached_document=cached_document, telemetry=telemetry)
+                finally:
+                    session.close()
+                elapsed = time.monotonic() - started
+
+                summary = telemetry.summary()
+                result = {
+                    'pages_per_chunk': pages_per_chunk,
+                    'workers': workers,
+                    'pages': summary['pages'],
+                    'seconds': round(elapsed, 2),
+                    'pages_per_minute': round(summary['pages'] * 60 / elapsed, 1) if elapsed else None,
+                    'requests': summary['requests'],
+                    'latency_p50_s': summary['latency_p50_s'],
+                    'latency_p95_s': summary['latency_p95_s'],
+                    'ttft_p50_s': summary['ttft_p50_s'],
+                    'retries': summary['retries'],
+                    'injected_errors': server.stats['errors'] + server.stats['rate_limited'] - errors_before,
+                    'failed_requests': summary['failed_requests'],
+                }
+                results.append(result)
+                print(f"[OK] {pages_per_chunk} pages/chunk, {workers} workers: "
+                      f"{result['pages_per_minute']} pages/min ({result['seconds']}s)")
+        print(f"[INFO] Mock server: {server.stats}")
+    return results
+
+def print_results(results: List[Dict]):
+    print("\nTHROUGHPUT BENCHMARK")
+    print("=" * 78)
+    print(f"{'Pages/chunk':<12}{'Workers':>8}{'Pages/min':>11}{'Seconds':>9}{'p50 lat':>9}{'p95 lat':>9}"
+          f"{'Retries':>9}{'Errors':>8}")
+    print("-" * 78)
+    for r in results:
+        p50 = f"{r['latency_p50_s']:.2f}" if r['latency_p50_s'] is not None else "n/a"
+        p95 = f"{r['latency_p95_s']:.2f}" if r['latency_p95_s'] is not None else "n/a"
+        print(f"{str(r['pages_per_chunk']):<12}{r['workers']:>8}{str(r['pages_per_minute']):>11}{r['seconds']:>9}"
+              f"{p50:>9}{p95:>9}{r['retries']:>9}{r['injected_errors']:>8}")
+
+def main():
+    """
+    Usage: <pdf_path> [--concurrency=1,2,4,8] [--pages=5|2,5,10|auto] [--cassette=FILE] [--record]
+           [--profile=NAME] [--rpm=N] [--tpm=N] [--cached-document] [--output=results.json]
+           plus the mock server's latency/error options (--latency, --tps, --error-rate, --rate-limit-rate, ...)
+    """
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    options = parse_options(sys.argv[1:])
+    if not args:
+        print("Usage: python -m src.converters.throughput_benchmark <pdf_path> [--concurrency=1,2,4] [--pages=2,5]")
+        sys.exit(1)
+
+    pdf_path = args[0]
+    if not Path(pdf_path).exists():
+        print(f"[ERROR] PDF file not found: {pdf_path}")
+        sys.exit(1)
+
+    try:
+        concurrency_levels = [int(value) for value in options.get('concurrency', '1,2,4,8').split(',')]
+        chunk_sizes = [parse_pages_per_chunk(value) for value in options.get('pages', '5').split(',')]
+        behaviour = parse_behaviour(options)
+        rpm = float(options.get('rpm', REQUESTS_PER_MINUTE))
+        tpm = float(options.get('tpm', TOKENS_PER_MINUTE))
+    except ValueError as e:
+        print(f"[ERROR] Invalid option: {e}")
+        sys.exit(1)
+
+    print("CONVERTER THROUGHPUT BENCHMARK (mock API)")
+    print("-" * 50)
+    print(f"PDF: {pdf_path}")
+    print(f"Concurrency: {concurrency_levels}, pages per chunk: {chunk_sizes}")
+    print(f"Latency: {behaviour.first_token_median}s median to first token, {behaviour.tokens_per_second} tokens/s, "
+          f"time scale {behaviour.time_scale}x")
+    print(f"Injected: {behaviour.error_rate:.0%} 5xx, {behaviour.rate_limit_rate:.0%} 429")
+
+    results = run_benchmark(pdf_path, concurrency_levels, chunk_sizes, behaviour,
+                            cassette=options.get('cassette') or None, record='record' in options,
+                            profile=options.get('profile', DEFAULT_PROFILE), requests_per_minute=rpm,
+                            tokens_per_minute=tpm, cached_document='cached-document' in options)
+    print_results(results)
+
+    if options.get('output'):
+        with open(options['output'], 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n[OK] Results saved to: {options['output']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Watch Folder
+Purpose: Convert PDFs as they land in an inbox instead of re-scanning and re-converting everything on a schedule
+Strategy: File events from watchdog (inotify) when installed, otherwise periodic rescans; a PDF is converted once it
+          has stopped changing and ends with its trailer. The batch manifest (keyed by source hash) skips documents
+          already done, so a restart only picks up new, changed or unfinished files. Finished Markdown and its
+          validation are moved into the outbox in one step
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple, Union
+
+from config.settings import (
+    BATCH_MANIFEST_NAME,
+    CASCADE_MIN_SOURCE_WORDS,
+    DEFAULT_PROFILE,
+    MAX_CONCURRENT_CHUNKS,
+    PAGE_INDEX_ENABLED,
+    RESPONSE_CACHE_ENABLED,
+    TELEMETRY_ENABLED,
+    WATCH_OUTBOX_NAME,
+    WATCH_POLL_SECONDS,
+    WATCH_SETTLE_SECONDS,
+    WATCH_STATE_DIR,
+    WATCH_WORKERS,
+    WORD_FIDELITY_THRESHOLD,
+)
+from ..validators.word_fidelity_validator import score_text_fidelity
+from .batch_converter import BatchManifest
+from .conversion_engine import iter_markdown_parts, output_tag
+from .conversion_journal import ConversionJournal, file_sha256
+from .converter_session import ConverterSession, get_session
+from .model_profiles import get_profile
+from .page_fingerprints import PageFingerprintIndex
+from .pdf_chunking import parse_pages_per_chunk
+from .response_cache import ResponseCache
+from .streaming_pipeline import write_markdown_parts
+from .telemetry import TelemetryRecorder
+from ..utils.pdf_document import PdfArg, PDFDocument, use_document
+
+Signature = Tuple[int, int]  # (size, mtime_ns)
+
+def file_signature(path: Path) -> Optional[Signature]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+def looks_complete(path: Path) -> bool:
+    """A PDF still being copied usually lacks its trailing %%EOF"""
+    try:
+        with open(path, 'rb') as f:
+            if f.read(5) != b"%PDF-":
+                return False
+            f.seek(max(0, path.stat().st_size - 1024))
+            return b"%%EOF" in f.read()
+    except OSError:
+        return False
+
+def validate_output(pdf: PdfArg, markdown_path: str) -> Dict:
+    """Word fidelity of the Markdown against the PDF text layer (no score for scans without one)"""
+    with use_document(pdf) as document:
+        source_text = document.text()
+    markdown_text = Path(markdown_path).read_text(encoding='utf-8')
+    score = score_text_fidelity(source_text, markdown_text, CASCADE_MIN_SOURCE_WORDS)
+    return {
+        'word_fidelity': round(score, 1) if score is not None else None,
+        'threshold': WORD_FIDELITY_THRESHOLD,
+        'passed': None if score is None else score >= WORD_FIDELITY_THRESHOLD,
+    }
+
+class FolderWatcher:
+    """Debounces PDFs arriving in an inbox and converts them on a thread pool sharing one session"""
+
+    def __init__(self, inbox: str, outbox: Optional[str] = None, api_key: Optional[str] = None,
+                 profile: str = DEFAULT_PROFILE, workers: int = WATCH_WORKERS,
+                 pages_per_chunk: Optional[Union[int, str]] = None, hybrid: bool = False, cascade: bool = False,
+                 poll_seconds: float = WATCH_POLL_SECONDS, settle_seconds: float = WATCH_SETTLE_SECONDS,
+                 use_events: bool = True, session: Optional[ConverterSession] = None,
+                 cache: Optional[ResponseCache] = None, page_index: Optional[PageFingerprintIndex] = None,
+                 chunk_workers: int = MAX_CONCURRENT_CHUNKS):
+        self.inbox = Path(inbox)
+        if not self.inbox.is_dir():
+            raise FileNotFoundError(f"Inbox directory not found: {inbox}")
+        self.outbox = Path(outbox) if outbox else self.inbox.parent / WATCH_OUTBOX_NAME
+        self.state_dir = self.outbox / WATCH_STATE_DIR
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+
+        self.api_key = api_key
+        self.profile = get_profile(profile)
+        self.tag = output_tag(self.profile, cascade)
+        self.workers = max(1, workers)
+        self.pages_per_chunk = pages_per_chunk
+        self.hybrid = hybrid
+        self.cascade = cascade
+        self.poll_seconds = poll_seconds
+        self.settle_seconds = settle_seconds
+        self.use_events = use_events
+        self.chunk_workers = chunk_workers
+
+        self.session = session if session is not None else get_session(api_key)
+        self.cache = cache
+        self.page_index = page_index
+        self.manifest = BatchManifest(self.state_dir / BATCH_MANIFEST_NAME)
+
+        self._lock = threading.Lock()
+        self._pending: Dict[Path, Tuple[Signature, float]] = {}  # Candidate -> (signature, unchanged since)
+        self._handled: Dict[Path, Signature] = {}  # Signature each file had when it was last taken
+        self._in_flight: Set[Path] = set()
+        self._executor = None
+        self._observer = None
+        self._thread = None
+        self._stopping = threading.Event()
+
+    def note(self, path: Path):
+        """Register a new or modified inbox file; it is taken once it settles"""
+        path = Path(path)
+        if path.parent != self.inbox or path.suffix.lower() != '.pdf':
+            return
+        signature = file_signature(path)
+        with self._lock:
+            if signature is None:
+                self._pending.pop(path, None)
+                return
+            if self._handled.get(path) == signature:
+                return
+            if path not in self._pending or self._pending[path][0] != signature:
+                self._pending[path] = (signature, time.monotonic())
+
+    def scan(self):
+        for path in self.inbox.iterdir():
+            if path.is_file():
+                self.note(path)
+
+    def check_pending(self):
+        """Enqueue files that have stopped changing and look completely written"""
+        now = time.monotonic()
+        with self._lock:
+            candidates = list(self._pending.items())
+        for path, (signature, since) in candidates:
+            current = file_signature(path)
+            with self._lock:
+                if current is None:
+                    self._pending.pop(path, None)
+                    continue
+                if current != signature:
+                    self._pending[path] = (current, now)  # Still being written
+                    continue
+                if now - since < self.settle_seconds or path in self._in_flight:
+                    continue
+            if not looks_complete(path):
+                continue  # Settled but truncated: wait for the copy to finish
+            with self._lock:
+                self._pending.pop(path, None)
+                self._handled[path] = signature
+            self._enqueue(path)
+
+    def _enqueue(self, path: Path):
+        source_sha256 = file_sha256(path)
+        if self.manifest.converted_output(source_sha256, self.tag):
+            print(f"[INFO] {path.name} already converted - skipping")
+            return
+        with self._lock:
+            self._in_flight.add(path)
+        print(f"[INFO] Queued {path.name}")
+        self._executor.submit(self._convert, path, source_sha256)
+
+    def _convert(self, path: Path, source_sha256: str) -> Dict:
+        started = time.time()
+        # The content hash keeps a new version of a same-named PDF from overwriting the earlier output,
+        # which the manifest still points at
+        output_name = f"{path.stem}_{self.tag}_{source_sha256[:12]}.md"
+        staging_path = self.state_dir / output_name
+        result = {'source_path': str(path), 'source_sha256': source_sha256, 'output_tag': self.tag,
+                  'output_path': str(staging_path), 'status': 'failed', 'characters': None, 'error': None,
+                  'started_at': datetime.now().isoformat(timespec='seconds')}
+        try:
+            # A journal left by an interrupted or partly failed run means only the missing chunks are sent
+            journal = ConversionJournal.for_pdf(str(path), self.tag)
+            telemetry = (TelemetryRecorder(staging_path.with_suffix('.telemetry.jsonl'))
+                         if TELEMETRY_ENABLED else None)
+            # One parse shared by the conversion and its validation
+            with PDFDocument(path) as document:
+                markdown_parts = iter_markdown_parts(document, self.api_key, self.pages_per_chunk, self.chunk_workers,
+                                                     session=self.session, cache=self.cache,
+                                                     resume=journal.journal_path.exists(), hybrid=self.hybrid,
+                                                     profile=self.profile, cascade=self.cascade,
+                                                     page_index=self.page_index, telemetry=telemetry)
+                result['characters'] = write_markdown_parts(markdown_parts, str(staging_path))
+
+                if journal.journal_path.exists():
+                    # Some chunks failed; the output stays in the state directory until a later run completes it
+                    result['status'] = 'partial'
+                else:
+                    validation = dict(validate_output(document, str(staging_path)), source=path.name,
+                                      source_sha256=source_sha256)
+                    validation_path = staging_path.with_suffix('.validation.json')
+                    validation_path.write_text(json.dumps(validation, indent=2), encoding='utf-8')
+                    # Validation first, Markdown last: a consumer seeing the .md finds its report already there
+                    os.replace(validation_path, self.outbox / validation_path.name)
+                    os.replace(staging_path, self.outbox / output_name)
+                    result['output_path'] = str(self.outbox / output_name)
+                    result['status'] = 'converted'
+                    result['word_fidelity'] = validation['word_fidelity']
+        except Exception as e:
+            result['error'] = str(e)
+        finally:
+            with self._lock:
+                self._in_flight.discard(path)
+
+        result['duration_seconds'] = round(time.time() - started, 2)
+        self.manifest.record(result)
+        if result['status'] == 'converted':
+            fidelity = result['word_fidelity']
+            note = f", word fidelity {fidelity:.1f}%" if fidelity is not None else ", no text layer to validate"
+            level = "[WARNING]" if fidelity is not None and fidelity < WORD_FIDELITY_THRESHOLD else "[OK]"
+            print(f"{level} {path.name} -> {result['output_path']} in {result['duration_seconds']}s{note}")
+        elif result['status'] == 'partial':
+            print(f"[WARNING] {path.name} converted with failed chunks - restart the watcher to retry them")
+        else:
+            print(f"[ERROR] {path.name}: {result['error']}")
+        return result
+
+    def _start_observer(self) -> bool:
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            return False
+
+        watcher = self
+
+        class InboxHandler(FileSystemEventHandler):
+            def on_created(self, event):
+                if not event.is_directory:
+                    watcher.note(Path(event.src_path))
+
+            on_modified = on_created
+
+            def on_moved(self, event):
+                if not event.is_directory:
+                    watcher.note(Path(event.dest_path))
+
+        self._observer = Observer()
+        self._observer.schedule(InboxHandler(), str(self.inbox), recursive=False)
+        self._observer.start()
+        return True
+
+    def start(self) -> 'FolderWatcher':
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="watch-worker")
+        if self.use_events and self._start_observer():
+            print(f"[INFO] Watching {self.inbox} for file events")
+        else:
+            if self.use_events:
+                print("[INFO] watchdog not installed - polling instead (pip install watchdog for instant pick-up)")
+            print(f"[INFO] Polling {self.inbox} every {self.poll_seconds}s")
+        self.scan()  # Files that arrived while the watcher was down
+        self._thread = threading.Thread(target=self._loop, name="watch-folder", daemon=True)
+        self._thread.start()
+        return self
+
+    def _loop(self):
+        next_scan = time.monotonic() + self.poll_seconds
+        while not self._stopping.wait(min(1.0, self.poll_seconds)):
+            if self._observer is None and time.monotonic() >= next_scan:
+                self.scan()
+                next_scan = time.monotonic() + self.poll_seconds
+            self.check_pending()
+
+    def idle(self) -> bool:
+        with self._lock:
+            return not self._pending and not self._in_flight
+
+    def stop(self):
+        """Stop watching and let conversions already started finish"""
+        self._stopping.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+def main():
+    """
+    Watch an inbox until interrupted.
+
+    Usage: <inbox> [--outbox=PATH] [--profile=NAME] [--workers=N] [--pages-per-chunk=N|auto]
+           [--poll-seconds=N] [--settle-seconds=N] [--poll] [--hybrid] [--cascade]
+    """
+
+    # --flags can appear anywhere; the remaining arguments are positional
+    flags = [arg for arg in sys.argv[1:] if arg.startswith('--')]
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    options = dict(flag[2:].split('=', 1) for flag in flags if '=' in flag)
+    switches = {flag for flag in flags if '=' not in flag}
+    if '--help' in switches:
+        print("Usage: <inbox> [--outbox=PATH] [--profile=NAME] [--workers=N] [--pages-per-chunk=N|auto]"
+              " [--poll-seconds=N] [--settle-seconds=N] [--poll] [--hybrid] [--cascade]")
+        return
+
+    print("PDF to Markdown Watch Folder")
+    print("-" * 50)
+
+    if len(args) > 0:
+        inbox = args[0].strip()
+    else:
+        inbox = input("Enter the inbox directory to watch: ").strip()
+
+    try:
+        pages_per_chunk = parse_pages_per_chunk(options['pages-per-chunk']) if 'pages-per-chunk' in options else None
+        workers = int(options.get('workers', WATCH_WORKERS))
+        poll_seconds = float(options.get('poll-seconds', WATCH_POLL_SECONDS))
+        settle_seconds = float(options.get('settle-seconds', WATCH_SETTLE_SECONDS))
+    except ValueError as e:
+        print(f"[ERROR] Invalid option: {e}")
+        sys.exit(1)
+
+    # Check for API key in environment or prompt for it
+    api_key = os.environ.get('ANTHROPIC_API_KEY')
+    if not api_key:
+        print("\nNo ANTHROPIC_API_KEY found in environment variables.")
+        api_key = input("Enter your Anthropic API key: ").strip()
+
+    try:
+        watcher = FolderWatcher(inbox, options.get('outbox'), api_key, profile=options.get('profile', DEFAULT_PROFILE),
+                                workers=workers, pages_per_chunk=pages_per_chunk, hybrid='--hybrid' in switches,
+                                cascade='--cascade' in switches, poll_seconds=poll_seconds,
+                                settle_seconds=settle_seconds, use_events='--poll' not in switches,
+                                cache=ResponseCache() if RESPONSE_CACHE_ENABLED else None,
+                                page_index=PageFingerprintIndex() if PAGE_INDEX_ENABLED else None)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+
+    print(f"Outbox: {watcher.outbox}")
+    watcher.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print("\n[INFO] Stopping - waiting for running conversions to finish")
+    finally:
+        watcher.stop()
+
+if __name__ == "__main__":
+    main()
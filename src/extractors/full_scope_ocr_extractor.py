@@ -7,11 +7,13 @@ Strategy: Process same pages Claude converted for proper comparison
 
 import sys
 import os
-import fitz
 import time
 
-def extract_full_scope_ocr(pdf_path, max_pages=33, output_file="full_scope_ocr_text.txt"):
-    """Extract OCR text from pages 1-33 to match Claude's scope"""
+from config.settings import PAGE_INDEX_ENABLED
+from ..utils.pdf_document import PDFDocument
+
+def extract_full_scope_ocr(pdf_path, max_pages=33, output_file="full_scope_ocr_text.txt", page_index=None):
+    """Extract OCR text from pages 1-33 to match Claude's scope (page_index reuses OCR text of known pages)"""
     print("FULL SCOPE OCR EXTRACTION")
     print("="*50)
     print(f"Target: Extract text from pages 1-{max_pages}")
@@ -20,12 +22,15 @@ def extract_full_scope_ocr(pdf_path, max_pages=33, output_file="full_scope_ocr_t
     try:
         import easyocr
         
-        print("Loading EasyOCR...")
-        reader = easyocr.Reader(['en'], verbose=False)
-        print("[OK] EasyOCR ready")
+        # Pages OCR'd in earlier documents are looked up by fingerprint instead of OCR'd again
+        signatures = []
+        if page_index is not None:
+            from ..converters.page_fingerprints import pdf_page_signatures
+            signatures = pdf_page_signatures(pdf_path)  # Same parse when pdf_path is a PDFDocument
+        reader = None
         
-        doc = fitz.open(pdf_path)
-        total_pages = len(doc)
+        doc = pdf_path if isinstance(pdf_path, PDFDocument) else PDFDocument(pdf_path)  # A shared document stays open
+        total_pages = doc.page_count
         pages_to_process = min(max_pages, total_pages)
         
         print(f"[OK] PDF opened: {total_pages} pages")
@@ -37,16 +42,24 @@ def extract_full_scope_ocr(pdf_path, max_pages=33, output_file="full_scope_ocr_t
         for page_num in range(pages_to_process):
             print(f"Processing page {page_num + 1}...", end=" ")
             
-            page = doc[page_num]
-            mat = fitz.Matrix(2.0, 2.0)  # Higher resolution for better OCR
-            pix = page.get_pixmap(matrix=mat)
-            img_data = pix.tobytes("png")
-            
-            # Run OCR
-            results = reader.readtext(img_data)
+            page_text = page_index.get_ocr_text(*signatures[page_num]) if page_index is not None else None
+            if page_text is None:
+                if reader is None:
+                    print("Loading EasyOCR...", end=" ")
+                    reader = easyocr.Reader(['en'], verbose=False)
+                
+                img_data = doc.render_png(page_num, zoom=2.0)  # Higher resolution for better OCR
+                
+                # Run OCR
+                results = reader.readtext(img_data)
+                page_text = " ".join([text for (bbox, text, confidence) in results if confidence > 0.5]) if results else ""
+                if page_index is not None:
+                    fingerprint, content_hash = signatures[page_num]
+                    page_index.put_ocr_text(fingerprint, page_text, content_hash)
+            else:
+                print("[CACHED]", end=" ")
             
-            if results:
-                page_text = " ".join([text for (bbox, text, confidence) in results if confidence > 0.5])
+            if page_text:
                 all_text.append(page_text)
                 page_chars = len(page_text)
                 total_chars += page_chars
@@ -54,7 +67,8 @@ def extract_full_scope_ocr(pdf_path, max_pages=33, output_file="full_scope_ocr_t
             else:
                 print("[WARNING] No text")
         
-        doc.close()
+        if doc is not pdf_path:
+            doc.close()
         
         # Combine all pages into single text block for comparison
         full_text = " ".join(all_text)
@@ -85,7 +99,12 @@ def main():
         print(f"[ERROR] PDF file not found: {pdf_path}")
         return
     
-    result = extract_full_scope_ocr(pdf_path, max_pages=33)
+    page_index = None
+    if PAGE_INDEX_ENABLED:
+        from ..converters.page_fingerprints import PageFingerprintIndex
+        page_index = PageFingerprintIndex()
+    
+    result = extract_full_scope_ocr(pdf_path, max_pages=33, page_index=page_index)
     
     if result:
         print(f"\n[FOUNDATION TEST PASSED]")
@@ -6,16 +6,17 @@ Purpose: Determine if PDF contains actual text or is image-based (scanned)
 
 import sys
 import os
-import fitz  # PyMuPDF
+
+from ..utils.pdf_document import MUPDF_LOCK, PDFDocument
 
 def analyze_pdf_structure(pdf_path):
-    """Analyze PDF structure to determine if it's text-based or image-based"""
+    """Analyze PDF structure to determine if it's text-based or image-based (pdf_path may be a shared PDFDocument)"""
     print("PDF STRUCTURE ANALYSIS")
     print("="*60)
     
     try:
-        doc = fitz.open(pdf_path)
-        total_pages = len(doc)
+        doc = pdf_path if isinstance(pdf_path, PDFDocument) else PDFDocument(pdf_path)
+        total_pages = doc.page_count
         print(f"Total pages: {total_pages}")
         
         # Analyze first few pages
@@ -26,23 +27,23 @@ def analyze_pdf_structure(pdf_path):
         text_based_pages = 0
         
         for page_num in range(pages_to_check):
-            page = doc[page_num]
             print(f"\nPage {page_num + 1}:")
             print("-" * 30)
             
             # Check for text
-            text = page.get_text().strip()
+            text = doc.page_text(page_num).strip()
             text_length = len(text)
             print(f"  Text characters: {text_length}")
             
             # Check for images
-            image_list = page.get_images()
+            image_list = doc.page_images(page_num)
             image_count = len(image_list)
             print(f"  Images found: {image_count}")
             
             # Check page dimensions and image coverage
             if image_count > 0:
-                page_rect = page.rect
+                with MUPDF_LOCK:
+                    page_rect = doc.fitz[page_num].rect
                 page_area = page_rect.width * page_rect.height
                 print(f"  Page dimensions: {page_rect.width:.0f} x {page_rect.height:.0f}")
                 
@@ -75,7 +76,8 @@ def analyze_pdf_structure(pdf_path):
             else:
                 print("  CLASSIFICATION: UNCLEAR")
         
-        doc.close()
+        if doc is not pdf_path:
+            doc.close()
         
         # Overall assessment
         print(f"\n" + "="*60)
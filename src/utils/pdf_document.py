@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+PDF Document
+Purpose: Open a PDF once per run and share it between conversion, OCR and validation
+Strategy: Memory-map the file; parse it with PyMuPDF and/or PyPDF2 only when a stage first asks, and cache
+          per-page text, image lists and metadata so later stages reuse what earlier ones extracted
+"""
+
+import hashlib
+import mmap
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+# MuPDF is not thread-safe: every call into a shared fitz document goes through this lock
+MUPDF_LOCK = threading.RLock()
+
+class PDFDocument:
+    """A memory-mapped PDF with lazily opened parsers and per-page caches"""
+
+    def __init__(self, pdf_path: Union[str, Path]):
+        self.path = Path(pdf_path)
+        if not self.path.exists():
+            raise FileNotFoundError(f"PDF file not found: {self.path}")
+        self._file = open(self.path, 'rb')
+        self.data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)  # Shared with the page cache
+        self.reader_lock = threading.RLock()  # PyPDF2 is not thread-safe either: hold it while using .reader
+        self._fitz_doc = None
+        self._reader = None
+        self._sha256 = None
+        self._metadata = None
+        self._page_count = None
+        self._texts: Dict[int, str] = {}
+        self._images: Dict[int, list] = {}
+
+    @property
+    def sha256(self) -> str:
+        if self._sha256 is None:
+            self._sha256 = hashlib.sha256(self.data).hexdigest()
+        return self._sha256
+
+    @property
+    def fitz(self):
+        """PyMuPDF document (opened on first use; hold MUPDF_LOCK while using it across threads)"""
+        if self._fitz_doc is None:
+            import fitz  # PyMuPDF
+            with MUPDF_LOCK:
+                if self._fitz_doc is None:
+                    self._fitz_doc = fitz.open(self.path)
+        return self._fitz_doc
+
+    @property
+    def reader(self):
+        """PyPDF2 reader over the mapped bytes (opened on first use)"""
+        if self._reader is None:
+            import PyPDF2
+            with self.reader_lock:
+                if self._reader is None:
+                    self._reader = PyPDF2.PdfReader(self.data)
+        return self._reader
+
+    @property
+    def has_fitz(self) -> bool:
+        """PyMuPDF is the faster parser; PyPDF2 is the fallback when it is not installed"""
+        try:
+            self.fitz
+            return True
+        except ImportError:
+            return False
+
+    @property
+    def page_count(self) -> int:
+        if self._page_count is None:
+            if self.has_fitz:
+                with MUPDF_LOCK:
+                    self._page_count = self.fitz.page_count
+            else:
+                self._page_count = len(self.reader.pages)
+        return self._page_count
+
+    @property
+    def metadata(self) -> Dict[str, str]:
+        if self._metadata is None:
+            if self.has_fitz:
+                with MUPDF_LOCK:
+                    self._metadata = {key: value for key, value in (self.fitz.metadata or {}).items() if value}
+            else:
+                self._metadata = {key.lstrip('/'): str(value) for key, value in (self.reader.metadata or {}).items()}
+        return self._metadata
+
+    def page_text(self, page_num: int) -> str:
+        """Text layer of one page (0-based), extracted once"""
+        text = self._texts.get(page_num)
+        if text is None:
+            if self.has_fitz:
+                with MUPDF_LOCK:
+                    text = self.fitz[page_num].get_text()
+            else:
+                with self.reader_lock:
+                    text = self.reader.pages[page_num].extract_text() or ""
+            self._texts[page_num] = text
+        return text
+
+    def text(self, start_page: int = 0, end_page: Optional[int] = None) -> str:
+        """Text layer of pages [start_page, end_page) (0-based), one page per line block"""
+        end_page = self.page_count if end_page is None else end_page
+        return "\n".join(self.page_text(page_num) for page_num in range(start_page, end_page))
+
+    def page_texts(self) -> List[str]:
+        return [self.page_text(page_num) for page_num in range(self.page_count)]
+
+    def page_images(self, page_num: int) -> list:
+        """PyMuPDF image list of one page (0-based): (xref, smask, width, height, bpc, colorspace, ...)"""
+        images = self._images.get(page_num)
+        if images is None:
+            with MUPDF_LOCK:
+                images = self.fitz[page_num].get_images(full=True)
+            self._images[page_num] = images
+        return images
+
+    def render_png(self, page_num: int, zoom: float = 2.0) -> bytes:
+        """Page rendered at zoom x 72 dpi as PNG bytes (not cached - OCR reads each page once)"""
+        import fitz  # PyMuPDF
+        with MUPDF_LOCK:
+            pix = self.fitz[page_num].get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+            return pix.tobytes("png")
+
+    def close(self):
+        if self._fitz_doc is not None:
+            with MUPDF_LOCK:
+                self._fitz_doc.close()
+            self._fitz_doc = None
+        self._reader = None
+        if not self.data.closed:
+            try:
+                self.data.close()
+            except BufferError:
+                pass  # A parser still holds a view of the bytes; the map goes with it
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+PdfArg = Union[str, Path, PDFDocument]
+
+@contextmanager
+def use_document(pdf: PdfArg) -> Iterator[PDFDocument]:
+    """The caller's shared document as-is, or a document opened (and closed) just for this block"""
+    if isinstance(pdf, PDFDocument):
+        yield pdf
+    else:
+        with PDFDocument(pdf) as document:
+            yield document
+
+def document_path(pdf: PdfArg) -> Path:
+    return pdf.path if isinstance(pdf, PDFDocument) else Path(pdf)
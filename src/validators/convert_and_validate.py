@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Convert and Validate
+Purpose: Convert a PDF and validate the Markdown in one run instead of convert_pdf_*.bat followed by run_full_validation.bat
+Strategy: Open the PDF once as a shared PDFDocument; OCR the validation pages on a background thread while the
+          API conversion streams into the output file, so wall time is close to max(convert, OCR), then compare
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Optional, Union
+
+from config.settings import (
+    DEFAULT_PROFILE,
+    MAX_CONCURRENT_CHUNKS,
+    PAGE_INDEX_ENABLED,
+    PIPELINE_OCR_PAGES,
+    RESPONSE_CACHE_ENABLED,
+    TELEMETRY_ENABLED,
+)
+from ..converters.conversion_engine import iter_markdown_parts, output_tag
+from ..converters.converter_session import ConverterSession
+from ..converters.model_profiles import get_profile
+from ..converters.page_fingerprints import PageFingerprintIndex
+from ..converters.pdf_chunking import parse_pages_per_chunk
+from ..converters.response_cache import ResponseCache
+from ..converters.streaming_pipeline import write_markdown_parts
+from ..converters.telemetry import TelemetryRecorder
+from ..extractors.full_scope_ocr_extractor import extract_full_scope_ocr
+from ..utils.pdf_document import PDFDocument
+from .pdf_validation_system import extract_pdf_text_ocr, run_validation_comparison
+
+# OCR steps: each takes (pdf, output_file=, max_pages=, page_index=) and returns the output file or None
+OCR_STEPS = {'pages': extract_pdf_text_ocr, 'full-scope': extract_full_scope_ocr}
+
+def write_text_layer_reference(document: PDFDocument, output_file: str, max_pages: int) -> Optional[str]:
+    """Validation reference from the PDF's own text layer (already cached by the conversion), in the OCR file format"""
+    pages = min(max_pages, document.page_count)
+    all_text = [f"=== PAGE {page_num + 1} ===\n{text}\n" for page_num in range(pages)
+                if (text := document.page_text(page_num).strip())]
+    full_text = "\n".join(all_text)
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(full_text)
+    return output_file if len(full_text) > 100 else None
+
+def convert_and_validate(pdf_path: str, api_key: Optional[str] = None,
+                         pages_per_chunk: Optional[Union[int, str]] = None,
+                         max_workers: int = MAX_CONCURRENT_CHUNKS,
+                         profile: str = DEFAULT_PROFILE,
+                         ocr_pages: int = PIPELINE_OCR_PAGES,
+                         output_path: Optional[str] = None,
+                         session: Optional[ConverterSession] = None,
+                         cache: Optional[ResponseCache] = None,
+                         page_index: Optional[PageFingerprintIndex] = None,
+                         hybrid: bool = False,
+                         cascade: bool = False,
+                         telemetry: Optional[TelemetryRecorder] = None,
+                         ocr: Callable = extract_pdf_text_ocr) -> Dict:
+    """
+    Convert pdf_path to Markdown while its first ocr_pages pages are OCR'd, then validate one against the other.
+
+    Output goes to output_path (default: next to the PDF, named like the converters' output), with the
+    OCR reference (.ocr.txt) and the validation report (.validation.txt) beside it. ocr is the OCR step
+    (see OCR_STEPS); without EasyOCR the PDF's text layer is used as the reference. Returns paths,
+    stage timings and the comparison results (None when no reference text could be extracted).
+    """
+    profile = get_profile(profile)
+    if output_path is None:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_path = Path(pdf_path).parent / f"{Path(pdf_path).stem}_{output_tag(profile, cascade)}_{timestamp}.md"
+    output_path = Path(output_path)
+    ocr_file = str(output_path.with_suffix('.ocr.txt'))
+    report_file = str(output_path.with_suffix('.validation.txt'))
+
+    timings = {}
+
+    def run_ocr() -> Optional[str]:
+        started = time.perf_counter()
+        try:
+            return ocr(document, output_file=ocr_file, max_pages=ocr_pages, page_index=page_index)
+        finally:
+            timings['ocr_seconds'] = round(time.perf_counter() - started, 2)
+
+    started = time.perf_counter()
+    with PDFDocument(pdf_path) as document, ThreadPoolExecutor(max_workers=1) as executor:
+        # OCR only reads the PDF, so it need not wait for the conversion; rendering shares the conversion's parse
+        ocr_future = executor.submit(run_ocr)
+
+        parts = iter_markdown_parts(document, api_key, pages_per_chunk, max_workers, session, cache,
+                                    hybrid=hybrid, profile=profile, cascade=cascade, page_index=page_index,
+                                    telemetry=telemetry)
+        total_length = write_markdown_parts(parts, output_path)
+        timings['convert_seconds'] = round(time.perf_counter() - started, 2)
+        print(f"[OK] Markdown saved to: {output_path} ({total_length} characters)")
+
+        reference_file = ocr_future.result()
+        if reference_file is None:
+            print("[WARNING] No OCR text - validating against the PDF text layer instead")
+            reference_file = write_text_layer_reference(document, ocr_file, ocr_pages)
+
+    results = None
+    if reference_file is not None:
+        results = run_validation_comparison(reference_file, str(output_path), report_file)
+    else:
+        print("[ERROR] No reference text could be extracted - validation skipped")
+    timings['total_seconds'] = round(time.perf_counter() - started, 2)
+
+    return {
+        'markdown_path': str(output_path),
+        'reference_path': reference_file,
+        'report_path': report_file if results else None,
+        'results': results,
+        **timings,
+    }
+
+def main():
+    """
+    Usage: <pdf_path> [pages_per_chunk|auto] [max_workers] [--profile=NAME] [--ocr-pages=N] [--full-scope]
+           [--hybrid] [--cascade]
+    """
+    usage = ("Usage: python -m src.validators.convert_and_validate <pdf_path> [pages_per_chunk|auto] [max_workers]"
+             " [--profile=NAME] [--ocr-pages=N] [--full-scope] [--hybrid] [--cascade]")
+    flags = {arg for arg in sys.argv[1:] if arg.startswith('--')}
+    options = dict(flag[2:].split('=', 1) for flag in flags if '=' in flag)
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    if '--help' in flags or not args:
+        print(usage)
+        sys.exit(0 if '--help' in flags else 1)
+
+    pdf_path = args[0]
+    if not os.path.exists(pdf_path):
+        print(f"[ERROR] PDF file not found: {pdf_path}")
+        sys.exit(1)
+
+    try:
+        profile = get_profile(options.get('profile', DEFAULT_PROFILE))
+        pages_per_chunk = parse_pages_per_chunk(args[1]) if len(args) > 1 else None
+        max_workers = int(args[2]) if len(args) > 2 else MAX_CONCURRENT_CHUNKS
+        ocr_pages = int(options.get('ocr-pages', PIPELINE_OCR_PAGES))
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+
+    api_key = os.environ.get('ANTHROPIC_API_KEY')
+    if not api_key:
+        print("[ERROR] ANTHROPIC_API_KEY environment variable not set")
+        sys.exit(1)
+
+    print("CONVERT AND VALIDATE")
+    print("="*60)
+    print(f"PDF Source: {os.path.basename(pdf_path)}")
+    print(f"Profile: {profile.name}, OCR reference: first {ocr_pages} pages")
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_path = Path(pdf_path).parent / f"{Path(pdf_path).stem}_{output_tag(profile, '--cascade' in flags)}_{timestamp}.md"
+    try:
+        summary = convert_and_validate(
+            pdf_path, api_key, pages_per_chunk, max_workers, profile.name, ocr_pages, str(output_path),
+            cache=ResponseCache() if RESPONSE_CACHE_ENABLED else None,
+            page_index=PageFingerprintIndex() if PAGE_INDEX_ENABLED else None,
+            hybrid='--hybrid' in flags, cascade='--cascade' in flags,
+            telemetry=TelemetryRecorder(output_path.with_suffix('.telemetry.jsonl')) if TELEMETRY_ENABLED else None,
+            ocr=OCR_STEPS['full-scope' if '--full-scope' in flags else 'pages'],
+        )
+    except (FileNotFoundError, ValueError) as e:
+        print(f"\n[ERROR] {e}")
+        sys.exit(1)
+
+    print(f"\n{'='*60}")
+    print("CONVERT AND VALIDATE - SUMMARY")
+    print("="*60)
+    print(f"Conversion: {summary['convert_seconds']:.1f}s, OCR: {summary.get('ocr_seconds', 0):.1f}s (overlapped),"
+          f" total: {summary['total_seconds']:.1f}s")
+    print(f"Markdown: {summary['markdown_path']}")
+    results = summary['results']
+    if not results:
+        print("[ERROR] Validation did not run")
+        sys.exit(1)
+    print(f"Word Fidelity: {results['word_fidelity']:.1f}%")
+    print(f"Grammar Preservation: {results['grammar_score']:.1f}%")
+    print(f"Header Structure: {results['header_score']:.1f}%")
+    print(f"Overall Quality: {results['overall_score']:.1f}%")
+    print(f"[OK] Report: {summary['report_path']}")
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,8 @@
 import os
 import sys
 import re
-import PyPDF2
 import io
+import importlib.util
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Tuple, Optional
@@ -10,30 +10,16 @@ from dataclasses import dataclass
 import difflib
 import statistics
 
-# Try to import alternative PDF libraries
-try:
-    import pdfplumber
-    PDFPLUMBER_AVAILABLE = True
-except ImportError:
-    PDFPLUMBER_AVAILABLE = False
+from ..utils.pdf_document import PdfArg, PDFDocument, document_path
 
-try:
-    import pymupdf  # fitz
-    PYMUPDF_AVAILABLE = True
-except ImportError:
-    try:
-        import fitz
-        PYMUPDF_AVAILABLE = True
-    except ImportError:
-        PYMUPDF_AVAILABLE = False
+# Optional libraries are only looked up here; each is imported the first time it is used
+# (sentence_transformers pulls in torch, which takes seconds)
+def _installed(module_name: str) -> bool:
+    return importlib.util.find_spec(module_name) is not None
 
-# Try to import sentence transformers for semantic similarity
-SEMANTIC_ANALYSIS_AVAILABLE = False
-try:
-    from sentence_transformers import SentenceTransformer
-    SEMANTIC_ANALYSIS_AVAILABLE = True
-except ImportError:
-    pass
+PDFPLUMBER_AVAILABLE = _installed("pdfplumber")
+PYMUPDF_AVAILABLE = _installed("fitz")
+SEMANTIC_ANALYSIS_AVAILABLE = _installed("sentence_transformers")
 
 @dataclass
 class ValidationMetrics:
@@ -48,18 +34,27 @@ class ValidationMetrics:
 class PDFAccuracyValidator:
     """Validates accuracy of PDF-to-Markdown conversion"""
     
-    def __init__(self):
-        self.semantic_model = None
-        if SEMANTIC_ANALYSIS_AVAILABLE:
+    def __init__(self, semantic: bool = True):
+        self.semantic = semantic and SEMANTIC_ANALYSIS_AVAILABLE
+        self._semantic_model = None
+        self._semantic_model_loaded = False
+
+    @property
+    def semantic_model(self):
+        """Sentence transformer, loaded on first use rather than when the validator is created"""
+        if self.semantic and not self._semantic_model_loaded:
+            self._semantic_model_loaded = True
             try:
+                from sentence_transformers import SentenceTransformer
                 # Load a lightweight sentence transformer model
-                self.semantic_model = SentenceTransformer('all-MiniLM-L6-v2')
+                self._semantic_model = SentenceTransformer('all-MiniLM-L6-v2')
                 print("Semantic analysis enabled with SentenceTransformer")
             except Exception as e:
                 print(f"Warning: Could not load semantic model: {e}")
-                self.semantic_model = None
+                self._semantic_model = None
+        return self._semantic_model
     
-    def extract_text_from_pdf(self, pdf_path: str) -> Tuple[str, List[str]]:
+    def extract_text_from_pdf(self, pdf_path: PdfArg) -> Tuple[str, List[str]]:
         """Extract raw text from PDF for comparison using multiple methods"""
         full_text = ""
         pages = []
@@ -67,6 +62,9 @@ class PDFAccuracyValidator:
         # Try multiple extraction methods in order of preference
         methods = []
         
+        if isinstance(pdf_path, PDFDocument):
+            # Conversion already extracted (and cached) this document's text layer - reuse it before re-parsing
+            methods.append(("shared document", self._extract_with_document))
         if PDFPLUMBER_AVAILABLE:
             methods.append(("pdfplumber", self._extract_with_pdfplumber))
         if PYMUPDF_AVAILABLE:
@@ -76,7 +74,7 @@ class PDFAccuracyValidator:
         for method_name, method_func in methods:
             try:
                 print(f"Trying text extraction with {method_name}...")
-                full_text, pages = method_func(pdf_path)
+                full_text, pages = method_func(pdf_path if method_name == "shared document" else str(document_path(pdf_path)))
                 if len(full_text.strip()) > 100:  # If we got reasonable text
                     print(f"Successfully extracted text using {method_name}")
                     break
@@ -91,8 +89,14 @@ class PDFAccuracyValidator:
             
         return full_text.strip(), pages
     
+    def _extract_with_document(self, document: PDFDocument) -> Tuple[str, List[str]]:
+        """Extract text through a shared PDFDocument's page-text cache"""
+        pages = document.page_texts()
+        return "\n".join(pages).strip(), pages
+    
     def _extract_with_pdfplumber(self, pdf_path: str) -> Tuple[str, List[str]]:
         """Extract text using pdfplumber"""
+        import pdfplumber
         full_text = ""
         pages = []
         
@@ -122,6 +126,7 @@ class PDFAccuracyValidator:
     
     def _extract_with_pypdf2(self, pdf_path: str) -> Tuple[str, List[str]]:
         """Extract text using PyPDF2"""
+        import PyPDF2
         full_text = ""
         pages = []
         
@@ -245,7 +250,7 @@ class PDFAccuracyValidator:
         if metrics['structure_preservation'] < 0.7:
             recommendations.append("Structure preservation could be improved - consider better header and list detection")
         
-        if metrics['semantic_similarity'] < 0.7 and SEMANTIC_ANALYSIS_AVAILABLE:
+        if metrics['semantic_similarity'] < 0.7 and self.semantic:
             recommendations.append("Semantic similarity is low - content meaning may not be fully preserved")
         
         if metrics['overall_accuracy'] > 0.9:
@@ -257,10 +262,10 @@ class PDFAccuracyValidator:
         
         return recommendations
     
-    def validate_conversion(self, pdf_path: str, markdown_path: str) -> ValidationMetrics:
-        """Main validation function"""
+    def validate_conversion(self, pdf_path: PdfArg, markdown_path: str) -> ValidationMetrics:
+        """Main validation function (pdf_path may be a PDFDocument shared with the conversion)"""
         print(f"Starting validation of:")
-        print(f"  PDF: {pdf_path}")
+        print(f"  PDF: {document_path(pdf_path)}")
         print(f"  Markdown: {markdown_path}")
         
         # Extract texts
@@ -285,12 +290,12 @@ class PDFAccuracyValidator:
         structure_score = self.analyze_structure_preservation(pdf_full_text, markdown_raw)
         
         semantic_similarity = 0.0
-        if SEMANTIC_ANALYSIS_AVAILABLE and self.semantic_model:
+        if self.semantic and self.semantic_model:
             print("Calculating semantic similarity...")
             semantic_similarity = self.calculate_semantic_similarity(pdf_full_text, markdown_clean)
         
         # Calculate overall accuracy (weighted average)
-        if SEMANTIC_ANALYSIS_AVAILABLE and semantic_similarity > 0:
+        if self.semantic and semantic_similarity > 0:
             overall_accuracy = (
                 text_similarity * 0.4 + 
                 structure_score * 0.3 + 
@@ -367,8 +372,10 @@ Evaluates how well document structure (headers, lists, formatting) was maintaine
 ### Semantic Similarity ({metrics.semantic_similarity:.2%})
 """
         
-        if SEMANTIC_ANALYSIS_AVAILABLE and metrics.semantic_similarity > 0:
+        if self.semantic and metrics.semantic_similarity > 0:
             report += "Analyzes how well the meaning and context of the content was preserved.\n"
+        elif not self.semantic and SEMANTIC_ANALYSIS_AVAILABLE:
+            report += "Skipped (--no-semantic).\n"
         else:
             report += "Not available - install sentence-transformers for semantic analysis.\n"
         
@@ -410,15 +417,18 @@ def main():
     print("PDF-to-Markdown Accuracy Validator")
     print("-" * 40)
     
-    if len(sys.argv) < 3:
-        print("Usage: python pdf_accuracy_validator.py <pdf_file> <markdown_file> [output_report]")
+    switches = {arg for arg in sys.argv[1:] if arg.startswith('--')}
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+
+    if '--help' in switches or len(args) < 2:
+        print("Usage: python pdf_accuracy_validator.py <pdf_file> <markdown_file> [output_report] [--no-semantic]")
         print("\nExample:")
         print('python pdf_accuracy_validator.py "document.pdf" "document.md" "validation_report.md"')
-        sys.exit(1)
+        sys.exit(0 if '--help' in switches else 1)
     
-    pdf_path = sys.argv[1]
-    markdown_path = sys.argv[2]
-    output_report = sys.argv[3] if len(sys.argv) > 3 else None
+    pdf_path = args[0]
+    markdown_path = args[1]
+    output_report = args[2] if len(args) > 2 else None
     
     # Validate file paths
     if not os.path.exists(pdf_path):
@@ -431,7 +441,7 @@ def main():
     
     try:
         # Create validator
-        validator = PDFAccuracyValidator()
+        validator = PDFAccuracyValidator(semantic='--no-semantic' not in switches)
         
         # Run validation
         metrics = validator.validate_conversion(pdf_path, markdown_path)
@@ -8,23 +8,28 @@ Strategy: Combine OCR extraction with comparison engine for full validation
 import sys
 import os
 import time
+
+from config.settings import PAGE_INDEX_ENABLED
+from ..utils.pdf_document import PDFDocument
 from ..utils.text_comparison_engine import TextComparisonEngine
 
-def extract_pdf_text_ocr(pdf_path, output_file="extracted_pdf_text.txt", max_pages=5):
-    """Extract text from PDF using OCR and save to file"""
+def extract_pdf_text_ocr(pdf_path, output_file="extracted_pdf_text.txt", max_pages=5, page_index=None):
+    """Extract text from PDF using OCR and save to file (page_index reuses OCR text of known pages)"""
     print("STEP 1: OCR TEXT EXTRACTION")
     print("="*50)
     
     try:
         import easyocr
-        import fitz
         
-        print("Loading EasyOCR...")
-        reader = easyocr.Reader(['en'], verbose=False)
-        print("[OK] EasyOCR ready")
+        # Pages OCR'd in earlier documents are looked up by fingerprint instead of OCR'd again
+        signatures = []
+        if page_index is not None:
+            from ..converters.page_fingerprints import pdf_page_signatures
+            signatures = pdf_page_signatures(pdf_path)  # Same parse when pdf_path is a PDFDocument
+        reader = None
         
-        doc = fitz.open(pdf_path)
-        total_pages = len(doc)
+        doc = pdf_path if isinstance(pdf_path, PDFDocument) else PDFDocument(pdf_path)  # A shared document stays open
+        total_pages = doc.page_count
         pages_to_process = min(max_pages, total_pages)
         
         print(f"[OK] PDF opened: {total_pages} pages")
@@ -35,22 +40,31 @@ def extract_pdf_text_ocr(pdf_path, output_file="extracted_pdf_text.txt", max_pag
         for page_num in range(pages_to_process):
             print(f"Processing page {page_num + 1}...", end=" ")
             
-            page = doc[page_num]
-            mat = fitz.Matrix(2.0, 2.0)  # Higher resolution for better OCR
-            pix = page.get_pixmap(matrix=mat)
-            img_data = pix.tobytes("png")
-            
-            # Run OCR
-            results = reader.readtext(img_data)
+            page_text = page_index.get_ocr_text(*signatures[page_num]) if page_index is not None else None
+            if page_text is None:
+                if reader is None:
+                    print("Loading EasyOCR...", end=" ")
+                    reader = easyocr.Reader(['en'], verbose=False)
+                
+                img_data = doc.render_png(page_num, zoom=2.0)  # Higher resolution for better OCR
+                
+                # Run OCR
+                results = reader.readtext(img_data)
+                page_text = " ".join([text for (bbox, text, confidence) in results if confidence > 0.5]) if results else ""
+                if page_index is not None:
+                    fingerprint, content_hash = signatures[page_num]
+                    page_index.put_ocr_text(fingerprint, page_text, content_hash)
+            else:
+                print("[CACHED]", end=" ")
             
-            if results:
-                page_text = " ".join([text for (bbox, text, confidence) in results if confidence > 0.5])
+            if page_text:
                 all_text.append(f"=== PAGE {page_num + 1} ===\n{page_text}\n")
                 print(f"[OK] {len(page_text)} chars extracted")
             else:
                 print("[WARNING] No text extracted")
         
-        doc.close()
+        if doc is not pdf_path:
+            doc.close()
         
         # Save extracted text
         full_text = "\n".join(all_text)
@@ -136,7 +150,11 @@ def main():
         return
     
     # Step 1: Extract PDF text using OCR
-    ocr_output_file = extract_pdf_text_ocr(pdf_path, max_pages=3)
+    page_index = None
+    if PAGE_INDEX_ENABLED:
+        from ..converters.page_fingerprints import PageFingerprintIndex
+        page_index = PageFingerprintIndex()
+    ocr_output_file = extract_pdf_text_ocr(pdf_path, max_pages=3, page_index=page_index)
     
     if not ocr_output_file:
         print(f"\n{'='*60}")
@@ -9,6 +9,43 @@ import re
 from collections import Counter
 import os
 
+def extract_words(text):
+    """Extract meaningful words for fidelity comparison"""
+    # Clean text for comparison
+    # Remove markdown formatting
+    clean_text = re.sub(r'[#*_`\-\|]', ' ', text)
+    # Remove extra whitespace and page markers
+    clean_text = re.sub(r'={3,}.*?={3,}', ' ', clean_text)
+    clean_text = re.sub(r'\s+', ' ', clean_text)
+    # Convert to lowercase
+    clean_text = clean_text.lower().strip()
+    
+    # Extract words (3+ characters to avoid noise)
+    words = re.findall(r'\b[a-z]{3,}\b', clean_text)
+    return words
+
+def word_fidelity_score(source_words, target_words):
+    """Percentage of source word occurrences also present in the target (word lists or Counters)"""
+    source_counter = Counter(source_words)
+    target_counter = Counter(target_words)
+    total_source_occurrences = sum(source_counter.values())
+    if total_source_occurrences == 0:
+        return 0.0
+    total_common_occurrences = sum((source_counter & target_counter).values())
+    return (total_common_occurrences / total_source_occurrences) * 100
+
+def score_text_fidelity(source_text, target_text, min_source_words=0):
+    """
+    Word fidelity of target_text against source_text without any logging.
+
+    Returns None when the source has fewer than min_source_words words
+    (e.g. a scanned page with no text layer), since there is nothing to score against.
+    """
+    source_words = extract_words(source_text)
+    if not source_words or len(source_words) < min_source_words:
+        return None
+    return word_fidelity_score(source_words, extract_words(target_text))
+
 class WordFidelityValidator:
     def __init__(self):
         self.source_words = []
@@ -47,18 +84,7 @@ class WordFidelityValidator:
     
     def extract_words(self, text):
         """Extract meaningful words for fidelity comparison"""
-        # Clean text for comparison
-        # Remove markdown formatting
-        clean_text = re.sub(r'[#*_`\-\|]', ' ', text)
-        # Remove extra whitespace and page markers
-        clean_text = re.sub(r'={3,}.*?={3,}', ' ', clean_text)
-        clean_text = re.sub(r'\s+', ' ', clean_text)
-        # Convert to lowercase
-        clean_text = clean_text.lower().strip()
-        
-        # Extract words (3+ characters to avoid noise)
-        words = re.findall(r'\b[a-z]{3,}\b', clean_text)
-        return words
+        return extract_words(text)
     
     def calculate_word_fidelity(self):
         """Calculate word-for-word fidelity score"""
@@ -82,7 +108,7 @@ class WordFidelityValidator:
         total_common_occurrences = sum(common_words.values())
         total_source_occurrences = sum(source_counter.values())
         
-        self.fidelity_score = (total_common_occurrences / total_source_occurrences) * 100 if total_source_occurrences > 0 else 0
+        self.fidelity_score = word_fidelity_score(source_counter, target_counter)
         
         print(f"\nFIDELITY RESULTS:")
         print(f"Common words: {len(common_words)} unique types")
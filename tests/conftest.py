@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""
+Test Fixtures
+Purpose: Fixtures shared by the test modules - small PDFs whose every page has a known text layer
+"""
+
+from pathlib import Path
+
+import pytest
+
+def write_pdf(path: Path, pages: int) -> Path:
+    """Write a PDF whose page N reads "Body text of page N" """
+    import fitz  # PyMuPDF
+    doc = fitz.open()
+    for page_num in range(1, pages + 1):
+        doc.new_page().insert_text((72, 72), f"Body text of page {page_num}", fontsize=12)
+    doc.save(str(path))
+    doc.close()
+    return path
+
+@pytest.fixture
+def make_pdf():
+    """make_pdf(path, pages) -> path of a PDF written with write_pdf"""
+    return write_pdf
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test Batch Converter
+Purpose: Confirm the manifest skips finished sources, partly failed documents are marked partial, and worker
+         processes split the account rate limits
+"""
+
+import shutil
+from pathlib import Path
+
+from config.settings import REQUESTS_PER_MINUTE, TOKENS_PER_MINUTE
+from src.converters import batch_converter
+from src.converters.batch_converter import BatchManifest, run_batch
+from src.converters.conversion_engine import output_tag
+from src.converters.conversion_journal import ConversionJournal, file_sha256
+from src.converters.converter_session import ConverterSession
+from src.converters.local_backend import LocalMessagesClient
+from src.converters.model_profiles import get_profile
+
+class FailingPageClient(LocalMessagesClient):
+    """Fails every request that includes the bad page"""
+
+    def __init__(self, bad_page: int):
+        super().__init__()
+        self.bad_page = bad_page
+
+    def respond(self, model, max_tokens, messages):
+        message = super().respond(model, max_tokens, messages)
+        if f"Body text of page {self.bad_page}" in message.content[0].text:
+            raise ValueError("unreadable page")
+        return message
+
+def manifest_row(pdf_path: Path, tag: str, output_path: Path, status: str = 'converted') -> dict:
+    return {'source_sha256': file_sha256(pdf_path), 'output_tag': tag, 'source_path': str(pdf_path),
+            'output_path': str(output_path), 'status': status, 'started_at': '2026-01-01T00:00:00',
+            'duration_seconds': 1.0, 'characters': 10, 'error': None}
+
+def test_converted_sources_are_skipped(tmp_path, make_pdf):
+    pdf_dir = tmp_path / "pdfs"
+    pdf_dir.mkdir()
+    pdf_path = make_pdf(pdf_dir / "doc.pdf", 2)
+    shutil.copy(pdf_path, pdf_dir / "copy.pdf")  # Same bytes under another name
+    tag = output_tag(get_profile("sonnet"), False)
+    output_path = tmp_path / "doc.md"
+    output_path.write_text("# Done", encoding='utf-8')
+
+    manifest_path = tmp_path / "manifest.sqlite3"
+    manifest = BatchManifest(manifest_path)
+    manifest.record(manifest_row(pdf_path, tag, output_path))
+    manifest.record(manifest_row(pdf_path, "other-profile", output_path, status='failed'))
+    assert manifest.converted_output(file_sha256(pdf_path), tag) == str(output_path)
+    assert manifest.converted_output(file_sha256(pdf_path), "other-profile") is None
+
+    # Both files hash to the converted source, so no worker process is started
+    counts = run_batch(str(pdf_dir), "test-key", profile="sonnet", manifest_path=str(manifest_path))
+    assert counts == {'converted': 0, 'partial': 0, 'failed': 0, 'skipped': 2}
+
+    # A manifest row whose Markdown was deleted no longer counts as converted
+    output_path.unlink()
+    assert manifest.converted_output(file_sha256(pdf_path), tag) is None
+
+def test_partial_while_journal_survives(tmp_path, make_pdf, monkeypatch):
+    pdf_path = make_pdf(tmp_path / "doc.pdf", 4)
+    tag = output_tag(get_profile("sonnet"), False)
+    job = {'source_path': str(pdf_path), 'source_sha256': file_sha256(pdf_path), 'output_tag': tag,
+           'output_path': str(tmp_path / "out" / "doc.md"), 'api_key': "test-key", 'profile': "sonnet",
+           'pages_per_chunk': 2, 'chunk_workers': 1, 'hybrid': False, 'cascade': False}
+    monkeypatch.setattr(batch_converter, '_worker_cache', None)
+    monkeypatch.setattr(batch_converter, '_worker_page_index', None)
+
+    monkeypatch.setattr(batch_converter, '_worker_session', ConverterSession("test-key", client=FailingPageClient(3)))
+    result = batch_converter._convert_document(dict(job))
+    assert result['status'] == 'partial'
+    assert 'api_key' not in result
+    journal = ConversionJournal.for_pdf(str(pdf_path), tag)
+    assert journal.journal_path.exists()
+
+    # The next run finds the journal, resumes, and sends only the failed chunk
+    client = LocalMessagesClient()
+    monkeypatch.setattr(batch_converter, '_worker_session', ConverterSession("test-key", client=client))
+    result = batch_converter._convert_document(dict(job))
+    assert result['status'] == 'converted'
+    assert len(client.requests) == 1
+    assert not journal.journal_path.exists()
+    assert "Body text of page 3" in Path(job['output_path']).read_text(encoding='utf-8')
+
+def test_worker_gets_a_share_of_the_rate_limits(monkeypatch):
+    for name in ('_worker_session', '_worker_cache', '_worker_page_index'):
+        monkeypatch.setattr(batch_converter, name, None)
+
+    batch_converter._init_worker("test-key", 4)
+    scheduler = batch_converter._worker_session.scheduler
+    assert scheduler.request_bucket.capacity == REQUESTS_PER_MINUTE / 4
+    assert scheduler.token_bucket.capacity == TOKENS_PER_MINUTE / 4
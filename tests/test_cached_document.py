@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Test Cached Document
+Purpose: Confirm cached document mode writes the prompt cache once and converts every page range in order
+"""
+
+from src.converters.conversion_engine import convert_pdf_to_markdown
+from src.converters.converter_session import ConverterSession
+from src.converters.local_backend import LocalMessagesClient
+
+def test_cached_document_reads_prefix_after_first_request(tmp_path, make_pdf):
+    """Only the first range request writes the cache; the rest read it and ask for their own pages"""
+    pdf_path = make_pdf(tmp_path / "doc.pdf", 7)
+    client = LocalMessagesClient()
+    session = ConverterSession("test-key", client=client)
+
+    markdown_text = convert_pdf_to_markdown(str(pdf_path), "test-key", pages_per_chunk=3, max_workers=3,
+                                            session=session, cached_document=True)
+
+    assert sorted((r['start_page'], r['end_page']) for r in client.requests) == [(1, 3), (4, 6), (7, 7)]
+    assert [r['cache_hit'] for r in client.requests].count(False) == 1
+    assert all(r['usage'].cache_read_input_tokens > 0 for r in client.requests if r['cache_hit'])
+
+    positions = [markdown_text.index(f"Body text of page {page_num}") for page_num in range(1, 8)]
+    assert positions == sorted(positions)
+
+def test_split_chunks_are_converted_in_full(tmp_path, make_pdf):
+    """Without cached document mode each request carries only its own chunk"""
+    pdf_path = make_pdf(tmp_path / "doc.pdf", 4)
+    client = LocalMessagesClient()
+    session = ConverterSession("test-key", client=client)
+
+    convert_pdf_to_markdown(str(pdf_path), "test-key", pages_per_chunk=2, max_workers=1, session=session)
+
+    assert [(r['end_page'] - r['start_page'] + 1, r['cache_hit']) for r in client.requests] == [(2, False), (2, False)]
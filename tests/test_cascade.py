@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test Cascade
+Purpose: Confirm cascade mode re-sends only chunks whose cheap-model output drifts from the text layer
+"""
+
+from types import SimpleNamespace
+
+import fitz  # PyMuPDF
+
+from src.converters.conversion_engine import convert_pdf_to_markdown
+from src.converters.converter_session import ConverterSession
+from src.converters.local_backend import LocalMessagesClient
+from src.converters.model_profiles import get_profile
+from src.validators.word_fidelity_validator import score_text_fidelity
+
+SENTENCE = "The quarterly survey recorded river levels at every monitoring station along the valley. "
+
+class SmudgingClient(LocalMessagesClient):
+    """The weak model garbles every page that mentions smudged ink; other models read everything correctly"""
+
+    def __init__(self, weak_model: str):
+        super().__init__()
+        self.weak_model = weak_model
+
+    def respond(self, model, max_tokens, messages):
+        message = super().respond(model, max_tokens, messages)
+        text = message.content[0].text
+        if model == self.weak_model and "smudged" in text:
+            text = " ".join("lorem" if n % 2 else word for n, word in enumerate(text.split()))
+        return SimpleNamespace(content=[SimpleNamespace(type="text", text=text)], stop_reason=message.stop_reason,
+                               usage=message.usage, model=model)
+
+def write_mixed_pdf(path):
+    """Page 1 reads cleanly, page 2 has smudged ink, page 3 is a scan with no text layer"""
+    doc = fitz.open()
+    doc.new_page().insert_textbox(fitz.Rect(72, 72, 520, 700), SENTENCE * 4, fontsize=11)
+    doc.new_page().insert_textbox(fitz.Rect(72, 72, 520, 700), "Some ink is smudged here. " + SENTENCE * 4,
+                                  fontsize=11)
+    scan = doc.new_page()
+    scan.insert_image(scan.rect, pixmap=fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 64, 64), 0))
+    doc.save(str(path))
+    doc.close()
+    return path
+
+def test_only_weak_chunks_escalate(tmp_path):
+    haiku = get_profile("haiku")
+    escalation = get_profile(haiku.escalation_profile)
+    client = SmudgingClient(weak_model=haiku.model)
+
+    markdown_text = convert_pdf_to_markdown(str(write_mixed_pdf(tmp_path / "doc.pdf")), "test-key", 1,
+                                            max_workers=1, profile="haiku", cascade=True,
+                                            session=ConverterSession("test-key", client=client))
+
+    models = [request['model'] for request in client.requests]
+    assert models.count(haiku.model) == 3
+    # Only the smudged page is re-sent; the clean page scores well and the scan has nothing to score against
+    assert models.count(escalation.model) == 1
+    assert "lorem" not in markdown_text
+    assert "Some ink is smudged here." in markdown_text
+
+def test_no_escalation_without_cascade(tmp_path):
+    haiku = get_profile("haiku")
+    client = SmudgingClient(weak_model=haiku.model)
+    markdown_text = convert_pdf_to_markdown(str(write_mixed_pdf(tmp_path / "doc.pdf")), "test-key", 1,
+                                            max_workers=1, profile="haiku",
+                                            session=ConverterSession("test-key", client=client))
+
+    assert {request['model'] for request in client.requests} == {haiku.model}
+    assert "lorem" in markdown_text
+
+def test_score_text_fidelity():
+    source = SENTENCE * 3
+    assert score_text_fidelity(source, source, 25) == 100.0
+    assert score_text_fidelity(source, " ".join("lorem" if n % 2 else word
+                                                for n, word in enumerate(source.split())), 25) < 90
+    assert score_text_fidelity("Too few words", "Too few words", 25) is None
+    assert score_text_fidelity("", "anything") is None
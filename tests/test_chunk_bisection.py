@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Test Chunk Bisection
+Purpose: Confirm a failing chunk is split down to the single bad page and only that page is retried on resume
+"""
+
+import importlib
+
+import anthropic
+
+from src.converters.conversion_engine import convert_pdf_to_markdown
+from src.converters.converter_session import ConverterSession
+from src.converters.local_backend import LocalMessagesClient
+
+# The SDK's error classes wrap a response from the HTTP library it was built on, which may not be httpx itself
+httpx = importlib.import_module(type(anthropic.DEFAULT_CONNECTION_LIMITS).__module__)
+
+class RejectingClient(LocalMessagesClient):
+    """Rejects every request that includes the bad page, like the API does with an unreadable page"""
+
+    def __init__(self, bad_page: int):
+        super().__init__()
+        self.bad_page = bad_page
+
+    def respond(self, model, max_tokens, messages):
+        message = super().respond(model, max_tokens, messages)
+        if f"Body text of page {self.bad_page}" in message.content[0].text:
+            response = httpx.Response(400, request=httpx.Request("POST", "https://api.anthropic.com/v1/messages"))
+            raise anthropic.BadRequestError("Could not process PDF", response=response, body=None)
+        return message
+
+def test_failing_chunk_is_bisected_to_the_bad_page(tmp_path, make_pdf):
+    """Pages 1-5 fail because of page 4; every other page still converts and page 4 alone is reported"""
+    pdf_path = make_pdf(tmp_path / "doc.pdf", 6)
+    session = ConverterSession("test-key", client=RejectingClient(bad_page=4))
+
+    markdown_text = convert_pdf_to_markdown(str(pdf_path), "test-key", pages_per_chunk=5, max_workers=1,
+                                            session=session)
+
+    for page_num in (1, 2, 3, 5, 6):
+        assert f"Body text of page {page_num}" in markdown_text
+    assert "[Error converting page 4:" in markdown_text
+    assert list(tmp_path.glob("*.journal.jsonl")), "journal is kept so the bad page can be retried"
+
+    # Resuming sends only the page that failed
+    client = LocalMessagesClient()
+    markdown_text = convert_pdf_to_markdown(str(pdf_path), "test-key", pages_per_chunk=5, max_workers=1,
+                                            session=ConverterSession("test-key", client=client), resume=True)
+
+    assert len(client.requests) == 1
+    assert "Body text of page 4" in markdown_text
+    assert "[Error converting" not in markdown_text
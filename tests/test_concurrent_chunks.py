@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Test Concurrent Chunks
+Purpose: Confirm chunks are converted in parallel up to max_workers and still come out in page order
+"""
+
+import threading
+import time
+
+from src.converters.conversion_engine import convert_pdf_to_markdown
+from src.converters.converter_session import ConverterSession
+from src.converters.local_backend import LocalMessagesClient
+
+class CountingClient(LocalMessagesClient):
+    """Records the most requests it ever had in flight; the first chunk is the slowest to answer"""
+
+    def __init__(self):
+        super().__init__()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.counter_lock = threading.Lock()
+
+    def respond(self, model, max_tokens, messages):
+        with self.counter_lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            message = super().respond(model, max_tokens, messages)
+            time.sleep(0.3 if "Body text of page 1" in message.content[0].text else 0.05)
+            return message
+        finally:
+            with self.counter_lock:
+                self.in_flight -= 1
+
+def test_chunks_run_concurrently_in_page_order(tmp_path, make_pdf):
+    pdf_path = make_pdf(tmp_path / "doc.pdf", 8)
+    client = CountingClient()
+    markdown_text = convert_pdf_to_markdown(str(pdf_path), "test-key", 2, max_workers=4,
+                                            session=ConverterSession("test-key", client=client))
+
+    assert len(client.requests) == 4
+    assert client.max_in_flight > 1
+    positions = [markdown_text.index(f"Body text of page {page_num}") for page_num in range(1, 9)]
+    assert positions == sorted(positions)
+
+def test_one_worker_is_sequential(tmp_path, make_pdf):
+    pdf_path = make_pdf(tmp_path / "doc.pdf", 6)
+    client = CountingClient()
+    convert_pdf_to_markdown(str(pdf_path), "test-key", 2, max_workers=1,
+                            session=ConverterSession("test-key", client=client))
+
+    assert len(client.requests) == 3
+    assert client.max_in_flight == 1
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Test Conversion Journal
+Purpose: Confirm an interrupted conversion resumes from its journal, and that stale or damaged journals are handled
+"""
+
+from src.converters.conversion_engine import convert_pdf_to_markdown
+from src.converters.conversion_journal import ConversionJournal, file_sha256
+from src.converters.converter_session import ConverterSession
+from src.converters.local_backend import LocalMessagesClient
+
+def chunk(start_page: int, end_page: int, total_pages: int = 6) -> dict:
+    return {'start_page': start_page, 'end_page': end_page, 'total_pages': total_pages}
+
+def test_resume_sends_only_unfinished_chunks(tmp_path, make_pdf):
+    """A run cut off after its first chunk resumes with the remaining chunks only"""
+    pdf_path = make_pdf(tmp_path / "doc.pdf", 6)
+    journal = ConversionJournal.for_pdf(str(pdf_path), "sonnet")
+    journal.start()
+    journal.record(chunk(1, 3), "# Pages 1-3 from the interrupted run")
+
+    client = LocalMessagesClient()
+    markdown_text = convert_pdf_to_markdown(str(pdf_path), "test-key", 3, max_workers=1, resume=True,
+                                            session=ConverterSession("test-key", client=client))
+
+    assert len(client.requests) == 1
+    assert markdown_text.startswith("# Pages 1-3 from the interrupted run")
+    assert "Body text of page 6" in markdown_text
+    assert not journal.journal_path.exists()  # Discarded once every chunk converted
+
+def test_changed_pdf_invalidates_journal(tmp_path, make_pdf):
+    pdf_path = make_pdf(tmp_path / "doc.pdf", 6)
+    journal = ConversionJournal.for_pdf(str(pdf_path), "sonnet")
+    journal.start()
+    journal.record(chunk(1, 3), "stale")
+
+    make_pdf(pdf_path, 5)  # Same name, different content
+    assert ConversionJournal.for_pdf(str(pdf_path), "sonnet").load_completed() == {}
+
+def test_torn_last_line_is_ignored(tmp_path, make_pdf):
+    pdf_path = make_pdf(tmp_path / "doc.pdf", 6)
+    journal = ConversionJournal.for_pdf(str(pdf_path), "sonnet")
+    journal.start()
+    journal.record(chunk(1, 3), "first")
+    with open(journal.journal_path, 'a', encoding='utf-8') as f:
+        f.write('{"type": "chunk", "start_page": 4, "end_pa')  # Crash mid-write
+
+    assert journal.load_completed() == {(1, 3): "first"}
+
+def test_later_error_overrides_earlier_ok(tmp_path, make_pdf):
+    pdf_path = make_pdf(tmp_path / "doc.pdf", 6)
+    journal = ConversionJournal.for_pdf(str(pdf_path), "sonnet")
+    journal.start()
+    journal.record(chunk(1, 3), "first")
+    journal.record(chunk(4, 6), "second")
+    journal.record(chunk(1, 3), None, ok=False, error="rejected on retry")
+
+    assert journal.load_completed() == {(4, 6): "second"}
+
+def test_known_source_hash_is_not_recomputed(tmp_path, make_pdf):
+    pdf_path = make_pdf(tmp_path / "doc.pdf", 2)
+    journal = ConversionJournal.for_pdf(str(pdf_path), "sonnet", source_hash=file_sha256(str(pdf_path)))
+    pdf_path.unlink()  # Anything that still tried to hash the file would fail now
+
+    journal.start()
+    journal.record(chunk(1, 2, 2), "done")
+    assert journal.load_completed() == {(1, 2): "done"}
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Test Conversion Service
+Purpose: Confirm jobs submitted over HTTP are converted by the worker pool and survive a service restart,
+         jobs for the same PDF never run at once, and cancelled jobs leave the queue
+"""
+
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+from src.converters.conversion_service import CANCELLED, CONVERTED, QUEUED, RUNNING, ConversionService, create_server
+from src.converters.converter_session import ConverterSession
+from src.converters.local_backend import LocalMessagesClient
+
+class SlowClient(LocalMessagesClient):
+    """Local conversion that takes a while, so jobs are still queued when the service stops"""
+
+    def respond(self, model, max_tokens, messages):
+        time.sleep(0.5)
+        return super().respond(model, max_tokens, messages)
+
+class OverlapClient(SlowClient):
+    """Records the most requests it ever had in flight"""
+
+    def __init__(self):
+        super().__init__()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.counter_lock = threading.Lock()
+
+    def respond(self, model, max_tokens, messages):
+        with self.counter_lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            return super().respond(model, max_tokens, messages)
+        finally:
+            with self.counter_lock:
+                self.in_flight -= 1
+
+def local_service(service_dir: Path, workers: int = 2, client: LocalMessagesClient = None) -> ConversionService:
+    session = ConverterSession("test-key", client=client or LocalMessagesClient())
+    return ConversionService("test-key", workers=workers, service_dir=str(service_dir), session=session)
+
+def wait_for(service: ConversionService, job_id: str, timeout: float = 30) -> dict:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = service.status(job_id)
+        if job['status'] not in ('queued', 'running'):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"Job {job_id} did not finish")
+
+def test_upload_poll_and_fetch_result(tmp_path, make_pdf):
+    """POST a PDF, poll its status and fetch the Markdown over HTTP"""
+    service = local_service(tmp_path / "service").start()
+    server = create_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        pdf_data = make_pdf(tmp_path / "doc.pdf", 3).read_bytes()
+        request = urllib.request.Request(f"{base_url}/jobs?name=doc.pdf&pages_per_chunk=2", data=pdf_data,
+                                         headers={"Content-Type": "application/pdf"})
+        with urllib.request.urlopen(request) as response:
+            assert response.status == 202
+            job = json.loads(response.read())
+
+        assert wait_for(service, job['id'])['status'] == CONVERTED
+        with urllib.request.urlopen(f"{base_url}/jobs/{job['id']}/result") as response:
+            markdown_text = response.read().decode('utf-8')
+        assert all(f"Body text of page {page_num}" in markdown_text for page_num in (1, 2, 3))
+
+        bad = urllib.request.Request(f"{base_url}/jobs?profile=no-such-model", data=pdf_data,
+                                     headers={"Content-Type": "application/pdf"})
+        try:
+            urllib.request.urlopen(bad)
+            raise AssertionError("Unknown profile was accepted")
+        except urllib.error.HTTPError as e:
+            assert e.code == 400
+
+        for limit in ("abc", "0"):
+            try:
+                urllib.request.urlopen(f"{base_url}/jobs?limit={limit}")
+                raise AssertionError(f"limit={limit} was accepted")
+            except urllib.error.HTTPError as e:
+                assert e.code == 400
+        with urllib.request.urlopen(f"{base_url}/jobs?limit=1") as response:
+            assert len(json.loads(response.read())) == 1
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.stop()
+
+def test_queued_jobs_survive_restart(tmp_path, make_pdf):
+    """Jobs queued when the service stopped are picked up by the next one; cancelled jobs are not"""
+    first = local_service(tmp_path / "service")  # Never started, so nothing runs
+    kept = first.submit(str(make_pdf(tmp_path / "kept.pdf", 2)))
+    dropped = first.submit(str(make_pdf(tmp_path / "dropped.pdf", 2)))
+    assert first.cancel(dropped['id'])['status'] == CANCELLED
+
+    second = local_service(tmp_path / "service").start()
+    try:
+        assert wait_for(second, kept['id'])['status'] == CONVERTED
+        assert second.status(dropped['id'])['status'] == CANCELLED
+    finally:
+        second.stop()
+
+def test_stop_leaves_queued_jobs_queued(tmp_path, make_pdf):
+    """Stopping a running service finishes the job in progress only; the rest wait for the next start"""
+    service = local_service(tmp_path / "service", workers=1, client=SlowClient())
+    jobs = [service.submit(str(make_pdf(tmp_path / f"doc{n}.pdf", 1))) for n in range(4)]
+    service.start()
+    deadline = time.monotonic() + 10
+    while service.status(jobs[0]['id'])['status'] != RUNNING and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    started = time.monotonic()
+    service.stop()
+    assert time.monotonic() - started < 1.5
+    statuses = [service.status(job['id'])['status'] for job in jobs]
+    assert statuses[0] == CONVERTED and statuses[1:] == [QUEUED] * 3
+
+    restarted = local_service(tmp_path / "service", workers=2).start()
+    try:
+        assert all(wait_for(restarted, job['id'])['status'] == CONVERTED for job in jobs)
+    finally:
+        restarted.stop()
+
+def test_cancelled_jobs_leave_the_queue(tmp_path, make_pdf):
+    service = local_service(tmp_path / "service")  # Never started, so everything stays queued
+    jobs = [service.submit(str(make_pdf(tmp_path / f"doc{n}.pdf", 1))) for n in range(3)]
+    assert service.status(jobs[2]['id'])['queue_position'] == 3
+
+    service.cancel(jobs[0]['id'])
+    assert service.status(jobs[0]['id'])['queue_position'] is None
+    assert service.status(jobs[2]['id'])['queue_position'] == 2
+    assert service._queue.qsize() == 2
+
+def test_jobs_for_one_pdf_run_one_at_a_time(tmp_path, make_pdf):
+    """Two jobs for the same PDF share its journal, so the second waits for the first"""
+    client = OverlapClient()
+    service = local_service(tmp_path / "service", workers=2, client=client)
+    pdf_path = str(make_pdf(tmp_path / "doc.pdf", 1))
+    jobs = [service.submit(pdf_path) for _ in range(2)]
+    service.start()
+    try:
+        assert [wait_for(service, job['id'])['status'] for job in jobs] == [CONVERTED, CONVERTED]
+    finally:
+        service.stop()
+
+    assert len(client.requests) == 2
+    assert client.max_in_flight == 1
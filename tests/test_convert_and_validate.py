@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Test Convert and Validate
+Purpose: Confirm the one-shot pipeline runs OCR alongside the conversion and validates the result
+"""
+
+import threading
+from pathlib import Path
+
+from src.converters.converter_session import ConverterSession
+from src.converters.local_backend import LocalMessagesClient
+from src.validators.convert_and_validate import convert_and_validate
+
+class WaitForOCRClient(LocalMessagesClient):
+    """Holds every request until OCR has started - a pipeline that OCRs after converting never gets there"""
+
+    def __init__(self, ocr_started: threading.Event):
+        super().__init__()
+        self.ocr_started = ocr_started
+
+    def respond(self, model, max_tokens, messages):
+        assert self.ocr_started.wait(10), "OCR did not start while the conversion was running"
+        return super().respond(model, max_tokens, messages)
+
+def test_ocr_overlaps_conversion(tmp_path, make_pdf):
+    pdf_path = make_pdf(tmp_path / "doc.pdf", 4)
+    ocr_started = threading.Event()
+
+    def fake_ocr(document, output_file, max_pages, page_index=None):
+        ocr_started.set()
+        # OCR reads the conversion's shared document rather than opening the file again
+        text = "\n".join(f"=== PAGE {n + 1} ===\n{document.page_text(n)}" for n in range(max_pages))
+        Path(output_file).write_text(text, encoding='utf-8')
+        return output_file
+
+    session = ConverterSession("test-key", client=WaitForOCRClient(ocr_started))
+    summary = convert_and_validate(str(pdf_path), "test-key", 2, max_workers=2, ocr_pages=2,
+                                   output_path=str(tmp_path / "doc.md"), session=session, ocr=fake_ocr)
+
+    assert "Body text of page 4" in Path(summary['markdown_path']).read_text(encoding='utf-8')
+    assert summary['results']['word_fidelity'] > 90
+    assert Path(summary['report_path']).exists()
+
+def test_text_layer_reference_without_ocr(tmp_path, make_pdf):
+    pdf_path = make_pdf(tmp_path / "doc.pdf", 6)
+    session = ConverterSession("test-key", client=LocalMessagesClient())
+    summary = convert_and_validate(str(pdf_path), "test-key", 3, max_workers=1, ocr_pages=6,
+                                   output_path=str(tmp_path / "doc.md"), session=session,
+                                   ocr=lambda *args, **kwargs: None)
+
+    assert "Body text of page 2" in Path(summary['reference_path']).read_text(encoding='utf-8')
+    assert summary['results'] is not None
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Test Converter Session
+Purpose: Confirm one pooled client is shared per API key, base_url redirects it, and close() releases the pool
+"""
+
+from src.converters.converter_session import ConverterSession, close_sessions, get_session
+from src.converters.local_backend import LocalMessagesClient
+
+def test_session_is_reused_per_api_key():
+    try:
+        first = get_session("test-key-a")
+        assert get_session("test-key-a") is first
+        assert get_session("test-key-b") is not first
+        # Every request of the session goes through its one pooled HTTP client
+        assert first.client._client is first._http_client
+    finally:
+        close_sessions()
+
+    assert first._http_client.is_closed
+    assert get_session("test-key-a") is not first
+    close_sessions()
+
+def test_pool_limits_are_applied():
+    with ConverterSession("test-key", max_connections=7, max_keepalive_connections=3, keepalive_expiry=5.0) as session:
+        pool = session._http_client._transport._pool
+        assert pool._max_connections == 7
+        assert pool._max_keepalive_connections == 3
+        assert session.client.max_retries == 0  # Retries belong to the scheduler
+
+def test_base_url_override(monkeypatch):
+    monkeypatch.delenv("ANTHROPIC_BASE_URL", raising=False)
+    with ConverterSession("test-key", base_url="http://127.0.0.1:8765") as session:
+        assert str(session.client.base_url).startswith("http://127.0.0.1:8765")
+    with ConverterSession("test-key") as session:
+        assert str(session.client.base_url).startswith("https://api.anthropic.com")
+
+def test_close_releases_the_pool():
+    session = ConverterSession("test-key")
+    assert not session._http_client.is_closed
+    session.close()
+    assert session._http_client.is_closed
+
+    closed = []
+    client = LocalMessagesClient()
+    client.close = lambda: closed.append(True)
+    with ConverterSession("test-key", client=client) as session:
+        assert session.client is client
+    assert closed == [True]
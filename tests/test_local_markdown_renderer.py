@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Test Local Markdown Renderer
+Purpose: Confirm pages are routed by their text layer, font sizes become heading levels, columns read in order,
+         hybrid conversion only sends the pages the renderer cannot handle, and the local converter groups pages
+         like the API converters
+"""
+
+import sys
+
+import fitz  # PyMuPDF
+
+from src.converters.conversion_engine import convert_pdf_to_markdown
+from src.converters.converter_session import ConverterSession
+from src.converters.local_backend import LocalMessagesClient
+from src.converters import pdf_to_markdown_local
+from src.converters.local_markdown_renderer import (
+    COMPLEX_PAGE,
+    IMAGE_PAGE,
+    TEXT_PAGE,
+    DocumentStyle,
+    analyze_document_style,
+    classify_page,
+    heading_prefix,
+    reading_order,
+    render_page_markdown,
+)
+from src.converters.pdf_chunking import ADAPTIVE_CHUNKING, iter_pdf_chunks
+
+PARAGRAPH = "Ordinary body text that runs across the page so the body size dominates."
+
+def write_lines(page: fitz.Page, lines, x: float = 72, y: float = 72):
+    """Insert (text, fontsize) lines top to bottom, with a paragraph gap after each"""
+    for text, size in lines:
+        page.insert_text((x, y), text, fontsize=size)
+        y += size * 2.5
+    return y
+
+def test_classify_page():
+    doc = fitz.open()
+
+    text_page = doc.new_page()
+    write_lines(text_page, [(PARAGRAPH, 11)] * 3)
+    assert classify_page(text_page) == TEXT_PAGE
+
+    short_page = doc.new_page()
+    write_lines(short_page, [("Figure 3", 11)])
+    assert classify_page(short_page) == IMAGE_PAGE
+
+    scanned_page = doc.new_page()
+    write_lines(scanned_page, [(PARAGRAPH, 11)] * 3)
+    pixmap = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 64, 64), 0)
+    scanned_page.insert_image(fitz.Rect(0, 0, 500, 700), pixmap=pixmap)
+    assert classify_page(scanned_page) == IMAGE_PAGE
+
+    table_page = doc.new_page()
+    write_lines(table_page, [(PARAGRAPH, 11)] * 3)
+    for row in range(50):
+        table_page.draw_line(fitz.Point(72, 300 + row * 8), fitz.Point(520, 300 + row * 8))
+    assert classify_page(table_page) == COMPLEX_PAGE
+
+def test_font_sizes_cluster_into_heading_levels():
+    doc = fitz.open()
+    page = doc.new_page()
+    write_lines(page, [("Title", 24), ("Almost the title size", 23.8), ("Section", 18)] + [(PARAGRAPH, 11)] * 4)
+
+    style = analyze_document_style([page])
+    assert style.body_size == 11
+    assert style.heading_sizes == [24, 18]
+
+    assert heading_prefix(24, style) == "# "
+    assert heading_prefix(23.8, style) == "# "
+    assert heading_prefix(18, style) == "## "
+    assert heading_prefix(14, style) == "#### "  # Larger than the body but below every cluster
+    assert heading_prefix(11, style) == ""
+    assert analyze_document_style([]) == DocumentStyle()
+
+def test_reading_order_reads_columns_within_bands():
+    def block(name, x0, y0, x1, y1):
+        return {'name': name, 'bbox': (x0, y0, x1, y1)}
+
+    blocks = [
+        block("right-1", 320, 100, 560, 180), block("left-2", 40, 200, 280, 280),
+        block("footer", 40, 700, 560, 740), block("left-1", 40, 100, 280, 180),
+        block("title", 40, 40, 560, 80), block("right-2", 320, 200, 560, 280),
+    ]
+    ordered = [b['name'] for b in reading_order(blocks, page_width=600)]
+    assert ordered == ["title", "left-1", "left-2", "right-1", "right-2", "footer"]
+
+def test_render_page_markdown():
+    doc = fitz.open()
+    page = doc.new_page()
+    y = write_lines(page, [("Report Title", 24), (PARAGRAPH, 11), ("Methods", 18), (PARAGRAPH, 11)])
+    for x, text in ((72, "- first point"), (90, "- nested point"), (72, "1. numbered step")):
+        page.insert_text((x, y), text, fontsize=11)
+        y += 14
+    page.insert_text((72, y + 20), "A word split by hyphen-", fontsize=11)
+    page.insert_text((72, y + 34), "ation across lines.", fontsize=11)
+
+    markdown_text = render_page_markdown(page)
+    lines = markdown_text.splitlines()
+    assert lines[0] == "# Report Title"
+    assert "## Methods" in lines
+    assert "- first point" in lines
+    assert "  - nested point" in lines
+    assert "1. numbered step" in lines
+    # List items stay together rather than becoming separate paragraphs
+    assert lines.index("  - nested point") == lines.index("- first point") + 1
+    assert "A word split by hyphenation across lines." in markdown_text
+
+def test_hybrid_sends_only_pages_without_a_text_layer(tmp_path):
+    pdf_path = tmp_path / "mixed.pdf"
+    doc = fitz.open()
+    write_lines(doc.new_page(), [("Local Heading", 20)] + [(PARAGRAPH, 11)] * 3)
+    write_lines(doc.new_page(), [("Scan", 11)])  # Too little text: goes to the model
+    write_lines(doc.new_page(), [(PARAGRAPH, 11)] * 3)
+    doc.save(str(pdf_path))
+    doc.close()
+
+    client = LocalMessagesClient()
+    markdown_text = convert_pdf_to_markdown(str(pdf_path), "test-key", 5, max_workers=1, hybrid=True,
+                                            session=ConverterSession("test-key", client=client))
+
+    assert len(client.requests) == 1
+    assert "# Local Heading" in markdown_text
+    assert "Scan" in markdown_text
+    assert markdown_text.index("Local Heading") < markdown_text.index("Scan")
+
+def test_local_parts_follow_api_chunking(tmp_path, make_pdf):
+    pdf_path = str(make_pdf(tmp_path / "doc.pdf", 5))
+    parts = list(pdf_to_markdown_local.iter_local_markdown_parts(pdf_path, 2))
+    assert len(parts) == 3
+    assert "Body text of page 2" in parts[0] and "Body text of page 5" in parts[2]
+
+    ranges = [(chunk['start_page'], chunk['end_page'])
+              for chunk in iter_pdf_chunks(pdf_path, ADAPTIVE_CHUNKING, build_data=False)]
+    parts = list(pdf_to_markdown_local.iter_local_markdown_parts(pdf_path, ADAPTIVE_CHUNKING))
+    assert len(parts) == len(ranges)
+    for (start_page, end_page), part in zip(ranges, parts):
+        assert all(f"Body text of page {page_num}" in part for page_num in range(start_page, end_page + 1))
+
+def test_main_parses_pages_per_chunk(tmp_path, make_pdf, monkeypatch):
+    pdf_path = str(make_pdf(tmp_path / "doc.pdf", 2))
+    used = []
+    monkeypatch.setattr(pdf_to_markdown_local, 'iter_local_markdown_parts',
+                        lambda path, pages_per_chunk: used.append(pages_per_chunk) or iter(["# Page"]))
+    for argument in ("3", "auto", "0", "-2", "many"):
+        monkeypatch.setattr(sys, 'argv', ["pdf_to_markdown_local", pdf_path, argument])
+        pdf_to_markdown_local.main()
+    assert used == [3, ADAPTIVE_CHUNKING, 5, 5, 5]
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test Message Streaming
+Purpose: Confirm truncated responses are continued without losing the whitespace at the cut, and streamed output
+         matches the finished Markdown
+"""
+
+from types import SimpleNamespace
+
+import anthropic
+import pytest
+
+from src.converters.conversion_engine import convert_pdf_to_markdown, iter_markdown_parts
+from src.converters.converter_session import ConverterSession
+from src.converters.local_backend import LocalMessagesClient, LocalStream
+from src.converters.message_streaming import request_markdown
+from src.converters.request_scheduler import RequestScheduler
+from src.converters.streaming_pipeline import write_markdown_parts
+
+class DroppingStream(LocalStream):
+    """Streams half the text, then loses the connection"""
+
+    @property
+    def text_stream(self):
+        text = self._message.content[0].text
+        yield text[:len(text) // 2]
+        raise anthropic.APIConnectionError(request=None)
+
+class FlakyClient(LocalMessagesClient):
+    """The first streamed response drops mid-way; the retry succeeds"""
+
+    def __init__(self):
+        super().__init__()
+        self.dropped = False
+        self.messages.stream = self.stream
+
+    def stream(self, model, max_tokens, messages, **kwargs):
+        message = self.respond(model, max_tokens, messages)
+        if not self.dropped:
+            self.dropped = True
+            return DroppingStream(message)
+        return LocalStream(message)
+
+class CharStream(LocalStream):
+    """Streams one character at a time"""
+
+    PIECE_CHARS = 1
+
+class ScriptedClient:
+    """Answers with the given (text, stop_reason) replies in turn, recording the assistant prefill of each request"""
+
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.prefills = []
+        self.messages = SimpleNamespace(create=self.create, stream=self.stream)
+
+    def create(self, model, max_tokens, messages, **kwargs):
+        self.prefills.append(messages[-1]["content"] if messages[-1]["role"] == "assistant" else None)
+        text, stop_reason = self.replies.pop(0)
+        return SimpleNamespace(content=[SimpleNamespace(type="text", text=text)], stop_reason=stop_reason,
+                               usage=SimpleNamespace(input_tokens=1, output_tokens=1))
+
+    def stream(self, **kwargs):
+        return CharStream(self.create(**kwargs))
+
+def test_max_tokens_stop_is_continued(tmp_path, make_pdf):
+    """A response cut off at max_tokens is continued until the whole chunk is converted"""
+    pdf_path = make_pdf(tmp_path / "doc.pdf", 3)
+    expected = convert_pdf_to_markdown(str(pdf_path), "test-key", pages_per_chunk=3, max_workers=1,
+                                       session=ConverterSession("test-key", client=LocalMessagesClient()))
+
+    client = LocalMessagesClient(max_output_chars=25)
+    markdown_text = convert_pdf_to_markdown(str(pdf_path), "test-key", pages_per_chunk=3, max_workers=1,
+                                            session=ConverterSession("test-key", client=client))
+
+    assert markdown_text == expected
+    assert client.requests[0]['stop_reason'] == "max_tokens"
+    assert client.requests[-1]['stop_reason'] == "end_turn"
+    assert all(request['continuation'] for request in client.requests[1:])
+
+def test_streamed_file_matches_finished_parts(tmp_path, make_pdf):
+    """Text streamed into the file, including a dropped and retried stream, ends up as the finished parts"""
+    pdf_path = make_pdf(tmp_path / "doc.pdf", 6)
+    expected = convert_pdf_to_markdown(str(pdf_path), "test-key", pages_per_chunk=2, max_workers=1,
+                                       session=ConverterSession("test-key", client=LocalMessagesClient()))
+
+    scheduler = RequestScheduler(base_delay=0.01, max_delay=0.01)
+    session = ConverterSession("test-key", client=FlakyClient(), scheduler=scheduler)
+    output_path = tmp_path / "doc.md"
+    parts = iter_markdown_parts(str(pdf_path), "test-key", pages_per_chunk=2, max_workers=3, session=session)
+    total_length = write_markdown_parts(parts, str(output_path))
+
+    assert output_path.read_text(encoding='utf-8') == expected
+    assert total_length == len(expected)
+
+@pytest.mark.parametrize("replies, expected", [
+    # The model does not repeat the whitespace it was cut off in: the kept suffix separates the parts
+    (["Para one.\n\n", "Para two."], "Para one.\n\nPara two."),
+    # It does repeat it, in part or in full: the repeat is not doubled
+    (["| a |\n", "\n| b |"], "| a |\n| b |"),
+    (["Para one.\n", "\n\nPara two."], "Para one.\n\nPara two."),
+    # It starts with other whitespace: both are kept
+    (["word ", "\n\n## Next"], "word \n\n## Next"),
+])
+@pytest.mark.parametrize("stream", [False, True])
+def test_continuation_keeps_whitespace_at_the_cut(replies, expected, stream):
+    client = ScriptedClient([(replies[0], "max_tokens"), (replies[1], "end_turn")])
+    streamed = []
+
+    def restart(valid_text):
+        streamed[:] = [valid_text]
+
+    text = request_markdown(ConverterSession("test-key", client=client),
+                            {'model': "test-model", 'max_tokens': 100, 'messages': [{"role": "user", "content": "x"}]},
+                            10, on_text=streamed.append, on_restart=restart, stream=stream)
+
+    assert text == expected
+    assert "".join(streamed) == expected
+    assert client.prefills == [None, replies[0].rstrip()]  # The API rejects a prefill ending in whitespace
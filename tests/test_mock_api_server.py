@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test Mock API Server
+Purpose: Confirm the real client converts through the mock server and cassettes record and replay responses
+"""
+
+from pathlib import Path
+from types import SimpleNamespace
+
+from src.converters.conversion_engine import convert_pdf_to_markdown
+from src.converters.converter_session import ConverterSession
+from src.converters.mock_api_server import MockAPIServer, MockBehaviour
+from src.converters.request_scheduler import RequestScheduler
+
+FAST = MockBehaviour(first_token_median=0.01, tokens_per_second=100000, seed=7)
+
+class FakeUpstream:
+    """Stands in for the real API while recording"""
+
+    def __init__(self):
+        self.messages = self
+        self.calls = 0
+
+    def create(self, **request):
+        self.calls += 1
+        response = {
+            "id": f"msg_recorded_{self.calls}", "type": "message", "role": "assistant", "model": request["model"],
+            "content": [{"type": "text", "text": f"# Recorded response {self.calls}"}],
+            "stop_reason": "end_turn", "stop_sequence": None,
+            "usage": {"input_tokens": 10, "output_tokens": 5},
+        }
+        return SimpleNamespace(model_dump=lambda mode=None: response)
+
+def convert_through(server: MockAPIServer, pdf_path: Path, scheduler: RequestScheduler = None) -> str:
+    with ConverterSession("mock-key", scheduler=scheduler, base_url=server.base_url) as session:
+        return convert_pdf_to_markdown(str(pdf_path), "mock-key", pages_per_chunk=2, max_workers=2, session=session)
+
+def test_streamed_conversion_through_mock_server(tmp_path, make_pdf):
+    """The SDK's streaming client parses the server's SSE events into the text-layer Markdown"""
+    pdf_path = make_pdf(tmp_path / "doc.pdf", 3)
+    with MockAPIServer(behaviour=FAST) as server:
+        markdown_text = convert_through(server, pdf_path)
+
+    assert all(f"Body text of page {page_num}" in markdown_text for page_num in (1, 2, 3))
+    assert server.stats['synthesised'] == 2
+
+def test_injected_rate_limits_are_retried(tmp_path, make_pdf):
+    """429s from the server are retried by the scheduler and the document still converts"""
+    pdf_path = make_pdf(tmp_path / "doc.pdf", 2)
+    behaviour = MockBehaviour(first_token_median=0.01, tokens_per_second=100000, rate_limit_rate=0.5,
+                              retry_after=0.01, seed=3)
+    with MockAPIServer(behaviour=behaviour) as server:
+        markdown_text = convert_through(server, pdf_path, RequestScheduler(max_retries=20))
+
+    assert "Body text of page 2" in markdown_text
+    assert server.stats['rate_limited'] > 0
+
+def test_cassette_records_then_replays(tmp_path, make_pdf):
+    """Responses captured in record mode come back unchanged, offline, in replay mode"""
+    pdf_path = make_pdf(tmp_path / "doc.pdf", 4)
+    cassette = tmp_path / "run.cassette.jsonl"
+
+    recorder = MockAPIServer(behaviour=FAST, cassette=str(cassette), record=True)
+    recorder._upstream = FakeUpstream()
+    with recorder:
+        recorded = convert_through(recorder, pdf_path)
+    assert recorder.stats['recorded'] == 2
+
+    with MockAPIServer(behaviour=FAST, cassette=str(cassette)) as replayer:
+        replayed = convert_through(replayer, pdf_path)
+
+    assert replayed == recorded
+    assert "# Recorded response" in replayed
+    assert replayer.stats['replayed'] == 2 and replayer.stats['synthesised'] == 0
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test Model Profiles
+Purpose: Confirm profiles are looked up by name, unknown names are rejected, and each converter module is a thin
+         wrapper that hands its own profile to the shared engine
+"""
+
+import pytest
+
+from src.converters import conversion_engine, pdf_chunking
+from src.converters import pdf_to_markdown_haiku, pdf_to_markdown_sonnet, pdf_to_markdown_sonnet_old
+from src.converters.converter_session import ConverterSession
+from src.converters.local_backend import LocalMessagesClient
+from src.converters.model_profiles import PROFILES, ConversionProfile, get_profile, register_profile
+
+# Wrapper module, its whole-document function and the default pages per chunk of its split_pdf
+WRAPPERS = [
+    (pdf_to_markdown_sonnet, pdf_to_markdown_sonnet.convert_pdf_to_markdown_chunked, 5),
+    (pdf_to_markdown_haiku, pdf_to_markdown_haiku.convert_pdf_to_markdown_haiku, 5),
+    (pdf_to_markdown_sonnet_old, pdf_to_markdown_sonnet_old.convert_pdf_to_markdown_chunked, 10),
+]
+
+def test_profile_lookup():
+    sonnet = get_profile("sonnet")
+    assert sonnet.name == "sonnet" and sonnet.model.startswith("claude-")
+    assert get_profile(sonnet) is sonnet
+    assert get_profile("haiku").escalation_profile == "sonnet"
+    assert get_profile("sonnet_old").file_tag == "sonnet"  # Writes the same file names as the original converter
+    assert get_profile("sonnet_old").pages_per_chunk == 10
+
+    prompt = sonnet.build_prompt({'start_page': 3, 'end_page': 4, 'total_pages': 9})
+    assert "pages 3-4 of 9" in prompt
+
+def test_unknown_profile_is_rejected():
+    with pytest.raises(ValueError, match="Unknown profile 'opus'.*haiku, sonnet, sonnet_old"):
+        get_profile("opus")
+    with pytest.raises(ValueError):
+        conversion_engine.convert_pdf_to_markdown("missing.pdf", "test-key", profile="opus")
+
+def test_registered_profile_is_usable(monkeypatch):
+    monkeypatch.setattr("src.converters.model_profiles.PROFILES", dict(PROFILES))
+    profile = register_profile(ConversionProfile(name="custom", model="custom-model", prompt_template="p{start_page}"))
+    assert get_profile("custom") is profile
+    assert profile.file_tag == "custom"
+
+@pytest.mark.parametrize("module, convert, split_pages", WRAPPERS)
+def test_wrapper_delegates_with_its_profile(module, convert, split_pages, monkeypatch):
+    calls = []
+
+    def recorder(name):
+        return lambda *args, **kwargs: calls.append((name, args, kwargs)) or name
+
+    for name in ('convert_pdf_to_markdown', 'iter_markdown_parts', 'convert_pdf_chunk_to_markdown', 'main'):
+        monkeypatch.setattr(conversion_engine, name, recorder(name))
+    monkeypatch.setattr(pdf_chunking, 'split_pdf', recorder('split_pdf'))
+
+    assert convert("doc.pdf", "test-key") == 'convert_pdf_to_markdown'
+    assert module.iter_markdown_parts("doc.pdf", "test-key") == 'iter_markdown_parts'
+    assert module.convert_pdf_chunk_to_markdown(b"%PDF", "test-key", {}) == 'convert_pdf_chunk_to_markdown'
+    module.main()
+    assert module.split_pdf("doc.pdf") == 'split_pdf'
+
+    for name, args, kwargs in calls[:3]:
+        assert kwargs['profile'] == module.PROFILE, name
+    assert calls[3] == ('main', (), {'default_profile': module.PROFILE})
+    assert calls[4] == ('split_pdf', ("doc.pdf", split_pages), {})
+
+@pytest.mark.parametrize("module, convert, split_pages", WRAPPERS)
+def test_wrapper_converts_with_its_model(module, convert, split_pages, tmp_path, make_pdf):
+    client = LocalMessagesClient()
+    markdown_text = convert(str(make_pdf(tmp_path / "doc.pdf", 2)), "test-key", 2, 1,
+                            ConverterSession("test-key", client=client))
+
+    assert "Body text of page 2" in markdown_text
+    assert [request['model'] for request in client.requests] == [get_profile(module.PROFILE).model]
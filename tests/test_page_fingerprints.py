@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Test Page Fingerprints
+Purpose: Confirm page fingerprints are stable, repeated pages are reused across documents, re-encoded scans match,
+         shared resources are hashed once per document, and a perceptual match is confirmed before reuse
+"""
+
+import fitz  # PyMuPDF
+
+from src.converters.conversion_engine import convert_pdf_to_markdown
+from src.converters.converter_session import ConverterSession
+from src.converters.local_backend import LocalMessagesClient
+from src.converters.page_fingerprints import PageFingerprintIndex, pdf_page_fingerprints
+
+def make_scan(path, pixmap_or_png):
+    """One-page PDF holding only an image of a page, like a scanner produces"""
+    doc = fitz.open()
+    page = doc.new_page()
+    if isinstance(pixmap_or_png, bytes):
+        page.insert_image(page.rect, stream=pixmap_or_png)
+    else:
+        page.insert_image(page.rect, pixmap=pixmap_or_png)
+    doc.save(str(path), deflate=True)
+    doc.close()
+    return path
+
+def page_render(seed: int) -> fitz.Pixmap:
+    """Render of a page full of text, different for each seed"""
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_textbox(fitz.Rect(50, 50, 550, 780), " ".join(f"word{(n * seed) % 97}" for n in range(400)),
+                        fontsize=11)
+    return page.get_pixmap(matrix=fitz.Matrix(1.5, 1.5))
+
+def test_fingerprints_are_stable(tmp_path, make_pdf):
+    """Same pages written into different files fingerprint the same; different pages do not"""
+    first = pdf_page_fingerprints(str(make_pdf(tmp_path / "first.pdf", 3)))
+    second = pdf_page_fingerprints(str(make_pdf(tmp_path / "second.pdf", 4)))
+
+    assert first == second[:3]
+    assert len(set(second)) == 4
+    assert all(fingerprint.startswith("sha256:") for fingerprint in second)
+
+def test_repeated_pages_reused_across_documents(tmp_path, make_pdf):
+    """Pages seen in an earlier document are sent alone and stored; a third document reuses them with no API call"""
+    page_index = PageFingerprintIndex(str(tmp_path / "index"))
+    client = LocalMessagesClient()
+    session = ConverterSession("test-key", client=client)
+
+    convert_pdf_to_markdown(str(make_pdf(tmp_path / "a.pdf", 3)), "test-key", 3, max_workers=1,
+                            session=session, page_index=page_index)
+    convert_pdf_to_markdown(str(make_pdf(tmp_path / "b.pdf", 4)), "test-key", 4, max_workers=1,
+                            session=session, page_index=page_index)
+    # a.pdf went in one request; b.pdf's pages 1-3 repeat it, so each went alone, which leaves page 4 alone too
+    assert len(client.requests) == 5
+
+    client.requests.clear()
+    markdown_text = convert_pdf_to_markdown(str(make_pdf(tmp_path / "c.pdf", 2)), "test-key", 2, max_workers=1,
+                                            session=session, page_index=page_index)
+    assert client.requests == []
+    assert "Body text of page 1" in markdown_text and "Body text of page 2" in markdown_text
+
+def test_truncated_page_is_not_stored(tmp_path, make_pdf):
+    """A page kept with partial Markdown after max_tokens stops must not be reused by later documents"""
+    page_index = PageFingerprintIndex(str(tmp_path / "index"))
+    session = ConverterSession("test-key", client=LocalMessagesClient())
+    convert_pdf_to_markdown(str(make_pdf(tmp_path / "a.pdf", 1)), "test-key", 1, max_workers=1,
+                            session=session, page_index=page_index)
+
+    truncating = ConverterSession("test-key", client=LocalMessagesClient(max_output_chars=4))
+    convert_pdf_to_markdown(str(make_pdf(tmp_path / "b.pdf", 1)), "test-key", 1, max_workers=1,
+                            session=truncating, page_index=page_index)
+
+    fingerprints = pdf_page_fingerprints(str(tmp_path / "b.pdf"))
+    assert page_index.get_markdown(fingerprints, "sonnet") == {}
+
+def test_rescanned_page_matches_perceptually(tmp_path):
+    """The same scan stored with a different encoding matches by dHash; a different scan does not"""
+    render = page_render(3)
+    original = make_scan(tmp_path / "original.pdf", render.tobytes("png"))
+    reencoded = make_scan(tmp_path / "reencoded.pdf", fitz.Pixmap(fitz.csGRAY, render))
+    other = make_scan(tmp_path / "other.pdf", page_render(7).tobytes("png"))
+    assert original.read_bytes() != reencoded.read_bytes()
+
+    fingerprints = [pdf_page_fingerprints(str(path))[0] for path in (original, reencoded, other)]
+    assert fingerprints[0].startswith("dhash:")
+    assert fingerprints[0] == fingerprints[1]
+    assert fingerprints[0] != fingerprints[2]
+
+def write_shared_image_pdf(path, pages: int):
+    """Pages that each draw their own text but share one resource dictionary holding a large image"""
+    import PyPDF2
+    from PyPDF2.generic import NameObject
+
+    source = path.with_name("source.pdf")
+    doc = fitz.open()
+    image = page_render(5)
+    for page_num in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Body text of page {page_num + 1}", fontsize=12)
+        page.insert_image(fitz.Rect(72, 100, 300, 400), pixmap=image)
+    doc.save(str(source), garbage=4, deflate=True)  # garbage=4 merges the repeated image into one object
+    doc.close()
+
+    reader = PyPDF2.PdfReader(str(source))
+    writer = PyPDF2.PdfWriter()
+    added = [writer.add_page(page) for page in reader.pages]
+    shared_ref = writer._add_object(added[0]['/Resources'].get_object())
+    for page in added:
+        page[NameObject('/Resources')] = shared_ref
+    with open(path, 'wb') as f:
+        writer.write(f)
+    return path
+
+def test_shared_resources_are_hashed_once(tmp_path, monkeypatch):
+    """Every page points at the same resources; the image is decoded for the first page only"""
+    import PyPDF2
+    from src.converters.page_fingerprints import content_fingerprint
+
+    pdf_path = write_shared_image_pdf(tmp_path / "shared.pdf", 6)
+    decoded_images = []
+    for stream_class in (PyPDF2.generic.EncodedStreamObject, PyPDF2.generic.DecodedStreamObject):
+        original = stream_class.get_data
+
+        def counting_get_data(self, original=original):
+            if self.get('/Subtype') == '/Image':
+                decoded_images.append(self)
+            return original(self)
+        monkeypatch.setattr(stream_class, 'get_data', counting_get_data)
+
+    fingerprints = pdf_page_fingerprints(str(pdf_path))
+    assert len(decoded_images) == 1
+    assert len(set(fingerprints)) == 6
+
+    # Memoized or not, each page fingerprints the same
+    reader = PyPDF2.PdfReader(str(pdf_path))
+    decoded_images.clear()
+    assert [content_fingerprint(page) for page in reader.pages] == fingerprints
+    assert len(decoded_images) >= 6  # Without a memo, once per page
+
+def test_perceptual_match_needs_the_same_content(tmp_path):
+    """A scan matching a stored page by dHash alone reuses nothing; the identical scan reuses its Markdown and OCR"""
+    from src.converters.page_fingerprints import pdf_page_signatures
+
+    page_index = PageFingerprintIndex(str(tmp_path / "index"))
+    render = page_render(3)
+    original = make_scan(tmp_path / "original.pdf", render.tobytes("png"))
+    copy = make_scan(tmp_path / "copy.pdf", render.tobytes("png"))
+    lookalike = make_scan(tmp_path / "lookalike.pdf", fitz.Pixmap(fitz.csGRAY, render))
+
+    (fingerprint, content_hash), = pdf_page_signatures(str(original))
+    page_index.put_markdown(fingerprint, "sonnet", "# Stored page", content_hash)
+    page_index.put_ocr_text(fingerprint, "stored text", content_hash)
+
+    copy_signatures = pdf_page_signatures(str(copy))
+    lookalike_signatures = pdf_page_signatures(str(lookalike))
+    assert lookalike_signatures[0][0] == fingerprint and lookalike_signatures[0][1] != content_hash
+
+    assert page_index.reusable_markdown(copy_signatures, "sonnet") == {0: "# Stored page"}
+    assert page_index.get_ocr_text(*copy_signatures[0]) == "stored text"
+    assert page_index.reusable_markdown(lookalike_signatures, "sonnet") == {}
+    assert page_index.get_ocr_text(*lookalike_signatures[0]) is None
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Test PDF Chunking
+Purpose: Confirm the adaptive packer keeps chunks within their budgets, pages-per-chunk arguments parse,
+         pruned chunks carry only the resources their pages use, and compression applies with or without pruning
+"""
+
+import fitz  # PyMuPDF
+import pytest
+
+from config.settings import SCANNED_PAGE_OUTPUT_TOKENS
+from src.converters.pdf_chunking import (
+    ADAPTIVE_CHUNKING,
+    build_chunk_bytes,
+    chunk_size_report,
+    estimate_page_cost,
+    iter_pdf_chunks,
+    parse_pages_per_chunk,
+    plan_chunks,
+    pruned_resources,
+)
+
+def cost(input_bytes: int = 1000, output_tokens: int = 100) -> dict:
+    return {'input_bytes': input_bytes, 'image_count': 0, 'text_chars': output_tokens * 4,
+            'output_tokens': output_tokens}
+
+def test_pages_packed_under_budget():
+    page_costs = [cost(input_bytes=400, output_tokens=100) for _ in range(10)]
+    ranges = plan_chunks(page_costs, max_input_bytes=1000, max_output_tokens=10000, max_pages=20)
+    assert ranges == [(0, 2), (2, 4), (4, 6), (6, 8), (8, 10)]
+
+    ranges = plan_chunks(page_costs, max_input_bytes=10 ** 9, max_output_tokens=350, max_pages=20)
+    assert ranges == [(0, 3), (3, 6), (6, 9), (9, 10)]
+
+    ranges = plan_chunks(page_costs, max_input_bytes=10 ** 9, max_output_tokens=10 ** 9, max_pages=4)
+    assert ranges == [(0, 4), (4, 8), (8, 10)]
+
+def test_oversized_page_gets_its_own_chunk():
+    page_costs = [cost(), cost(input_bytes=50000), cost(), cost(output_tokens=9000), cost()]
+    ranges = plan_chunks(page_costs, max_input_bytes=10000, max_output_tokens=1000, max_pages=20)
+    assert ranges == [(0, 1), (1, 2), (2, 3), (3, 4), (4, 5)]
+
+    assert plan_chunks([cost(input_bytes=50000)], max_input_bytes=10000) == [(0, 1)]
+    assert plan_chunks([]) == []
+
+def test_estimate_page_cost(tmp_path, make_pdf):
+    import PyPDF2
+    pdf_path = make_pdf(tmp_path / "doc.pdf", 1)
+    text_page = PyPDF2.PdfReader(str(pdf_path)).pages[0]
+    text_cost = estimate_page_cost(text_page)
+    assert text_cost['text_chars'] == len("Body text of page 1")
+    assert text_cost['image_count'] == 0 and text_cost['input_bytes'] > 0
+
+    scan_path = tmp_path / "scan.pdf"
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_image(page.rect, pixmap=fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 64, 64), 0))
+    doc.save(str(scan_path))
+    doc.close()
+    scan_cost = estimate_page_cost(PyPDF2.PdfReader(str(scan_path)).pages[0])
+    assert scan_cost['image_count'] == 1 and scan_cost['text_chars'] == 0
+    assert scan_cost['output_tokens'] == SCANNED_PAGE_OUTPUT_TOKENS
+
+def test_adaptive_chunks_cover_every_page(tmp_path, make_pdf):
+    pdf_path = make_pdf(tmp_path / "doc.pdf", 7)
+    chunks = list(iter_pdf_chunks(str(pdf_path), ADAPTIVE_CHUNKING, build_data=False))
+    assert chunks[0]['start_page'] == 1 and chunks[-1]['end_page'] == 7
+    for previous, following in zip(chunks, chunks[1:]):
+        assert following['start_page'] == previous['end_page'] + 1
+
+def test_parse_pages_per_chunk():
+    assert parse_pages_per_chunk("auto") == ADAPTIVE_CHUNKING
+    assert parse_pages_per_chunk(" AUTO ") == ADAPTIVE_CHUNKING
+    assert parse_pages_per_chunk("5") == 5
+    with pytest.raises(ValueError):
+        parse_pages_per_chunk("0")
+    with pytest.raises(ValueError):
+        parse_pages_per_chunk("five")
+
+def write_shared_resources_pdf(path):
+    """Two pages drawing with different fonts, both pointing at one resource dictionary that lists everything"""
+    import PyPDF2
+    from PyPDF2.generic import DictionaryObject, NameObject
+
+    source = path.with_name("separate.pdf")
+    doc = fitz.open()
+    first = doc.new_page()
+    first.insert_text((72, 72), "Page one in Helvetica", fontname="helv", fontsize=12)
+    first.insert_image(fitz.Rect(72, 100, 200, 228), pixmap=fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 32, 32), 0))
+    doc.new_page().insert_text((72, 72), "Page two in Courier", fontname="cour", fontsize=12)
+    doc.save(str(source))
+    doc.close()
+
+    reader = PyPDF2.PdfReader(str(source))
+    writer = PyPDF2.PdfWriter()
+    pages = [writer.add_page(page) for page in reader.pages]
+    shared = DictionaryObject()
+    for category in ('/Font', '/XObject'):
+        merged = DictionaryObject()
+        for page in pages:
+            resources = page['/Resources']
+            if category in resources:
+                for name, value in resources[category].get_object().items():
+                    merged[NameObject(name)] = value
+        shared[NameObject(category)] = merged
+    shared_ref = writer._add_object(shared)
+    for page in pages:
+        page[NameObject('/Resources')] = shared_ref
+    with open(path, 'wb') as f:
+        writer.write(f)
+    return path
+
+def test_pruned_chunk_keeps_only_used_resources(tmp_path):
+    import PyPDF2
+    reader = PyPDF2.PdfReader(str(write_shared_resources_pdf(tmp_path / "shared.pdf")))
+    shared = reader.pages[1]['/Resources']
+    assert len(shared['/Font']) == 2 and len(shared['/XObject']) == 1
+
+    first, second = (pruned_resources(page) for page in reader.pages)
+    assert len(first['/Font']) == 1 and len(first['/XObject']) == 1
+    assert len(second['/Font']) == 1 and len(second['/XObject']) == 0
+    assert set(first['/Font']) != set(second['/Font'])
+
+    pruned = build_chunk_bytes(reader, 1, 2, prune=True)
+    plain = build_chunk_bytes(reader, 1, 2, prune=False)
+    assert len(pruned) < len(plain)
+
+    # The pruned chunk still renders its text, with only the font it uses
+    with fitz.open(stream=pruned, filetype="pdf") as chunk:
+        page = chunk[0]
+        assert "Page two in Courier" in page.get_text()
+        assert [font[3] for font in page.get_fonts()] == ["Courier"]
+        assert page.get_images() == []
+        assert page.get_pixmap().width > 0
+
+    with fitz.open(stream=build_chunk_bytes(reader, 0, 1, prune=True), filetype="pdf") as chunk:
+        assert "Page one in Helvetica" in chunk[0].get_text()
+        assert len(chunk[0].get_images()) == 1
+
+def test_compression_does_not_depend_on_pruning(tmp_path):
+    pdf_path = str(write_shared_resources_pdf(tmp_path / "shared.pdf"))
+    for prune in (False, True):
+        compressed = next(iter_pdf_chunks(pdf_path, 1, prune=prune, compress=True, backend="pypdf2"))['data']
+        raw = next(iter_pdf_chunks(pdf_path, 1, prune=prune, compress=False, backend="pypdf2"))['data']
+        assert b"/FlateDecode" in compressed and b"/FlateDecode" not in raw, prune
+
+    report = chunk_size_report(pdf_path, 1)
+    assert [(row['start_page'], row['end_page']) for row in report] == [(1, 1), (2, 2)]
+    assert all(row['pruned_bytes'] < row['plain_bytes'] for row in report)
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Test PDF Document
+Purpose: Confirm one parsed PDFDocument serves splitting, fingerprints, conversion and validation without re-parsing
+"""
+
+import pytest
+
+from src.converters.conversion_engine import convert_pdf_to_markdown
+from src.converters.converter_session import ConverterSession
+from src.converters.local_backend import LocalMessagesClient
+from src.converters.page_fingerprints import pdf_page_fingerprints
+from src.converters.pdf_chunking import extract_chunk_text, iter_pdf_chunks
+from src.utils.pdf_document import PDFDocument
+from src.validators.pdf_accuracy_validator import PDFAccuracyValidator
+
+def test_stages_share_one_document(tmp_path, make_pdf):
+    pdf_path = make_pdf(tmp_path / "doc.pdf", 4)
+    with PDFDocument(pdf_path) as document:
+        assert document.page_count == 4
+        assert "Body text of page 3" in document.page_text(2)
+
+        chunks = list(iter_pdf_chunks(document, 2))
+        assert [(c['start_page'], c['end_page']) for c in chunks] == [(1, 2), (3, 4)]
+        assert "Body text of page 4" in extract_chunk_text(chunks[1]['data'])
+        assert pdf_page_fingerprints(document) == pdf_page_fingerprints(str(pdf_path))
+
+        session = ConverterSession("test-key", client=LocalMessagesClient())
+        markdown = convert_pdf_to_markdown(document, "test-key", 2, max_workers=1, session=session)
+        assert "Body text of page 1" in markdown and "Body text of page 4" in markdown
+
+        # Validation reads the text the earlier stages already extracted
+        document._texts[0] = "Cached body text " * 10
+        full_text, pages = PDFAccuracyValidator(semantic=False).extract_text_from_pdf(document)
+        assert pages[0].startswith("Cached body text") and len(pages) == 4
+
+        # Stages that were handed the document leave it open for the next one
+        assert not document.data.closed
+
+def test_missing_file(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        PDFDocument(tmp_path / "missing.pdf")
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Test Request Scheduler
+Purpose: Confirm rate-limit buckets refill and block, Retry-After is honoured, and only transient errors are retried
+"""
+
+import importlib
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import anthropic
+import pytest
+
+from src.converters.request_scheduler import RequestScheduler, TokenBucket, is_retryable, retry_after_seconds
+
+# The SDK's error classes wrap a response from the HTTP library it was built on, which may not be httpx itself
+httpx = importlib.import_module(type(anthropic.DEFAULT_CONNECTION_LIMITS).__module__)
+
+def api_error(status_code: int, headers: dict = None) -> anthropic.APIStatusError:
+    request = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+    response = httpx.Response(status_code, headers=headers or {}, request=request)
+    error_class = {400: anthropic.BadRequestError, 401: anthropic.AuthenticationError,
+                   429: anthropic.RateLimitError, 500: anthropic.InternalServerError}.get(status_code,
+                                                                                          anthropic.APIStatusError)
+    return error_class(f"HTTP {status_code}", response=response, body=None)
+
+def fast_scheduler(max_retries: int = 3) -> RequestScheduler:
+    return RequestScheduler(requests_per_minute=60000, tokens_per_minute=1e9, max_retries=max_retries,
+                            base_delay=0.001, max_delay=0.01)
+
+def test_bucket_blocks_until_refilled():
+    bucket = TokenBucket(rate_per_minute=600, capacity=1)  # 10 per second
+    started = time.monotonic()
+    bucket.acquire(1)
+    assert time.monotonic() - started < 0.05
+    bucket.acquire(1)
+    assert time.monotonic() - started >= 0.08
+
+    time.sleep(0.15)
+    started = time.monotonic()
+    bucket.acquire(1)  # Refilled (and capped at capacity) while idle
+    assert time.monotonic() - started < 0.05
+    assert bucket.available <= 1
+
+def test_oversized_request_waits_for_a_full_bucket():
+    bucket = TokenBucket(rate_per_minute=600, capacity=1)
+    started = time.monotonic()
+    bucket.acquire(50)  # Bigger than the bucket: takes the whole bucket instead of blocking forever
+    assert time.monotonic() - started < 0.05
+
+def test_record_usage_settles_the_estimate():
+    scheduler = RequestScheduler(requests_per_minute=60, tokens_per_minute=1000)
+    scheduler.token_bucket.acquire(100)
+    before = scheduler.token_bucket.available
+
+    scheduler.record_usage(estimated_tokens=100, actual_tokens=300)  # Under-estimate: debit the difference
+    assert scheduler.token_bucket.available == pytest.approx(before - 200, abs=1)
+    scheduler.record_usage(estimated_tokens=300, actual_tokens=50)   # Over-estimate: refund, capped at capacity
+    assert scheduler.token_bucket.available == pytest.approx(before + 50, abs=1)
+    scheduler.record_usage(estimated_tokens=5000, actual_tokens=0)
+    assert scheduler.token_bucket.available <= 1000
+
+def test_retry_after_parsing():
+    assert retry_after_seconds(api_error(429, {"retry-after": "7"})) == 7.0
+    assert retry_after_seconds(api_error(429, {"retry-after-ms": "1500", "retry-after": "7"})) == 1.5
+
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+    delay = retry_after_seconds(api_error(429, {"retry-after": format_datetime(retry_at, usegmt=True)}))
+    assert 25 <= delay <= 31
+    past = datetime.now(timezone.utc) - timedelta(seconds=30)
+    assert retry_after_seconds(api_error(429, {"retry-after": format_datetime(past, usegmt=True)})) == 0.0
+
+    assert retry_after_seconds(api_error(429, {"retry-after": "soon"})) is None
+    assert retry_after_seconds(api_error(429)) is None
+    assert retry_after_seconds(ValueError("no response")) is None
+
+def test_transient_errors_are_retried():
+    for status_code in (429, 500, 529):
+        scheduler = fast_scheduler()
+        attempts = []
+
+        def request():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise api_error(status_code)
+            return "ok"
+
+        stats = {}
+        assert scheduler.call(request, stats=stats) == "ok"
+        assert len(attempts) == 3 and stats['retries'] == 2
+        assert is_retryable(api_error(status_code))
+
+def test_client_errors_are_raised_immediately():
+    for status_code in (400, 401):
+        scheduler = fast_scheduler()
+        attempts = []
+
+        def request():
+            attempts.append(1)
+            raise api_error(status_code)
+
+        with pytest.raises(anthropic.APIStatusError):
+            scheduler.call(request)
+        assert len(attempts) == 1
+        assert not is_retryable(api_error(status_code))
+
+def test_retries_are_capped():
+    scheduler = fast_scheduler(max_retries=2)
+    attempts = []
+
+    def request():
+        attempts.append(1)
+        raise api_error(429)
+
+    with pytest.raises(anthropic.RateLimitError):
+        scheduler.call(request)
+    assert len(attempts) == 3  # The first try plus max_retries
+
+def test_retry_after_pauses_every_worker():
+    """A Retry-After on one worker's request holds back the requests of the others too"""
+    scheduler = fast_scheduler()
+    throttled = threading.Event()
+
+    def first_request():
+        if not throttled.is_set():
+            throttled.set()
+            raise api_error(429, {"retry-after-ms": "300"})
+        return "first"
+
+    worker = threading.Thread(target=scheduler.call, args=(first_request,))
+    worker.start()
+    assert throttled.wait(5)
+    time.sleep(0.02)  # Let the throttled call register its pause
+
+    started = time.monotonic()
+    assert scheduler.call(lambda: "second") == "second"
+    assert time.monotonic() - started >= 0.2
+    worker.join()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Test Response Cache
+Purpose: Confirm chunk conversions are keyed, reused, evicted and counted correctly
+"""
+
+from src.converters.response_cache import ResponseCache
+
+def test_cache_round_trip(tmp_path):
+    """A stored conversion comes back for the same chunk, model and prompt only"""
+    cache = ResponseCache(cache_dir=str(tmp_path))
+
+    assert cache.get(b"%PDF-chunk", "model-a", "prompt") is None
+    cache.put(b"%PDF-chunk", "model-a", "prompt", "# Heading\n\nBody")
+
+    assert cache.get(b"%PDF-chunk", "model-a", "prompt") == "# Heading\n\nBody"
+    assert cache.get(b"%PDF-chunk", "model-b", "prompt") is None
+    assert cache.get(b"%PDF-chunk", "model-a", "other prompt") is None
+
+    stats = cache.stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 3
+    assert stats['entries'] == 1
+
+def test_cache_is_shared_between_instances(tmp_path):
+    """A second cache on the same directory (e.g. another process) sees earlier entries"""
+    ResponseCache(cache_dir=str(tmp_path), compress=False).put(b"pdf", "model", "prompt", "cached")
+
+    assert ResponseCache(cache_dir=str(tmp_path)).get(b"pdf", "model", "prompt") == "cached"
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    """Going over max_bytes drops the entry that was used longest ago"""
+    cache = ResponseCache(cache_dir=str(tmp_path), max_bytes=250, compress=False)
+
+    cache.put(b"first", "model", "prompt", "a" * 100)
+    cache.put(b"second", "model", "prompt", "b" * 100)
+    cache.get(b"first", "model", "prompt")  # first is now more recent than second
+    cache.put(b"third", "model", "prompt", "c" * 100)
+
+    assert cache.get(b"first", "model", "prompt") == "a" * 100
+    assert cache.get(b"second", "model", "prompt") is None
+    assert cache.get(b"third", "model", "prompt") == "c" * 100
+    assert cache.stats()['total_bytes'] <= 250
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Test Split Backends
+Purpose: Confirm every installed split backend produces the same page ranges with the right pages in each chunk
+"""
+
+import pytest
+
+from src.converters.pdf_chunking import ADAPTIVE_CHUNKING, extract_chunk_text, iter_pdf_chunks, sub_chunk
+from src.converters.split_backends import available_backends, open_split_document, resolve_backend
+
+def test_backends_split_identically(tmp_path, make_pdf):
+    pdf_path = str(make_pdf(tmp_path / "doc.pdf", 7))
+    for backend in available_backends():
+        chunks = list(iter_pdf_chunks(pdf_path, 3, backend=backend))
+        assert [(c['start_page'], c['end_page']) for c in chunks] == [(1, 3), (4, 6), (7, 7)], backend
+        for chunk in chunks:
+            text = extract_chunk_text(chunk['data'])
+            pages = range(chunk['start_page'], chunk['end_page'] + 1)
+            assert all(f"Body text of page {page_num}" in text for page_num in pages), backend
+            assert f"Body text of page {chunk['end_page'] + 1}" not in text, backend
+
+        # Chunk bytes feed the response cache key, so they must not change between runs
+        assert next(iter_pdf_chunks(pdf_path, 3, backend=backend))['data'] == chunks[0]['data'], backend
+
+        # Adaptive planning reads per-page costs through the backend
+        adaptive = list(iter_pdf_chunks(pdf_path, ADAPTIVE_CHUNKING, backend=backend, build_data=False))
+        assert adaptive[0]['start_page'] == 1 and adaptive[-1]['end_page'] == 7
+
+def test_sub_chunk_from_chunk_bytes(tmp_path, make_pdf):
+    pdf_path = str(make_pdf(tmp_path / "doc.pdf", 4))
+    chunk = next(iter_pdf_chunks(pdf_path, 4))
+    part = sub_chunk(chunk, 2, 3)
+    with open_split_document(part['data']) as document:
+        assert document.total_pages == 2
+    text = extract_chunk_text(part['data'])
+    assert "Body text of page 2" in text and "Body text of page 3" in text
+    assert "Body text of page 1" not in text
+
+def test_backend_selection():
+    assert resolve_backend("auto") == available_backends()[0]
+    with pytest.raises(ValueError):
+        resolve_backend("no-such-backend")
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test Startup Time
+Purpose: Keep CLI startup cheap - --help and non-semantic validation must not import the SDK, torch or PDF libraries
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+STARTUP_BUDGET_SECONDS = 0.4  # Wall time of a whole process, interpreter start included
+VALIDATION_BUDGET_SECONDS = 0.75  # Also loads one PDF library and reads the document
+HEAVY_MODULES = ('anthropic', 'httpx', 'PyPDF2', 'fitz', 'pdfplumber', 'sentence_transformers', 'torch', 'easyocr')
+
+def run_python(*args: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONPATH=str(REPO_ROOT))
+    return subprocess.run([sys.executable, *args], cwd=REPO_ROOT, env=env, capture_output=True, text=True,
+                          timeout=120)
+
+def best_wall_time(*args: str, runs: int = 3) -> float:
+    """Fastest of a few runs, so a busy machine does not fail the budget"""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = run_python(*args)
+        timings.append(time.perf_counter() - started)
+        assert result.returncode == 0, result.stdout + result.stderr
+    return min(timings)
+
+def test_cli_modules_import_no_heavy_dependencies():
+    modules = ['src.converters.conversion_engine', 'src.converters.batch_converter',
+               'src.converters.conversion_service', 'src.converters.watch_folder',
+               'src.validators.pdf_accuracy_validator', 'src.validators.pdf_validation_system',
+               'src.validators.convert_and_validate']
+    code = (f"import sys, json\nfor m in {modules!r}: __import__(m)\n"
+            f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))")
+    result = run_python("-c", code)
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == []
+
+def test_help_within_budget():
+    for module in ('src.converters.pdf_to_markdown_sonnet', 'src.converters.batch_converter',
+                   'src.validators.pdf_accuracy_validator'):
+        elapsed = best_wall_time("-m", module, "--help")
+        assert elapsed < STARTUP_BUDGET_SECONDS, f"{module} --help took {elapsed:.2f}s"
+
+def test_non_semantic_validation_within_budget(tmp_path, make_pdf):
+    pdf_path = make_pdf(tmp_path / "doc.pdf", 2)
+    markdown_path = tmp_path / "doc.md"
+    markdown_path.write_text("# Page 1\n\nBody text of page 1\n\n# Page 2\n\nBody text of page 2\n", encoding='utf-8')
+
+    elapsed = best_wall_time("-m", "src.validators.pdf_accuracy_validator", str(pdf_path), str(markdown_path),
+                             "--no-semantic")
+    assert elapsed < VALIDATION_BUDGET_SECONDS, f"Non-semantic validation took {elapsed:.2f}s"
+
+def test_local_hybrid_run_never_builds_a_client(tmp_path):
+    """Every page renders locally, so the SDK is never imported and no shared session is created"""
+    pdf_path = tmp_path / "born_digital.pdf"
+    code = (
+        "import fitz, json, sys\n"
+        "doc = fitz.open()\n"
+        "for n in range(3):\n"
+        "    doc.new_page().insert_textbox(fitz.Rect(72, 72, 520, 700), 'Born-digital body text. ' * 20)\n"
+        f"doc.save({str(pdf_path)!r})\n"
+        "from src.converters import converter_session\n"
+        "from src.converters.conversion_engine import convert_pdf_to_markdown\n"
+        f"markdown = convert_pdf_to_markdown({str(pdf_path)!r}, 'test-key', 2, max_workers=1, hybrid=True)\n"
+        "print(json.dumps(['Born-digital' in markdown, 'anthropic' in sys.modules, len(converter_session._sessions)]))"
+    )
+    result = run_python("-c", code)
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == [True, False, 0]
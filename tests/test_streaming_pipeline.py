@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Test Streaming Pipeline
+Purpose: Confirm map_in_order keeps input order through requeues and never pulls more items than its window
+"""
+
+import threading
+import time
+
+from src.converters.streaming_pipeline import RequeueRequest, map_in_order
+
+def test_results_stay_in_order_when_an_item_is_requeued():
+    attempts = {}
+    lock = threading.Lock()
+
+    def work(index, item):
+        with lock:
+            attempts[index] = attempts.get(index, 0) + 1
+            attempt = attempts[index]
+        if index == 2 and attempt == 1:
+            raise RequeueRequest(f"fallback {item}", "throttled")
+        time.sleep(0.05 if index == 1 else 0.01)  # Later items finish before the head
+        return item.upper()
+
+    results = list(map_in_order(work, ["a", "b", "c", "d", "e"], max_workers=3, max_requeues=2))
+    assert results == ["A", "B", "C", "D", "E"]
+    assert attempts[2] == 2
+
+def test_fallback_once_requeues_run_out():
+    def work(index, item):
+        if index == 2:
+            raise RequeueRequest(f"fallback {item}", "still throttled")
+        return item
+
+    assert list(map_in_order(work, ["a", "b", "c"], max_workers=2, max_requeues=1)) == ["a", "fallback b", "c"]
+    assert list(map_in_order(work, ["a", "b", "c"], max_workers=2)) == ["a", "fallback b", "c"]
+
+def test_window_bounds_items_pulled():
+    pulled = []
+
+    def items():
+        for n in range(20):
+            pulled.append(n)
+            yield n
+
+    results = map_in_order(lambda index, item: item * 2, items(), max_workers=2, max_in_flight=4)
+    assert next(results) == 0
+    assert len(pulled) <= 4  # Only the window was read from the iterable before the first result
+    assert list(results) == [n * 2 for n in range(1, 20)]
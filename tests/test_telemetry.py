@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Test Telemetry
+Purpose: Confirm per-request records reach the JSONL file and the run summary adds them up correctly
+"""
+
+import json
+
+from src.converters.conversion_engine import convert_pdf_to_markdown
+from src.converters.converter_session import ConverterSession
+from src.converters.local_backend import LocalMessagesClient
+from src.converters.model_profiles import get_profile
+from src.converters.telemetry import TelemetryRecorder, percentile
+
+def test_percentile_nearest_rank():
+    values = [0.5, 0.1, 0.4, 0.2, 0.3]
+    assert percentile(values, 0.5) == 0.3
+    assert percentile(values, 0.95) == 0.5
+    assert percentile([], 0.5) is None
+
+def test_profile_cost_estimate():
+    """Sonnet: $3 in / $15 out per million tokens; cache reads at a tenth of the input price"""
+    sonnet = get_profile("sonnet")
+    assert abs(sonnet.estimate_cost(1_000_000, 0) - 3.0) < 1e-9
+    assert abs(sonnet.estimate_cost(0, 1_000_000) - 15.0) < 1e-9
+    assert abs(sonnet.estimate_cost(0, 0, cache_read_tokens=1_000_000) - 0.3) < 1e-9
+
+def test_run_records_and_summary(tmp_path, make_pdf):
+    """Every request and chunk gets a JSONL record, followed by the summary"""
+    pdf_path = make_pdf(tmp_path / "doc.pdf", 5)
+    telemetry = TelemetryRecorder(tmp_path / "doc.telemetry.jsonl")
+
+    convert_pdf_to_markdown(str(pdf_path), "test-key", pages_per_chunk=2, max_workers=2,
+                            session=ConverterSession("test-key", client=LocalMessagesClient()), telemetry=telemetry)
+
+    records = [json.loads(line) for line in (tmp_path / "doc.telemetry.jsonl").read_text().splitlines()]
+    requests = [r for r in records if r['type'] == 'request']
+    assert sorted((r['start_page'], r['end_page']) for r in requests) == [(1, 2), (3, 4), (5, 5)]
+    assert all(r['bytes_uploaded'] > 0 and r['base64_bytes'] > r['bytes_uploaded'] for r in requests)
+    assert all(r['stop_reason'] == "end_turn" and r['api_latency_s'] is not None for r in requests)
+
+    summary = records[-1]
+    assert summary['type'] == 'summary'
+    assert summary['requests'] == 3
+    assert summary['pages'] == 5
+    assert summary['output_tokens'] == sum(r['output_tokens'] for r in requests)
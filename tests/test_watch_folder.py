@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Test Watch Folder
+Purpose: Confirm inbox PDFs are converted once settled, land in the outbox validated, are not redone after a restart,
+         and a new version of a PDF gets its own output
+"""
+
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from src.converters.conversion_journal import file_sha256
+from src.converters.converter_session import ConverterSession
+from src.converters.local_backend import LocalMessagesClient
+from src.converters.watch_folder import FolderWatcher, validate_output
+from src.utils.pdf_document import PDFDocument
+
+def local_watcher(inbox: Path, client: LocalMessagesClient) -> FolderWatcher:
+    session = ConverterSession("test-key", client=client)
+    return FolderWatcher(str(inbox), api_key="test-key", pages_per_chunk=2, settle_seconds=0, poll_seconds=0.05,
+                         use_events=False, session=session)
+
+def output_name(pdf_path: Path) -> str:
+    return f"{pdf_path.stem}_sonnet_{file_sha256(pdf_path)[:12]}.md"
+
+def wait_idle(watcher: FolderWatcher, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        time.sleep(0.2)
+        if watcher.idle():
+            return
+    raise AssertionError("Watcher did not finish")
+
+def test_new_pdf_lands_in_outbox_validated(tmp_path, make_pdf):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    watcher = local_watcher(inbox, LocalMessagesClient()).start()
+    try:
+        pdf_path = make_pdf(inbox / "report.pdf", 3)
+        time.sleep(0.3)
+        wait_idle(watcher)
+    finally:
+        watcher.stop()
+
+    outbox = tmp_path / "outbox"
+    markdown_path = outbox / output_name(pdf_path)
+    markdown_text = markdown_path.read_text(encoding='utf-8')
+    assert all(f"Body text of page {page_num}" in markdown_text for page_num in (1, 2, 3))
+    validation = json.loads(markdown_path.with_suffix('.validation.json').read_text(encoding='utf-8'))
+    assert validation['source'] == "report.pdf"
+
+def test_partial_write_waits_for_trailer(tmp_path, make_pdf):
+    """A file cut off before %%EOF is not converted until the rest arrives"""
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    pdf_data = make_pdf(tmp_path / "full.pdf", 2).read_bytes()
+    (inbox / "copying.pdf").write_bytes(pdf_data[:len(pdf_data) // 2])
+
+    client = LocalMessagesClient()
+    watcher = local_watcher(inbox, client)
+    watcher.start()
+    try:
+        time.sleep(0.5)
+        assert not client.requests
+        (inbox / "copying.pdf").write_bytes(pdf_data)
+        time.sleep(0.3)
+        wait_idle(watcher)
+    finally:
+        watcher.stop()
+    assert (tmp_path / "outbox" / output_name(inbox / "copying.pdf")).exists()
+
+def test_restart_skips_converted_and_picks_up_changes(tmp_path, make_pdf):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    make_pdf(inbox / "kept.pdf", 2)
+    first = local_watcher(inbox, LocalMessagesClient()).start()
+    time.sleep(0.2)
+    wait_idle(first)
+    first.stop()
+
+    # Dropped in while the watcher was down, alongside an unchanged file
+    new_path = make_pdf(inbox / "new.pdf", 4)
+    client = LocalMessagesClient()
+    second = local_watcher(inbox, client).start()
+    time.sleep(0.2)
+    wait_idle(second)
+    second.stop()
+
+    assert (tmp_path / "outbox" / output_name(new_path)).exists()
+    assert len(client.requests) == 2  # Only new.pdf's two chunks were sent
+
+def test_new_version_keeps_the_earlier_output(tmp_path, make_pdf):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    watcher = local_watcher(inbox, LocalMessagesClient()).start()
+    try:
+        make_pdf(inbox / "report.pdf", 2)
+        time.sleep(0.3)
+        wait_idle(watcher)
+        first_name = output_name(inbox / "report.pdf")
+        make_pdf(inbox / "report.pdf", 3)
+        time.sleep(0.3)
+        wait_idle(watcher)
+        second_name = output_name(inbox / "report.pdf")
+    finally:
+        watcher.stop()
+
+    outbox = tmp_path / "outbox"
+    assert first_name != second_name
+    assert "Body text of page 3" not in (outbox / first_name).read_text(encoding='utf-8')
+    assert "Body text of page 3" in (outbox / second_name).read_text(encoding='utf-8')
+
+def test_validate_output_reads_the_shared_document(tmp_path, make_pdf):
+    pdf_path = make_pdf(tmp_path / "doc.pdf", 2)
+    markdown_path = tmp_path / "doc.md"
+    markdown_path.write_text("Body text of page 1\n\nBody text of page 2", encoding='utf-8')
+
+    with PDFDocument(pdf_path) as document:
+        validation = validate_output(document, str(markdown_path))
+        assert document._texts  # The page text stays cached on the shared document
+    assert validation == validate_output(str(pdf_path), str(markdown_path))
+
+def test_help_prints_usage_without_prompting():
+    result = subprocess.run([sys.executable, "-m", "src.converters.watch_folder", "--help"], input="",
+                            capture_output=True, text=True, timeout=60, cwd=Path(__file__).resolve().parent.parent)
+    assert result.returncode == 0
+    assert result.stdout.startswith("Usage: <inbox>")
+    assert "Enter the inbox" not in result.stdout